@@ -0,0 +1,279 @@
+"""
+Batch mode for the Human-in-the-Loop CrewAI Example.
+
+This module summarizes many YouTube videos at once with a map-reduce pipeline:
+transcripts are ingested concurrently, transcript chunks are summarized in
+parallel (map), each video's chunk summaries are merged (reduce) and the video
+summaries are finally synthesized into one cross-video report. Token usage and
+wall time are reported per video-hour of content for capacity planning.
+"""
+
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from youtube_transcript_api import YouTubeTranscriptApi
+
+from src.crew import create_chunk_summary_crew, create_synthesis_crew, create_video_summary_crew
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_CHARS = 12000
+DEFAULT_CHUNK_OVERLAP = 400
+
+@dataclass
+class TokenUsage:
+    """Prompt and completion tokens consumed by one or more crew runs."""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, other: "TokenUsage") -> None:
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+
+@dataclass
+class Transcript:
+    """The plain-text transcript of one video."""
+    url: str
+    video_id: str
+    text: str
+    duration_seconds: float
+
+@dataclass
+class VideoReport:
+    """Summary and cost figures for one video of the batch."""
+    url: str
+    duration_seconds: float = 0.0
+    chunk_count: int = 0
+    summary: str = ""
+    error: Optional[str] = None
+    usage: TokenUsage = field(default_factory=TokenUsage)
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    @property
+    def wall_seconds(self) -> float:
+        return max(self.finished_at - self.started_at, 0.0)
+
+    @property
+    def video_hours(self) -> float:
+        return self.duration_seconds / 3600
+
+@dataclass
+class BatchReport:
+    """Result of a batch run: per-video reports, the synthesis and capacity figures."""
+    topic: str
+    videos: List[VideoReport]
+    synthesis: str = ""
+    synthesis_error: Optional[str] = None
+    synthesis_usage: TokenUsage = field(default_factory=TokenUsage)
+    wall_seconds: float = 0.0
+
+    @property
+    def video_hours(self) -> float:
+        return sum(video.video_hours for video in self.videos if video.error is None)
+
+    @property
+    def usage(self) -> TokenUsage:
+        total = TokenUsage()
+        for video in self.videos:
+            total.add(video.usage)
+        total.add(self.synthesis_usage)
+        return total
+
+    def capacity_table(self) -> str:
+        """Formats token usage and wall time per video-hour as a plain-text table."""
+        lines = [
+            f"{'video':<45} {'minutes':>8} {'chunks':>6} {'tokens':>9} {'tokens/h':>10} {'wall s':>8} {'wall s/h':>9}"
+        ]
+        for video in self.videos:
+            if video.error:
+                lines.append(f"{video.url:<45} failed: {video.error}")
+                continue
+            hours = video.video_hours or float("nan")
+            lines.append(
+                f"{video.url:<45} {video.duration_seconds / 60:>8.1f} {video.chunk_count:>6} "
+                f"{video.usage.total_tokens:>9} {video.usage.total_tokens / hours:>10.0f} "
+                f"{video.wall_seconds:>8.1f} {video.wall_seconds / hours:>9.1f}"
+            )
+        hours = self.video_hours or float("nan")
+        lines.append(
+            f"{'TOTAL (incl. synthesis)':<45} {self.video_hours * 60:>8.1f} "
+            f"{sum(v.chunk_count for v in self.videos):>6} {self.usage.total_tokens:>9} "
+            f"{self.usage.total_tokens / hours:>10.0f} {self.wall_seconds:>8.1f} {self.wall_seconds / hours:>9.1f}"
+        )
+        return "\n".join(lines)
+
+def extract_video_id(youtube_url: str) -> str:
+    """Extracts the video id from the usual YouTube URL shapes."""
+    parsed = urlparse(youtube_url)
+    if parsed.hostname in ("youtu.be", "www.youtu.be"):
+        video_id = parsed.path.lstrip("/")
+    elif parsed.path.startswith(("/shorts/", "/embed/", "/live/")):
+        video_id = parsed.path.split("/")[2]
+    else:
+        video_id = parse_qs(parsed.query).get("v", [""])[0]
+
+    if not re.fullmatch(r"[A-Za-z0-9_-]{11}", video_id):
+        raise ValueError(f"Could not extract a YouTube video id from: {youtube_url}")
+    return video_id
+
+def fetch_transcript(youtube_url: str) -> Transcript:
+    """Downloads the transcript of a video and flattens it to plain text."""
+    video_id = extract_video_id(youtube_url)
+    if hasattr(YouTubeTranscriptApi, "get_transcript"):
+        snippets = YouTubeTranscriptApi.get_transcript(video_id)
+    else:
+        snippets = YouTubeTranscriptApi().fetch(video_id).to_raw_data()
+
+    text = " ".join(snippet["text"].strip() for snippet in snippets if snippet["text"].strip())
+    duration = max((snippet["start"] + snippet.get("duration", 0.0) for snippet in snippets), default=0.0)
+    return Transcript(url=youtube_url, video_id=video_id, text=text, duration_seconds=duration)
+
+def chunk_transcript(text: str, max_chars: int = DEFAULT_CHUNK_CHARS,
+                     overlap: int = DEFAULT_CHUNK_OVERLAP) -> List[str]:
+    """Splits a transcript into overlapping chunks, preferring sentence or word boundaries."""
+    if max_chars <= overlap:
+        raise ValueError("max_chars must be larger than overlap.")
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + max_chars, len(text))
+        if end < len(text):
+            boundary = text.rfind(". ", start + max_chars // 2, end)
+            if boundary == -1:
+                boundary = text.rfind(" ", start + max_chars // 2, end)
+            if boundary > start:
+                end = boundary + 1
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return [chunk for chunk in chunks if chunk]
+
+def _token_usage(crew) -> TokenUsage:
+    """Reads the token counters of a finished crew (object or dict, depending on the CrewAI version)."""
+    metrics = getattr(crew, "usage_metrics", None) or {}
+    if not isinstance(metrics, dict):
+        metrics = metrics.dict() if hasattr(metrics, "dict") else vars(metrics)
+    return TokenUsage(
+        prompt_tokens=int(metrics.get("prompt_tokens", 0) or 0),
+        completion_tokens=int(metrics.get("completion_tokens", 0) or 0),
+    )
+
+def _kickoff(crew):
+    """Runs a crew and returns its raw output together with the tokens it consumed."""
+    result = crew.kickoff()
+    return str(getattr(result, "raw", result)), _token_usage(crew)
+
+def run_batch(youtube_urls: List[str], topic: str, max_workers: int = 8,
+              chunk_chars: int = DEFAULT_CHUNK_CHARS) -> BatchReport:
+    """
+    Summarizes many videos with a concurrent map-reduce pipeline.
+
+    Args:
+        youtube_urls: The videos to summarize.
+        topic: The topic the summaries should focus on.
+        max_workers: Maximum number of concurrent transcript downloads and crew runs.
+        chunk_chars: Maximum size of a transcript chunk handed to one map crew.
+
+    Returns:
+        A BatchReport with per-video summaries, the synthesis and capacity figures.
+    """
+    if not youtube_urls:
+        raise ValueError("At least one YouTube URL is required for batch mode.")
+
+    batch_start = time.perf_counter()
+    videos: Dict[str, VideoReport] = {url: VideoReport(url=url) for url in dict.fromkeys(youtube_urls)}
+    chunk_summaries: Dict[str, List[Optional[str]]] = {}
+    pending_chunks: Dict[str, int] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Ingest: download every transcript concurrently.
+        for video in videos.values():
+            video.started_at = time.perf_counter()
+        ingest_futures = {pool.submit(fetch_transcript, url): url for url in videos}
+        map_futures = {}
+        for future in as_completed(ingest_futures):
+            video = videos[ingest_futures[future]]
+            try:
+                transcript = future.result()
+            except Exception as e:
+                video.error = f"transcript unavailable ({e})"
+                video.finished_at = time.perf_counter()
+                logger.warning(f"Skipping {video.url}: {video.error}")
+                continue
+
+            chunks = chunk_transcript(transcript.text, max_chars=chunk_chars)
+            video.duration_seconds = transcript.duration_seconds
+            video.chunk_count = len(chunks)
+            if not chunks:
+                # No map step, so no reduce step would ever finish this video.
+                video.error = "empty transcript"
+                video.finished_at = time.perf_counter()
+                logger.warning(f"Skipping {video.url}: {video.error}")
+                continue
+            chunk_summaries[video.url] = [None] * len(chunks)
+            pending_chunks[video.url] = len(chunks)
+            logger.info(f"Ingested {video.url}: {transcript.duration_seconds / 60:.1f} min, {len(chunks)} chunks")
+
+            # Map: chunks are summarized in parallel as soon as their transcript arrives.
+            for index, chunk in enumerate(chunks):
+                crew = create_chunk_summary_crew(chunk, topic, f"part {index + 1} of {len(chunks)}")
+                map_futures[pool.submit(_kickoff, crew)] = (video.url, index)
+
+        # Reduce: merge a video's chunk summaries once all of them are available.
+        reduce_futures = {}
+        for future in as_completed(map_futures):
+            url, index = map_futures[future]
+            video = videos[url]
+            try:
+                summary, usage = future.result()
+                chunk_summaries[url][index] = summary
+                video.usage.add(usage)
+            except Exception as e:
+                logger.warning(f"Chunk {index + 1} of {url} failed: {e}")
+            pending_chunks[url] -= 1
+            if pending_chunks[url] == 0:
+                summaries = [s for s in chunk_summaries[url] if s]
+                if not summaries:
+                    video.error = "all chunk summaries failed"
+                    video.finished_at = time.perf_counter()
+                    continue
+                crew = create_video_summary_crew(url, summaries, topic)
+                reduce_futures[pool.submit(_kickoff, crew)] = url
+
+        for future in as_completed(reduce_futures):
+            video = videos[reduce_futures[future]]
+            try:
+                video.summary, usage = future.result()
+                video.usage.add(usage)
+            except Exception as e:
+                video.error = f"reduce step failed ({e})"
+            video.finished_at = time.perf_counter()
+
+    report = BatchReport(topic=topic, videos=list(videos.values()))
+    summaries = {video.url: video.summary for video in report.videos if video.error is None}
+    if len(summaries) > 1:
+        # Synthesize across videos; a single video needs no synthesis step.
+        try:
+            report.synthesis, report.synthesis_usage = _kickoff(create_synthesis_crew(summaries, topic))
+        except Exception as e:
+            # Keep the per-video summaries even when the synthesis fails.
+            report.synthesis_error = f"synthesis failed ({e})"
+            logger.warning(report.synthesis_error)
+    elif summaries:
+        report.synthesis = next(iter(summaries.values()))
+
+    report.wall_seconds = time.perf_counter() - batch_start
+    logger.info(f"Batch finished in {report.wall_seconds:.1f}s, {report.usage.total_tokens} tokens")
+    return report
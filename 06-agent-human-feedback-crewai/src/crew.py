@@ -67,3 +67,83 @@ def create_crew(youtube_url: str, topic: str):
     )
 
     return crew
+
+# --- Batch mode (map-reduce over transcripts) ---
+
+def create_chunk_summary_crew(chunk: str, topic: str, position: str):
+    """Creates a single-task crew that summarizes one transcript chunk (map step)."""
+    summarizer = Agent(
+        role='Transcript Chunk Summarizer',
+        goal='Condense a slice of a video transcript into the insights relevant to the given topic.',
+        backstory=(
+            "You read transcripts quickly and keep only what matters: claims, numbers, "
+            "examples and conclusions. You never invent content that is not in the text."
+        ),
+        verbose=False,
+        allow_delegation=False
+    )
+
+    summary_task = Task(
+        description=(
+            f"Summarize the following transcript excerpt ({position}) with a focus on {topic}. "
+            "Keep concrete facts and drop filler.\n\n"
+            f"Transcript excerpt:\n{chunk}"
+        ),
+        expected_output='A bullet-point summary of the key insights in the excerpt.',
+        agent=summarizer
+    )
+
+    return Crew(agents=[summarizer], tasks=[summary_task], verbose=False)
+
+def create_video_summary_crew(youtube_url: str, chunk_summaries: list, topic: str):
+    """Creates a single-task crew that merges the chunk summaries of one video (reduce step)."""
+    researcher = Agent(
+        role='Video Content Researcher',
+        goal='Merge partial transcript summaries into one coherent summary of the video.',
+        backstory=(
+            "You are a skilled researcher who excels at extracting valuable insights from video content. "
+            "You remove repetition across partial notes while keeping every distinct insight."
+        ),
+        verbose=False,
+        allow_delegation=False
+    )
+
+    notes = "\n\n".join(
+        f"Part {index}:\n{summary}" for index, summary in enumerate(chunk_summaries, start=1)
+    )
+    reduce_task = Task(
+        description=(
+            f"The following notes summarize consecutive parts of the YouTube video {youtube_url}. "
+            f"Merge them into a single summary of the key insights about {topic}.\n\n{notes}"
+        ),
+        expected_output=f'A summary of the key insights from the YouTube video about {topic}.',
+        agent=researcher
+    )
+
+    return Crew(agents=[researcher], tasks=[reduce_task], verbose=False)
+
+def create_synthesis_crew(video_summaries: dict, topic: str):
+    """Creates a crew that synthesizes the per-video summaries into one cross-video report."""
+    analyst = Agent(
+        role='Cross-Video Analyst',
+        goal='Compare and synthesize insights from several videos on the same topic.',
+        backstory=(
+            "You connect ideas across sources, point out agreements and contradictions, "
+            "and credit each insight to the video it came from."
+        ),
+        verbose=True,
+        allow_delegation=False
+    )
+
+    sources = "\n\n".join(f"Video {url}:\n{summary}" for url, summary in video_summaries.items())
+    synthesis_task = Task(
+        description=(
+            f"Synthesize the following video summaries into a single report on {topic}. "
+            "Highlight common themes, disagreements and insights unique to a single video.\n\n"
+            f"{sources}"
+        ),
+        expected_output=f'A cross-video synthesis report on {topic} that cites the source videos.',
+        agent=analyst
+    )
+
+    return Crew(agents=[analyst], tasks=[synthesis_task], verbose=True)
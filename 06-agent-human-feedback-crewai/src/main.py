@@ -2,16 +2,46 @@
 Main entry point for the Human-in-the-Loop CrewAI Example.
 
 This script initializes and runs a crew to research a YouTube video and generate
-an article based on a topic, incorporating human feedback.
+an article based on a topic, incorporating human feedback. In batch mode it
+summarizes many videos with a concurrent map-reduce pipeline instead.
 """
 
 import sys
 from src.config import logger
 from src.crew import create_crew
 
+def run_batch_mode(args):
+    """Runs the map-reduce batch pipeline: `--batch <TOPIC> <URL> [<URL> ...]`."""
+    from src.batch import run_batch
+
+    if len(args) < 2:
+        raise ValueError("Batch mode needs a topic followed by at least one YouTube URL.")
+
+    topic, youtube_urls = args[0], args[1:]
+    logger.info(f"Starting batch mode for {len(youtube_urls)} videos on topic: {topic}")
+    report = run_batch(youtube_urls, topic)
+
+    print("\n---\n")
+    print("Cross-Video Synthesis:")
+    print(report.synthesis_error or report.synthesis)
+    if report.synthesis_error:
+        print("\n---\n")
+        print("Video Summaries:")
+        for video in report.videos:
+            if video.error is None:
+                print(f"\n{video.url}\n{video.summary}")
+    print("\n---\n")
+    print("Capacity Report (per video-hour of content):")
+    print(report.capacity_table())
+    print("\n---")
+
 def main():
     """Main function to run the crew."""
     try:
+        if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+            run_batch_mode(sys.argv[2:])
+            return
+
         if len(sys.argv) < 3:
             raise ValueError("Insufficient arguments. Please provide a YouTube URL and a topic.")
 
@@ -35,6 +65,7 @@ def main():
         logger.error(f"Error: {e}")
         print(f"Error: {e}")
         print('Example: python -m src.main "https://www.youtube.com/watch?v=dQw4w9WgXcQ" "Rick Astley"')
+        print('Batch:   python -m src.main --batch "Rick Astley" "<URL_1>" "<URL_2>" ...')
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1 @@
+"""Benchmarks for the Code Generation & Debugging CrewAI Example."""
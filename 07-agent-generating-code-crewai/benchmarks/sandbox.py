@@ -0,0 +1,99 @@
+"""
+Benchmark of the local sandbox executor.
+
+Measures the per-execution overhead of a cold worker (start-up paid on every
+run) against a warm pool, and the throughput of several concurrent agents
+sharing a pool.
+
+Usage:
+    python -m benchmarks.sandbox --runs 50 --agents 8 --pool-size 4
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.sandbox import SandboxPool, run_cold
+
+SNIPPET = (
+    "ages = [23, 35, 31, 29, 40]\n"
+    "print(f'The average age of participants is: {sum(ages) / len(ages)}')"
+)
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+def _describe(label, latencies):
+    ms = [value * 1000 for value in latencies]
+    print(
+        f"{label:<28} mean {statistics.mean(ms):8.2f} ms   p50 {_percentile(ms, 0.5):8.2f} ms   "
+        f"p95 {_percentile(ms, 0.95):8.2f} ms"
+    )
+
+def bench_overhead(runs, preload):
+    """Per-execution latency of a cold worker versus a warm pool worker."""
+    cold = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        run_cold(SNIPPET, preload=preload)
+        cold.append(time.perf_counter() - started)
+
+    warm = []
+    with SandboxPool(size=2, preload=preload) as pool:
+        pool.wait_ready()
+        for _ in range(runs):
+            # Give the replacement worker time to warm up, as an agent's think time would.
+            pool.wait_ready()
+            started = time.perf_counter()
+            pool.run(SNIPPET)
+            warm.append(time.perf_counter() - started)
+
+    _describe("cold start + execute", cold)
+    _describe("warm pool execute", warm)
+    print(f"{'speedup (mean)':<28} {statistics.mean(cold) / statistics.mean(warm):8.1f}x\n")
+
+def bench_throughput(agents, runs_per_agent, pool_size, preload):
+    """Executions per second for concurrent agents, cold versus a shared warm pool."""
+    def cold_agent(_):
+        for _ in range(runs_per_agent):
+            run_cold(SNIPPET, preload=preload)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=agents) as executor:
+        list(executor.map(cold_agent, range(agents)))
+    cold_elapsed = time.perf_counter() - started
+
+    with SandboxPool(size=pool_size, preload=preload) as pool:
+        pool.wait_ready()
+
+        def warm_agent(_):
+            for _ in range(runs_per_agent):
+                pool.run(SNIPPET)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=agents) as executor:
+            list(executor.map(warm_agent, range(agents)))
+        warm_elapsed = time.perf_counter() - started
+
+    total = agents * runs_per_agent
+    print(f"{agents} concurrent agents x {runs_per_agent} executions (pool size {pool_size})")
+    print(f"{'cold workers':<28} {total / cold_elapsed:8.1f} exec/s")
+    print(f"{'warm pool':<28} {total / warm_elapsed:8.1f} exec/s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold versus warm sandbox execution.")
+    parser.add_argument("--runs", type=int, default=30, help="Sequential executions per mode.")
+    parser.add_argument("--agents", type=int, default=8, help="Concurrent agents for the throughput test.")
+    parser.add_argument("--runs-per-agent", type=int, default=10)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--preload", nargs="*", default=["json", "math", "statistics", "collections"],
+                        help="Modules imported during warm-up (e.g. numpy).")
+    args = parser.parse_args()
+
+    bench_overhead(args.runs, args.preload)
+    bench_throughput(args.agents, args.runs_per_agent, args.pool_size, args.preload)
+
+if __name__ == "__main__":
+    main()
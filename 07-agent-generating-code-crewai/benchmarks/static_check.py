@@ -0,0 +1,92 @@
+"""
+Benchmark of the static-analysis pre-pass of the debugging crew.
+
+Runs the pre-pass over a corpus of buggy snippets and reports how many of them
+are fixed locally (LLM calls avoided) and how much latency that saves compared
+to a debugging crew run. The crew latency is an assumption passed on the
+command line, since measuring it needs an API key.
+
+Usage:
+    python -m benchmarks.static_check --llm-seconds 12
+"""
+
+import argparse
+
+from src.sandbox import SandboxPool
+from src.static_check import prepass
+
+# (name, buggy code, expected stdout of the fixed code or None)
+CORPUS = [
+    ("squares: undefined m",
+     "numbers = [2, 4, 6, 8]\nsquared_numbers = [n*m for n in numbers]\nprint(squared_numbers)\n",
+     "[4, 16, 36, 64]"),
+    ("misspelled builtin",
+     "ages = [23, 35, 31, 29, 40]\npritn(sum(ages) / len(ages))\n",
+     "31.6"),
+    ("misspelled len",
+     "ages = [23, 35, 31, 29, 40]\nprint(sum(ages) / lne(ages))\n",
+     "31.6"),
+    ("loop variable typo",
+     "total = 0\nfor value in [1, 2, 3]:\n    total += valeu\nprint(total)\n",
+     "6"),
+    ("function name typo",
+     "def area(r):\n    return 3.14 * r * r\nprint(aera(2))\n",
+     "12.56"),
+    ("parameter typo",
+     "def greet(name):\n    return 'Hello ' + nmae\nprint(greet('Ada'))\n",
+     "Hello Ada"),
+    ("module alias typo",
+     "import math\nprint(maht.sqrt(16))\n",
+     "4.0"),
+    ("unreachable print after return",
+     "def double(x):\n    return x * 2\n    print('doubled')\nprint(double(4))\n",
+     None),
+    ("off-by-one (not statically detectable)",
+     "numbers = [1, 2, 3]\nprint(sum(numbers[1:]))\n",
+     "6"),
+    ("wrong operator (not statically detectable)",
+     "numbers = [2, 4]\nprint([n + n for n in numbers])\n",
+     "[4, 16]"),
+    ("ambiguous typo",
+     "x1 = 1\nx3 = 2\nprint(x2)\n",
+     None),
+    ("two undefined names",
+     "print(x + y)\n",
+     None),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the static pre-pass on a corpus of buggy snippets.")
+    parser.add_argument("--llm-seconds", type=float, default=10.0,
+                        help="Assumed wall time of one debugging crew run.")
+    args = parser.parse_args()
+
+    avoided = 0
+    local_seconds = 0.0
+    with SandboxPool(size=2) as pool:
+        pool.wait_ready()
+        print(f"{'snippet':<45} {'diagnostics':>11} {'outcome':<22} {'ms':>7}")
+        for name, code, expected in CORPUS:
+            pool.wait_ready()
+            report = prepass(code, expected, execute=pool.run)
+            local_seconds += report.seconds
+            if report.resolved_locally:
+                avoided += 1
+                outcome = "fixed locally"
+            elif report.diagnostics:
+                outcome = "LLM + diagnostics"
+            else:
+                outcome = "LLM"
+            print(f"{name:<45} {len(report.diagnostics):>11} {outcome:<22} {report.seconds * 1000:>7.1f}")
+
+    total = len(CORPUS)
+    baseline = total * args.llm_seconds
+    with_prepass = (total - avoided) * args.llm_seconds + local_seconds
+    print()
+    print(f"LLM calls avoided: {avoided}/{total} ({avoided / total:.0%})")
+    print(f"Pre-pass time:     {local_seconds:.2f} s for the whole corpus")
+    print(f"Corpus latency:    {baseline:.1f} s without pre-pass, {with_prepass:.1f} s with pre-pass "
+          f"(assuming {args.llm_seconds:.1f} s per crew run, {baseline - with_prepass:.1f} s saved)")
+
+if __name__ == "__main__":
+    main()
@@ -8,17 +8,38 @@ This module defines the agents and tasks for two separate crews:
 
 from crewai import Agent, Task, Crew
 
+from .tools import SandboxCodeInterpreterTool
+
+def _code_execution_settings(sandbox_pool=None, exec_cache=None, crew_name="default"):
+    """
+    Returns the agent settings for code execution.
+
+    Without a pool the agent uses CrewAI's built-in code execution; with a pool it
+    runs code through the warm local sandbox instead, optionally behind an
+    execution cache that reports its hit rate under `crew_name`.
+    """
+    if sandbox_pool is None:
+        return {"allow_code_execution": True}
+    tool = SandboxCodeInterpreterTool(pool=sandbox_pool, cache=exec_cache, crew_name=crew_name)
+    return {"allow_code_execution": False, "tools": [tool]}
+
 # 1. Coding Crew
-def create_coding_crew():
-    """Creates and configures the coding crew."""
+def create_coding_crew(sandbox_pool=None, exec_cache=None):
+    """
+    Creates and configures the coding crew.
+
+    Args:
+        sandbox_pool (SandboxPool, optional): Warm sandbox pool used to execute the generated code.
+        exec_cache (ExecutionCache, optional): Cache for results of deterministic snippets.
+    """
     # Create an agent with code execution enabled
     coding_agent = Agent(
         role="Python Data Analyst",
         goal="Write and execute Python code to perform calculations",
         backstory="You are an experienced Python developer, skilled at writing efficient code to solve problems.",
-        allow_code_execution=True,
         verbose=True,
-        memory=True
+        memory=True,
+        **_code_execution_settings(sandbox_pool, exec_cache, crew_name="coding")
     )
 
     # Define the task with explicit instructions to generate and execute Python code
@@ -39,30 +60,94 @@ def create_coding_crew():
     
     return analysis_crew
 
+# 1b. Optimization Crew (used by the benchmark-and-improve loop in optimizer.py)
+def create_optimization_crew(previous_code=None, feedback=None, sandbox_pool=None, exec_cache=None):
+    """
+    Creates a coding crew that writes, or speeds up, an `average_age(ages)` function.
+
+    Args:
+        previous_code (str, optional): The best version so far, to be optimized.
+        feedback (str, optional): Benchmark measurements of the latest version.
+        sandbox_pool (SandboxPool, optional): Warm sandbox pool used to execute the generated code.
+        exec_cache (ExecutionCache, optional): Cache for results of deterministic snippets.
+    """
+    coding_agent = Agent(
+        role="Python Data Analyst",
+        goal="Write and execute Python code that is correct and fast on realistic input sizes",
+        backstory=(
+            "You are an experienced Python developer, skilled at writing efficient code to solve problems. "
+            "You know when built-ins or vectorized NumPy beat plain Python loops."
+        ),
+        verbose=True,
+        **_code_execution_settings(sandbox_pool, exec_cache, crew_name="optimization")
+    )
+
+    if previous_code is None:
+        description = (
+            "Write a Python function `average_age(ages)` that returns the average of a list of ages. "
+            "It will be benchmarked on lists of up to millions of ages, so make it efficient. "
+            "Check it on [23, 35, 31, 29, 40]."
+        )
+        if feedback:
+            description += f"\n{feedback}"
+    else:
+        description = (
+            "The following `average_age(ages)` function was benchmarked on large synthetic lists of ages:\n"
+            f"```python\n{previous_code}\n```\n{feedback}\n"
+            "Write a faster version with the same behavior, for example by using built-ins or vectorized "
+            "NumPy and avoiding Python-level loops and unnecessary copies. Keep the peak memory low."
+        )
+
+    optimization_task = Task(
+        description=description,
+        agent=coding_agent,
+        expected_output=(
+            "The complete function in a single ```python code block defining `average_age(ages)`, "
+            "followed by a short note on what makes it fast."
+        )
+    )
+
+    return Crew(agents=[coding_agent], tasks=[optimization_task])
+
 # 2. Debugging Crew
-def create_debugging_crew():
-    """Creates and configures the debugging crew."""
+BUGGY_CODE = (
+    "numbers = [2, 4, 6, 8]\n"
+    "squared_numbers = [n*m for n in numbers]\n"
+    "print(squared_numbers)\n"
+)
+# What the corrected code must print; used to verify locally proposed fixes.
+EXPECTED_DEBUG_OUTPUT = "[4, 16, 36, 64]"
+
+def create_debugging_crew(sandbox_pool=None, exec_cache=None, diagnostics=None):
+    """
+    Creates and configures the debugging crew.
+
+    Args:
+        sandbox_pool (SandboxPool, optional): Warm sandbox pool used to execute the code under test.
+        exec_cache (ExecutionCache, optional): Cache for results of deterministic snippets.
+        diagnostics (str, optional): Findings of the static-analysis pre-pass to add to the task context.
+    """
     # Create a debugging agent with code execution enabled
     debugging_agent = Agent(
         role="Python Debugger",
         goal="Identify and fix issues in existing Python code",
         backstory="You are an experienced Python developer with a knack for finding and fixing bugs.",
-        allow_code_execution=True,
         verbose=True,
-        memory=True
+        memory=True,
+        **_code_execution_settings(sandbox_pool, exec_cache, crew_name="debugging")
     )
 
     # Define a task that involves debugging the provided code
+    description = (
+        "The following Python code is supposed to return the square of each number in the list, "
+        "but it contains a bug. Please identify and fix the bug:\n"
+        f"```\n{BUGGY_CODE}```"
+    )
+    if diagnostics:
+        description += f"\n\nA static analysis of the code reported:\n{diagnostics}"
+
     debug_task = Task(
-        description=(
-            "The following Python code is supposed to return the square of each number in the list, "
-            "but it contains a bug. Please identify and fix the bug:\n"
-            "```\n"
-            "numbers = [2, 4, 6, 8]\n"
-            "squared_numbers = [n*m for n in numbers]\n"
-            "print(squared_numbers)\n"
-            "```"
-        ),
+        description=description,
         agent=debugging_agent,
         expected_output="The corrected code should output the squares of the numbers in the list. Provide the updated code and tell what was the bug and how you fixed it."
     )
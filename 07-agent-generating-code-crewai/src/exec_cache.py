@@ -0,0 +1,194 @@
+"""
+Content-addressed execution cache for the Code Generation & Debugging CrewAI Example.
+
+Agents often re-run the very same snippet while iterating on a task. This module
+caches the outcome of deterministic snippets under a hash of the normalized
+source, the interpreter version and the inputs, so repeated runs are answered
+instantly. Snippets that use time, randomness, I/O or the network are refused.
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import platform
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .sandbox import ExecutionResult
+
+logger = logging.getLogger(__name__)
+
+# Imports whose use makes the outcome of a snippet depend on more than its source and inputs;
+# a dotted name covers that package and its submodules only (numpy.random, not numpy).
+NON_DETERMINISTIC_MODULES = {
+    "asyncio", "datetime", "glob", "http", "io", "multiprocessing", "os", "pathlib", "random",
+    "requests", "secrets", "shutil", "socket", "sqlite3", "subprocess", "sys", "tempfile",
+    "threading", "time", "urllib", "uuid", "numpy.random",
+}
+NON_DETERMINISTIC_CALLS = {"open", "input", "id", "breakpoint", "exec", "eval", "__import__"}
+NON_DETERMINISTIC_ATTRIBUTES = {"random", "now", "today", "utcnow", "time", "perf_counter", "urandom"}
+
+def normalize_source(code: str) -> str:
+    """Returns a canonical form of the source: formatting and comments do not affect the hash."""
+    return ast.unparse(ast.parse(code))
+
+def is_non_deterministic_module(name: str) -> bool:
+    """Whether a module, or one of the packages it belongs to, is in NON_DETERMINISTIC_MODULES."""
+    parts = name.split(".")
+    return any(".".join(parts[:length]) in NON_DETERMINISTIC_MODULES for length in range(1, len(parts) + 1))
+
+def find_non_deterministic(code: str) -> List[str]:
+    """Lists the constructs that make a snippet unsafe to cache (empty if it is deterministic)."""
+    reasons = []
+    for node in ast.walk(ast.parse(code)):
+        if isinstance(node, ast.Import):
+            reasons += [f"imports {alias.name}" for alias in node.names
+                        if is_non_deterministic_module(alias.name)]
+        elif isinstance(node, ast.ImportFrom):
+            if node.module and is_non_deterministic_module(node.module):
+                reasons.append(f"imports from {node.module}")
+            elif node.module:
+                # `from numpy import random` imports the submodule.
+                reasons += [f"imports {node.module}.{alias.name}" for alias in node.names
+                            if is_non_deterministic_module(f"{node.module}.{alias.name}")]
+            reasons += [f"imports {alias.name}" for alias in node.names
+                        if alias.name in NON_DETERMINISTIC_ATTRIBUTES]
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            if node.func.id in NON_DETERMINISTIC_CALLS:
+                reasons.append(f"calls {node.func.id}()")
+        elif isinstance(node, ast.Attribute) and node.attr in NON_DETERMINISTIC_ATTRIBUTES:
+            reasons.append(f"uses .{node.attr}")
+    return sorted(set(reasons))
+
+def cache_key(code: str, inputs: Optional[Dict[str, Any]] = None,
+              interpreter: Optional[str] = None) -> str:
+    """Hashes the normalized source, the interpreter version and the inputs."""
+    payload = json.dumps(
+        {
+            "source": normalize_source(code),
+            "interpreter": interpreter or f"{platform.python_implementation()} {platform.python_version()}",
+            "inputs": inputs or {},
+        },
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+@dataclass
+class CacheStats:
+    """Cache activity of one crew."""
+    hits: int = 0
+    misses: int = 0
+    refused: int = 0
+    saved_seconds: float = 0.0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses + self.refused
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+class ExecutionCache:
+    """
+    Caches sandbox results of deterministic snippets.
+
+    Args:
+        directory: Optional directory for a persistent, content-addressed store;
+            without it the cache only lives in memory.
+    """
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None):
+        self.directory = Path(directory) if directory else None
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.stats: Dict[str, CacheStats] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[ExecutionResult]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None and self.directory and self._path(key).exists():
+            entry = json.loads(self._path(key).read_text())
+            with self._lock:
+                self._entries[key] = entry
+        if entry is None:
+            return None
+        # Timing fields keep describing the original run, i.e. the time a hit saves.
+        return ExecutionResult(**{**entry, "cached": True})
+
+    def put(self, key: str, result: ExecutionResult) -> None:
+        entry = {**result.to_dict(), "cached": False}
+        with self._lock:
+            self._entries[key] = entry
+        if self.directory:
+            path = self._path(key)
+            path.parent.mkdir(exist_ok=True)
+            # A unique temporary file, so concurrent puts of the same key never share one.
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as file:
+                file.write(json.dumps(entry))
+            os.replace(tmp, path)
+
+    def run(self, runner, code: str, inputs: Optional[Dict[str, Any]] = None,
+            crew: str = "default") -> ExecutionResult:
+        """
+        Returns the cached result of a snippet, or runs it with `runner` and caches it.
+
+        Args:
+            runner: Anything with a `run(code, inputs)` method, usually a SandboxPool.
+            code: The snippet to execute.
+            inputs: Variables injected into the snippet's namespace.
+            crew: Name under which hit rates are reported.
+        """
+        with self._lock:
+            stats = self.stats.setdefault(crew, CacheStats())
+
+        try:
+            reasons = find_non_deterministic(code)
+            key = None if reasons else cache_key(code, inputs)
+        except SyntaxError:
+            reasons, key = ["does not parse"], None
+
+        if key is not None:
+            cached = self.get(key)
+            if cached is not None:
+                with self._lock:
+                    stats.hits += 1
+                    # The queue wait of the original run depended on the load, not on the snippet.
+                    stats.saved_seconds += (cached.duration_seconds
+                                            + max(cached.overhead_seconds - cached.queued_seconds, 0.0))
+                return cached
+
+        result = runner.run(code, inputs)
+        with self._lock:
+            if key is None:
+                stats.refused += 1
+            else:
+                stats.misses += 1
+        if key is None:
+            logger.debug(f"Not caching snippet: {', '.join(reasons)}")
+        elif not (result.timed_out or result.crashed):
+            # Timeouts and limit kills depend on machine load, not on the code.
+            self.put(key, result)
+        return result
+
+    def report(self) -> str:
+        """Formats the hit rate of every crew as a plain-text table."""
+        lines = [f"{'crew':<12} {'lookups':>8} {'hits':>6} {'misses':>7} {'refused':>8} {'hit rate':>9} {'saved s':>8}"]
+        for crew, stats in sorted(self.stats.items()):
+            lines.append(
+                f"{crew:<12} {stats.lookups:>8} {stats.hits:>6} {stats.misses:>7} {stats.refused:>8} "
+                f"{stats.hit_rate:>9.0%} {stats.saved_seconds:>8.3f}"
+            )
+        return "\n".join(lines)
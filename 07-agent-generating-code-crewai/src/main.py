@@ -8,26 +8,61 @@ This script initializes and runs one of two crews based on user input:
 
 import argparse
 import logging
+from functools import partial
 from .config import app_config
-from .crew import create_coding_crew, create_debugging_crew
+from .crew import (
+    BUGGY_CODE, EXPECTED_DEBUG_OUTPUT, create_coding_crew, create_debugging_crew, create_optimization_crew
+)
+from .exec_cache import ExecutionCache
+from .optimizer import optimize
+from .sandbox import SandboxPool, run_cold
+from .static_check import prepass
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def run_coding_crew():
+def run_coding_crew(sandbox_pool=None, exec_cache=None):
     """Initializes and runs the coding crew."""
     logger.info("Starting the coding crew...")
-    coding_crew = create_coding_crew()
+    coding_crew = create_coding_crew(sandbox_pool=sandbox_pool, exec_cache=exec_cache)
     result = coding_crew.kickoff()
     logger.info("Coding crew finished.")
     print("\n--- Coding Crew Result ---")
     print(result)
     print("--------------------------\n")
 
-def run_debugging_crew():
-    """Initializes and runs the debugging crew."""
+def run_optimization_loop(target_ms, max_iterations, sandbox_pool=None, exec_cache=None):
+    """Runs the coding crew in a benchmark-and-improve loop until the target or the budget is reached."""
+    logger.info(f"Starting the optimization loop (target {target_ms} ms, {max_iterations} iterations max)...")
+    crew_factory = partial(create_optimization_crew, sandbox_pool=sandbox_pool, exec_cache=exec_cache)
+    report = optimize(crew_factory, target_seconds=target_ms / 1000, max_iterations=max_iterations)
+    logger.info("Optimization loop finished.")
+    print("\n--- Optimization Report ---")
+    print(report.format())
+    if report.best is not None:
+        print(f"\nFastest correct version (iteration {report.best.number}):\n{report.best.code}")
+    print("---------------------------\n")
+
+def run_debugging_crew(sandbox_pool=None, exec_cache=None, static_check=True):
+    """Initializes and runs the debugging crew, unless the static pre-pass already fixed the bug."""
+    diagnostics = None
+    if static_check:
+        report = prepass(BUGGY_CODE, EXPECTED_DEBUG_OUTPUT,
+                         execute=sandbox_pool.run if sandbox_pool is not None else run_cold)
+        logger.info(f"Static pre-pass finished in {report.seconds * 1000:.1f} ms "
+                    f"with {len(report.diagnostics)} diagnostics.")
+        if report.resolved_locally:
+            print("\n--- Debugging Result (static pre-pass, no LLM call) ---")
+            print(f"Bug: {report.patch.description}.")
+            print(f"Fixed code:\n```\n{report.patch.code}```")
+            print(f"Verified output: {report.patch.result.stdout.strip()}")
+            print("--------------------------------------------------------\n")
+            return
+        diagnostics = report.format_diagnostics() or None
+
     logger.info("Starting the debugging crew...")
-    debugging_crew = create_debugging_crew()
+    debugging_crew = create_debugging_crew(sandbox_pool=sandbox_pool, exec_cache=exec_cache,
+                                           diagnostics=diagnostics)
     result = debugging_crew.kickoff()
     logger.info("Debugging crew finished.")
     print("\n--- Debugging Crew Result ---")
@@ -38,19 +73,68 @@ def main():
     """Parses command-line arguments to determine which crew to run."""
     parser = argparse.ArgumentParser(description="Run a CrewAI example for code generation or debugging.")
     parser.add_argument(
-        "crew", 
-        choices=["coding", "debugging"], 
+        "crew",
+        choices=["coding", "debugging"],
         help="Specify which crew to run ('coding' or 'debugging')."
     )
+    parser.add_argument(
+        "--sandbox-pool",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Run generated code on N warm local sandbox workers instead of CrewAI's built-in code execution."
+    )
+    parser.add_argument(
+        "--exec-cache",
+        metavar="DIR",
+        help="Cache results of deterministic snippets in DIR (requires --sandbox-pool)."
+    )
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="Coding crew only: benchmark the generated code and ask for faster versions."
+    )
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=5.0,
+        help="Optimization target: milliseconds per call on one million ages (default: 5)."
+    )
+    parser.add_argument(
+        "--max-iterations",
+        type=int,
+        default=4,
+        help="Optimization budget: maximum number of crew runs (default: 4)."
+    )
+    parser.add_argument(
+        "--no-static-check",
+        action="store_true",
+        help="Always send the debugging task to the LLM, even if the static pre-pass can fix it."
+    )
     args = parser.parse_args()
+    if args.exec_cache and args.sandbox_pool < 1:
+        parser.error("--exec-cache requires --sandbox-pool.")
 
     # Access the configuration to ensure it's loaded
     _ = app_config
 
-    if args.crew == "coding":
-        run_coding_crew()
-    elif args.crew == "debugging":
-        run_debugging_crew()
+    sandbox_pool = SandboxPool(size=args.sandbox_pool) if args.sandbox_pool > 0 else None
+    exec_cache = ExecutionCache(args.exec_cache) if args.exec_cache else None
+    try:
+        if args.crew == "coding" and args.optimize:
+            run_optimization_loop(args.target_ms, args.max_iterations, sandbox_pool, exec_cache)
+        elif args.crew == "coding":
+            run_coding_crew(sandbox_pool, exec_cache)
+        elif args.crew == "debugging":
+            run_debugging_crew(sandbox_pool, exec_cache, static_check=not args.no_static_check)
+    finally:
+        if sandbox_pool is not None:
+            logger.info(f"Sandbox pool stats: {sandbox_pool.stats}")
+            sandbox_pool.close()
+        if exec_cache is not None:
+            print("--- Execution Cache ---")
+            print(exec_cache.report())
+            print("-----------------------\n")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,206 @@
+"""
+Performance optimization loop for the Code Generation & Debugging CrewAI Example.
+
+The coding crew normally stops as soon as its code prints a correct answer. This
+module benchmarks the generated function on scaled-up synthetic inputs with
+`timeit` and `tracemalloc`, feeds the measurements back to the agent and asks
+for faster versions until a time target is met or the iteration budget runs out.
+"""
+
+import ast
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence
+
+from .sandbox import ExecutionResult, SandboxLimits, run_cold
+
+logger = logging.getLogger(__name__)
+
+FUNCTION_NAME = "average_age"
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+# Benchmarks need more room than a single agent snippet.
+PROFILE_LIMITS = SandboxLimits(cpu_seconds=120, memory_bytes=4 * 1024 ** 3, wall_seconds=180.0)
+
+# Appended to the generated code; times the function at every input size and
+# returns the measurements as the value of the last expression.
+HARNESS = '''
+import json as _json, timeit as _timeit, tracemalloc as _tracemalloc
+
+def _profile(_function, _sizes):
+    _rows = []
+    for _size in _sizes:
+        _ages = [(_i * 7919) % 73 + 18 for _i in range(_size)]
+        _expected = sum(_ages) / _size
+        _value = float(_function(_ages))
+        _correct = abs(_value - _expected) <= 1e-6 * max(1.0, abs(_expected))
+        _timer = _timeit.Timer(lambda: _function(_ages))
+        _number, _ = _timer.autorange()
+        _seconds = min(_timer.repeat(repeat=3, number=_number)) / _number
+        _tracemalloc.start()
+        _function(_ages)
+        _peak = _tracemalloc.get_traced_memory()[1]
+        _tracemalloc.stop()
+        _rows.append({"size": _size, "seconds": _seconds, "peak_bytes": _peak, "correct": _correct})
+    return _json.dumps(_rows)
+
+_profile(__FUNCTION__, __SIZES__)
+'''
+
+@dataclass
+class Measurement:
+    """Timing and peak memory of the function at one input size."""
+    size: int
+    seconds: float
+    peak_bytes: int
+    correct: bool
+
+@dataclass
+class Iteration:
+    """One round of the loop: the code the agent produced and how it performed."""
+    number: int
+    code: str
+    measurements: List[Measurement] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def correct(self) -> bool:
+        return self.error is None and bool(self.measurements) and all(m.correct for m in self.measurements)
+
+    @property
+    def largest(self) -> Optional[Measurement]:
+        return self.measurements[-1] if self.measurements else None
+
+@dataclass
+class OptimizationReport:
+    """All iterations of an optimization run, with speedups relative to the first version."""
+    target_seconds: float
+    iterations: List[Iteration] = field(default_factory=list)
+
+    @property
+    def best(self) -> Optional[Iteration]:
+        correct = [iteration for iteration in self.iterations if iteration.correct]
+        return min(correct, key=lambda iteration: iteration.largest.seconds) if correct else None
+
+    @property
+    def target_met(self) -> bool:
+        return self.best is not None and self.best.largest.seconds <= self.target_seconds
+
+    def format(self) -> str:
+        """Formats speedup and peak memory per iteration at the largest input size."""
+        baseline = next((i.largest.seconds for i in self.iterations if i.correct), None)
+        lines = [f"{'iter':>4} {'size':>10} {'time/call':>12} {'speedup':>8} {'peak mem':>10}  status"]
+        for iteration in self.iterations:
+            if iteration.error or not iteration.measurements:
+                lines.append(f"{iteration.number:>4} {'-':>10} {'-':>12} {'-':>8} {'-':>10}  failed: "
+                             f"{(iteration.error or 'no measurements').splitlines()[-1]}")
+                continue
+            largest = iteration.largest
+            speedup = f"{baseline / largest.seconds:.1f}x" if baseline and iteration.correct else "-"
+            lines.append(
+                f"{iteration.number:>4} {largest.size:>10} {largest.seconds * 1000:>9.3f} ms {speedup:>8} "
+                f"{largest.peak_bytes / 1024 ** 2:>7.2f} MB  {'ok' if iteration.correct else 'WRONG RESULT'}"
+            )
+        status = "met" if self.target_met else "not met"
+        lines.append(f"Target {self.target_seconds * 1000:.3f} ms per call at the largest size: {status}.")
+        return "\n".join(lines)
+
+def extract_code(text: str, function_name: str = FUNCTION_NAME) -> Optional[str]:
+    """Returns the last fenced code block that parses and defines `function_name`."""
+    for block in reversed(re.findall(r"```(?:python|py)?\s*\n(.*?)```", text, re.DOTALL)):
+        try:
+            tree = ast.parse(block)
+        except SyntaxError:
+            continue
+        if any(isinstance(node, ast.FunctionDef) and node.name == function_name for node in tree.body):
+            return block
+    return None
+
+def _definitions_only(code: str) -> str:
+    """Drops top-level statements other than imports and definitions, so demo prints do not run."""
+    tree = ast.parse(code)
+    keep = (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef, ast.Assign, ast.AnnAssign)
+    tree.body = [node for node in tree.body if isinstance(node, keep)]
+    return ast.unparse(tree)
+
+def _run_profile(code: str) -> ExecutionResult:
+    return run_cold(code, limits=PROFILE_LIMITS, preload=("numpy",))
+
+def profile_code(code: str, sizes: Sequence[int] = DEFAULT_SIZES, function_name: str = FUNCTION_NAME,
+                 execute: Callable[[str], ExecutionResult] = _run_profile) -> Iteration:
+    """Benchmarks `function_name` from `code` on synthetic inputs of every size."""
+    iteration = Iteration(number=0, code=code)
+    try:
+        harness = _definitions_only(code) + HARNESS.replace("__FUNCTION__", function_name).replace(
+            "__SIZES__", repr(list(sizes)))
+    except SyntaxError as e:
+        iteration.error = f"SyntaxError: {e}"
+        return iteration
+
+    result = execute(harness)
+    if not result.ok or result.return_value is None:
+        iteration.error = result.error or ("Benchmark timed out." if result.timed_out else "No measurements.")
+        return iteration
+    rows = json.loads(ast.literal_eval(result.return_value))
+    iteration.measurements = [Measurement(**row) for row in rows]
+    return iteration
+
+def format_measurements(iteration: Iteration) -> str:
+    """Renders measurements the way they are fed back to the agent."""
+    if iteration.error:
+        return f"The benchmark failed:\n{iteration.error}"
+    lines = [
+        f"- {m.size:,} ages: {m.seconds * 1000:.3f} ms per call, peak memory "
+        f"{m.peak_bytes / 1024 ** 2:.2f} MB, result {'correct' if m.correct else 'WRONG'}"
+        for m in iteration.measurements
+    ]
+    return "\n".join(lines)
+
+def optimize(crew_factory: Callable[..., object], target_seconds: float, max_iterations: int = 4,
+             sizes: Sequence[int] = DEFAULT_SIZES,
+             execute: Callable[[str], ExecutionResult] = _run_profile) -> OptimizationReport:
+    """
+    Runs the benchmark-and-improve loop.
+
+    Args:
+        crew_factory: Called as `crew_factory(previous_code=..., feedback=...)`, returns a crew
+            whose output contains a fenced code block defining `average_age(ages)`.
+        target_seconds: Time per call at the largest input size that ends the loop.
+        max_iterations: Maximum number of crew runs (the LLM budget).
+        sizes: Synthetic input sizes used for the benchmark.
+        execute: Runs the benchmark harness; defaults to a cold sandbox with relaxed limits.
+
+    Returns:
+        An OptimizationReport with the measurements of every iteration.
+    """
+    report = OptimizationReport(target_seconds=target_seconds)
+    previous_code, feedback = None, None
+    for number in range(1, max_iterations + 1):
+        logger.info(f"Optimization iteration {number}/{max_iterations}")
+        result = crew_factory(previous_code=previous_code, feedback=feedback).kickoff()
+        code = extract_code(str(getattr(result, "raw", result)))
+        if code is None:
+            iteration = Iteration(number=number, code="", error=f"No code block defining {FUNCTION_NAME}() found.")
+        else:
+            iteration = profile_code(code, sizes, execute=execute)
+            iteration.number = number
+        report.iterations.append(iteration)
+
+        if iteration.correct:
+            logger.info(f"Iteration {number}: {iteration.largest.seconds * 1000:.3f} ms per call "
+                        f"at {iteration.largest.size:,} ages")
+            if iteration.largest.seconds <= target_seconds:
+                break
+
+        # The best correct version, else the latest one that had code (None if none had).
+        best = report.best
+        previous_code = best.code if best else (iteration.code or previous_code)
+        if code is None:
+            feedback = f"Your last answer was not usable: {iteration.error}"
+        else:
+            feedback = (
+                f"Measurements of the latest version:\n{format_measurements(iteration)}\n"
+                f"Target: at most {target_seconds * 1000:.3f} ms per call for {sizes[-1]:,} ages."
+            )
+    return report
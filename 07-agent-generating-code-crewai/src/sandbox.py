@@ -0,0 +1,337 @@
+"""
+Local sandbox executor for the Code Generation & Debugging CrewAI Example.
+
+This module keeps a pool of pre-started, isolated Python worker processes so
+that agent-generated code does not pay interpreter start-up on every run.
+Each worker executes exactly one snippet under resource limits (CPU time,
+address space, no network) and is then discarded; a replacement is started in
+the background, so every execution still gets a fresh process.
+"""
+
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - resource limits are POSIX-only
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Bootstrap executed by every worker process. It reports readiness, waits for a
+# single JSON request on stdin, runs it and writes a single JSON reply to the
+# protocol channel (a private copy of the original stdout file descriptor).
+#
+# The socket guard is an audit hook, which cannot be removed and also sees the
+# sockets created through _socket directly. It is best-effort: code that
+# reaches the OS another way (ctypes, a subprocess) is only kept off the
+# network by the private network namespace, when the kernel grants one.
+WORKER_SOURCE = r'''
+import ast, contextlib, io, json, os, sys, time, traceback
+
+def _guard(event, args):
+    if event.startswith("socket."):
+        raise PermissionError("Network access is disabled in the sandbox.")
+
+sys.addaudithook(_guard)
+
+for _name in json.loads(sys.argv[1]):
+    try:
+        __import__(_name)
+    except ImportError:
+        pass
+
+_channel = os.fdopen(os.dup(1), "w")
+_devnull = os.open(os.devnull, os.O_WRONLY)
+os.dup2(_devnull, 1)
+os.dup2(_devnull, 2)
+_channel.write("ready\n")
+_channel.flush()
+
+request = json.loads(sys.stdin.readline())
+stdout, stderr = io.StringIO(), io.StringIO()
+reply = {"return_value": None, "error": None}
+namespace = {"__name__": "__main__"}
+namespace.update(request.get("inputs") or {})
+started = time.perf_counter()
+try:
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        tree = ast.parse(request["code"], mode="exec")
+        last = tree.body.pop() if tree.body and isinstance(tree.body[-1], ast.Expr) else None
+        exec(compile(tree, "<sandbox>", "exec"), namespace)
+        if last is not None:
+            value = eval(compile(ast.Expression(last.value), "<sandbox>", "eval"), namespace)
+            reply["return_value"] = None if value is None else repr(value)
+except BaseException:
+    reply["error"] = traceback.format_exc(limit=-3)
+reply["duration_seconds"] = time.perf_counter() - started
+limit = request.get("max_output_chars", 20000)
+reply["stdout"] = stdout.getvalue()[:limit]
+reply["stderr"] = stderr.getvalue()[:limit]
+_channel.write(json.dumps(reply) + "\n")
+_channel.flush()
+'''
+
+@dataclass(frozen=True)
+class SandboxLimits:
+    """Resource limits applied to every sandbox worker."""
+    cpu_seconds: int = 10
+    memory_bytes: int = 512 * 1024 * 1024
+    wall_seconds: float = 30.0
+    max_output_chars: int = 20000
+
+@dataclass
+class ExecutionResult:
+    """Outcome of running one snippet in the sandbox."""
+    stdout: str = ""
+    stderr: str = ""
+    return_value: Optional[str] = None
+    error: Optional[str] = None
+    duration_seconds: float = 0.0
+    overhead_seconds: float = 0.0
+    # Part of the overhead spent waiting for a free worker of the pool.
+    queued_seconds: float = 0.0
+    timed_out: bool = False
+    crashed: bool = False
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.timed_out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+    def format(self) -> str:
+        """Renders the result the way an agent expects to read it."""
+        if self.timed_out:
+            return "Execution timed out."
+        parts = []
+        if self.stdout:
+            parts.append(self.stdout.rstrip())
+        if self.return_value is not None:
+            parts.append(f"Result: {self.return_value}")
+        if self.stderr:
+            parts.append(f"Stderr:\n{self.stderr.rstrip()}")
+        if self.error:
+            parts.append(f"Error:\n{self.error.rstrip()}")
+        output = "\n".join(parts) or "Code executed successfully with no output."
+        return f"(cached result of an identical earlier run)\n{output}" if self.cached else output
+
+def _limit_resources(limits: SandboxLimits):
+    """Returns a pre-exec hook that applies the resource limits in the child process."""
+    def apply():
+        os.setsid()
+        if resource is not None:
+            resource.setrlimit(resource.RLIMIT_CPU, (limits.cpu_seconds, limits.cpu_seconds))
+            resource.setrlimit(resource.RLIMIT_AS, (limits.memory_bytes, limits.memory_bytes))
+            resource.setrlimit(resource.RLIMIT_NOFILE, (64, 64))
+        if hasattr(os, "unshare"):
+            # A private network namespace has no interfaces at all; unprivileged
+            # users fall back to the best-effort socket guard inside the worker.
+            try:
+                os.unshare(os.CLONE_NEWNET)
+            except OSError:
+                pass
+    return apply
+
+class _Worker:
+    """A started worker process waiting for its single request."""
+
+    def __init__(self, python: str, limits: SandboxLimits, preload: Sequence[str]):
+        self.workdir = tempfile.mkdtemp(prefix="sandbox-")
+        started = time.perf_counter()
+        self.process = subprocess.Popen(
+            [python, "-I", "-c", WORKER_SOURCE, json.dumps(list(preload))],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=self.workdir,
+            env={"PATH": os.defpath, "PYTHONHASHSEED": "0"},
+            text=True,
+            preexec_fn=_limit_resources(limits) if os.name == "posix" else None,
+        )
+        if self.process.stdout.readline().strip() != "ready":
+            self.discard()
+            raise RuntimeError("Sandbox worker failed to start.")
+        self.startup_seconds = time.perf_counter() - started
+
+    def execute(self, code: str, inputs: Optional[Dict[str, Any]], limits: SandboxLimits) -> ExecutionResult:
+        request = {"code": code, "inputs": inputs or {}, "max_output_chars": limits.max_output_chars}
+        reply_box = []
+        started = time.perf_counter()
+
+        def exchange():
+            try:
+                self.process.stdin.write(json.dumps(request) + "\n")
+                self.process.stdin.flush()
+                reply_box.append(self.process.stdout.readline())
+            except (BrokenPipeError, ValueError):
+                reply_box.append("")
+
+        reader = threading.Thread(target=exchange, daemon=True)
+        reader.start()
+        reader.join(limits.wall_seconds)
+        elapsed = time.perf_counter() - started
+        if reader.is_alive():
+            return ExecutionResult(timed_out=True, duration_seconds=elapsed)
+
+        if not reply_box or not reply_box[0]:
+            # The worker died before replying, usually because it hit a resource limit.
+            self.process.wait(timeout=1)
+            return ExecutionResult(
+                error=f"Sandbox worker exited with code {self.process.returncode} "
+                      "(CPU or memory limit exceeded?)",
+                duration_seconds=elapsed,
+                crashed=True,
+            )
+
+        result = ExecutionResult(**json.loads(reply_box[0]))
+        result.overhead_seconds = max(elapsed - result.duration_seconds, 0.0)
+        return result
+
+    def discard(self):
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            if stream:
+                stream.close()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+def run_cold(code: str, inputs: Optional[Dict[str, Any]] = None, limits: SandboxLimits = SandboxLimits(),
+             python: str = sys.executable, preload: Sequence[str] = ()) -> ExecutionResult:
+    """Runs a snippet in a freshly started worker, paying the full start-up cost."""
+    started = time.perf_counter()
+    worker = _Worker(python, limits, preload)
+    try:
+        result = worker.execute(code, inputs, limits)
+    finally:
+        worker.discard()
+    result.overhead_seconds = time.perf_counter() - started - result.duration_seconds
+    return result
+
+class SandboxPool:
+    """
+    A pool of pre-started, single-use sandbox workers.
+
+    Args:
+        size: Number of warm workers kept ready; also the maximum number of
+            concurrent executions.
+        limits: Resource limits applied to every worker.
+        preload: Modules imported during warm-up so snippets do not pay for them.
+        python: Interpreter used for the workers.
+    """
+
+    def __init__(self, size: int = 4, limits: SandboxLimits = SandboxLimits(),
+                 preload: Sequence[str] = ("json", "math", "statistics", "collections"),
+                 python: str = sys.executable):
+        if size < 1:
+            raise ValueError("The sandbox pool needs at least one worker.")
+        self.size = size
+        self.limits = limits
+        self.preload = tuple(preload)
+        self.python = python
+        self.stats = {"executions": 0, "timeouts": 0, "errors": 0, "spawn_failures": 0}
+        # Holds None once the pool is closed.
+        self._ready: "queue.Queue[Optional[_Worker]]" = queue.Queue()
+        self._spawner = ThreadPoolExecutor(max_workers=size, thread_name_prefix="sandbox-spawn")
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(size):
+            self._spawner.submit(self._spawn)
+
+    def _spawn(self):
+        if self._closed:
+            return
+        try:
+            worker = _Worker(self.python, self.limits, self.preload)
+        except Exception as e:
+            with self._lock:
+                self.stats["spawn_failures"] += 1
+            logger.error(f"Could not start sandbox worker: {e}")
+            time.sleep(0.5)
+            self._submit(self._spawn)
+            return
+        if self._closed:
+            worker.discard()
+        else:
+            self._ready.put(worker)
+
+    def _submit(self, task) -> bool:
+        """Hands a task to the spawner threads; False once the pool is closed."""
+        with self._lock:
+            if self._closed:
+                return False
+            self._spawner.submit(task)
+            return True
+
+    def run(self, code: str, inputs: Optional[Dict[str, Any]] = None,
+            acquire_timeout: Optional[float] = None) -> ExecutionResult:
+        """Executes a snippet on a warm worker and recycles the worker afterwards."""
+        if self._closed:
+            raise RuntimeError("The sandbox pool is closed.")
+        waited = time.perf_counter()
+        worker = self._ready.get(timeout=acquire_timeout)
+        waited = time.perf_counter() - waited
+        if worker is None:
+            # Woken by close(); pass the wake-up on to the other waiters.
+            self._ready.put(None)
+            raise RuntimeError("The sandbox pool is closed.")
+        # Start the replacement right away so it warms up while this snippet runs.
+        self._submit(self._spawn)
+        try:
+            result = worker.execute(code, inputs, self.limits)
+        finally:
+            # Tear-down happens off the caller's critical path as well, unless
+            # the pool was closed meanwhile.
+            if not self._submit(worker.discard):
+                worker.discard()
+        result.overhead_seconds += waited
+        result.queued_seconds = waited
+
+        with self._lock:
+            self.stats["executions"] += 1
+            self.stats["timeouts"] += int(result.timed_out)
+            self.stats["errors"] += int(result.error is not None)
+        return result
+
+    def wait_ready(self, timeout: float = 30.0) -> bool:
+        """Blocks until every worker of the pool is warm."""
+        deadline = time.monotonic() + timeout
+        while self._ready.qsize() < self.size:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        self._spawner.shutdown(wait=True)
+        while True:
+            try:
+                worker = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                worker.discard()
+        # Wakes the callers still waiting for a worker.
+        self._ready.put(None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
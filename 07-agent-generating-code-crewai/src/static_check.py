@@ -0,0 +1,236 @@
+"""
+Static-analysis pre-pass for the Code Generation & Debugging CrewAI Example.
+
+Many bugs handed to the debugging crew can be found without an LLM: undefined
+names, misspelled identifiers and unreachable code. This module finds them with
+the `ast` and `symtable` modules, produces precise diagnostics for the task
+context and, when a single fix is clearly right, proposes a patch and verifies
+it by running the patched code in the sandbox.
+"""
+
+import ast
+import builtins
+import symtable
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .sandbox import ExecutionResult, run_cold
+
+# Neighbouring keys on a QWERTY keyboard, used to rank single-character typos.
+_KEYBOARD_ROWS = ["1234567890", "qwertyuiop", "asdfghjkl", "zxcvbnm"]
+_KEY_POSITIONS = {key: (row, col) for row, keys in enumerate(_KEYBOARD_ROWS) for col, key in enumerate(keys)}
+
+@dataclass
+class Diagnostic:
+    """A single finding of the pre-pass."""
+    kind: str
+    message: str
+    line: int
+    col: int = 0
+    name: Optional[str] = None
+    suggestions: List[str] = field(default_factory=list)
+
+    def format(self) -> str:
+        hint = f" Did you mean {' or '.join(repr(s) for s in self.suggestions)}?" if self.suggestions else ""
+        return f"line {self.line}, col {self.col + 1}: [{self.kind}] {self.message}.{hint}"
+
+@dataclass
+class Patch:
+    """A proposed fix together with the outcome of running it."""
+    description: str
+    code: str
+    verified: bool = False
+    result: Optional[ExecutionResult] = None
+
+@dataclass
+class AnalysisReport:
+    """Diagnostics for a snippet and, when one is safe to propose, a verified patch."""
+    code: str
+    diagnostics: List[Diagnostic] = field(default_factory=list)
+    patch: Optional[Patch] = None
+    seconds: float = 0.0
+
+    @property
+    def resolved_locally(self) -> bool:
+        """True when the verified patch makes an LLM call unnecessary."""
+        return self.patch is not None and self.patch.verified
+
+    def format_diagnostics(self) -> str:
+        return "\n".join(diagnostic.format() for diagnostic in self.diagnostics)
+
+def _edit_distance(a: str, b: str) -> float:
+    """Damerau-Levenshtein distance where substituting a neighbouring key costs half."""
+    rows = [[0.0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        rows[i][0] = i
+    for j in range(len(b) + 1):
+        rows[0][j] = j
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            if a[i - 1] == b[j - 1]:
+                cost = 0.0
+            else:
+                pa, pb = _KEY_POSITIONS.get(a[i - 1].lower()), _KEY_POSITIONS.get(b[j - 1].lower())
+                adjacent = pa and pb and abs(pa[0] - pb[0]) <= 1 and abs(pa[1] - pb[1]) <= 1
+                cost = 0.5 if adjacent else 1.0
+            rows[i][j] = min(rows[i - 1][j] + 1, rows[i][j - 1] + 1, rows[i - 1][j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                rows[i][j] = min(rows[i][j], rows[i - 2][j - 2] + 0.5)
+    return rows[-1][-1]
+
+def _rank_candidates(name: str, candidates: Set[str]) -> List[Tuple[float, str]]:
+    """Returns the plausible corrections of a misspelled name, best first."""
+    limit = 1.0 if len(name) <= 4 else 2.0
+    ranked = sorted((_edit_distance(name, candidate), candidate) for candidate in candidates if candidate != name)
+    return [(distance, candidate) for distance, candidate in ranked if distance <= limit]
+
+def _walk_tables(table: symtable.SymbolTable):
+    yield table
+    for child in table.get_children():
+        yield from _walk_tables(child)
+
+def _find_undefined(code: str) -> Dict[str, Set[str]]:
+    """
+    Maps every undefined name to the names visible where it is used.
+
+    A name is undefined when some scope reads it as a global while the module
+    never binds it and it is not a builtin.
+    """
+    module = symtable.symtable(code, "<snippet>", "exec")
+    module_names = {
+        symbol.get_name() for symbol in module.get_symbols()
+        if symbol.is_assigned() or symbol.is_imported() or symbol.is_namespace() or symbol.is_parameter()
+    }
+    # A function can bind a module name too, with a `global` declaration.
+    module_names |= {
+        symbol.get_name() for table in _walk_tables(module) for symbol in table.get_symbols()
+        if symbol.is_declared_global() and (symbol.is_assigned() or symbol.is_imported() or symbol.is_namespace())
+    }
+    builtin_names = set(dir(builtins))
+    undefined: Dict[str, Set[str]] = {}
+    for table in _walk_tables(module):
+        # Names bound in the scope of the use are plausible corrections (e.g. a comprehension variable).
+        local_names = {
+            symbol.get_name() for symbol in table.get_symbols()
+            if symbol.is_assigned() or symbol.is_parameter() or symbol.is_imported()
+        }
+        for symbol in table.get_symbols():
+            name = symbol.get_name()
+            if not symbol.is_referenced() or name in module_names or name in builtin_names:
+                continue
+            if table.get_type() == "module" or symbol.is_global():
+                undefined.setdefault(name, set()).update(local_names | module_names)
+    for names in undefined.values():
+        names.update(builtin_names)
+    return undefined
+
+def _find_unreachable(tree: ast.Module) -> List[Diagnostic]:
+    diagnostics = []
+    for node in ast.walk(tree):
+        for body_name in ("body", "orelse", "finalbody"):
+            body = getattr(node, body_name, None)
+            if not isinstance(body, list):
+                continue
+            for statement, following in zip(body, body[1:]):
+                if isinstance(statement, (ast.Return, ast.Raise, ast.Continue, ast.Break)):
+                    keyword = type(statement).__name__.lower()
+                    diagnostics.append(Diagnostic(
+                        "unreachable-code",
+                        f"statement can never run because it follows a '{keyword}' on line {statement.lineno}",
+                        following.lineno, following.col_offset,
+                    ))
+                    break
+        if isinstance(node, (ast.If, ast.While)) and isinstance(node.test, ast.Constant) and not node.test.value:
+            diagnostics.append(Diagnostic(
+                "unreachable-code", f"body of '{type(node).__name__.lower()}' with a false constant never runs",
+                node.body[0].lineno, node.body[0].col_offset,
+            ))
+    return diagnostics
+
+def _rename(code: str, old: str, new: str) -> str:
+    """Replaces every variable reference `old` with `new`, keeping the rest of the source intact."""
+    lines = code.splitlines(keepends=True)
+    positions = []
+    for node in ast.walk(ast.parse(code)):
+        if isinstance(node, ast.Name) and node.id == old:
+            # AST columns are UTF-8 byte offsets; convert them to character offsets.
+            line = lines[node.lineno - 1]
+            positions.append((node.lineno, len(line.encode("utf-8")[:node.col_offset].decode("utf-8"))))
+    for row, col in sorted(positions, reverse=True):
+        line = lines[row - 1]
+        lines[row - 1] = line[:col] + new + line[col + len(old):]
+    return "".join(lines)
+
+def analyze(code: str) -> List[Diagnostic]:
+    """Returns the diagnostics for a snippet; an unparsable snippet yields a single syntax error."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        return [Diagnostic("syntax-error", e.msg, e.lineno or 1, (e.offset or 1) - 1)]
+
+    diagnostics = []
+    for name, visible in _find_undefined(code).items():
+        node = next((n for n in ast.walk(tree)
+                     if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load) and n.id == name), None)
+        line, col = (node.lineno, node.col_offset) if node else (1, 0)
+        suggestions = [candidate for _, candidate in _rank_candidates(name, visible)[:3]]
+        kind = "possible-typo" if suggestions else "undefined-name"
+        diagnostics.append(Diagnostic(kind, f"name '{name}' is not defined", line, col,
+                                      name=name, suggestions=suggestions))
+    diagnostics += _find_unreachable(tree)
+    return sorted(diagnostics, key=lambda d: (d.line, d.col))
+
+def _propose_patch(code: str, diagnostics: List[Diagnostic]) -> Optional[Patch]:
+    """Proposes a rename only for the high-confidence case: one undefined name, one clear candidate."""
+    undefined = [d for d in diagnostics if d.name is not None]
+    if len(undefined) != 1 or any(d.kind == "syntax-error" for d in diagnostics):
+        return None
+
+    diagnostic = undefined[0]
+    visible = _find_undefined(code)[diagnostic.name]
+    ranked = _rank_candidates(diagnostic.name, visible)
+    if not ranked or (len(ranked) > 1 and ranked[0][0] == ranked[1][0]):
+        return None
+
+    candidate = ranked[0][1]
+    return Patch(
+        description=(
+            f"'{diagnostic.name}' on line {diagnostic.line} is not defined; "
+            f"it is most likely a typo for '{candidate}'"
+        ),
+        code=_rename(code, diagnostic.name, candidate),
+    )
+
+def prepass(code: str, expected_stdout: Optional[str] = None,
+            execute: Callable[[str], ExecutionResult] = run_cold) -> AnalysisReport:
+    """
+    Analyzes a snippet and tries to fix it locally.
+
+    Args:
+        code: The buggy snippet.
+        expected_stdout: Output the fixed code must print. Without it, the original
+            code must fail with a NameError for the renamed name and the patch
+            has to run cleanly.
+        execute: Runs code in the sandbox, e.g. `SandboxPool.run` or `run_cold`.
+
+    Returns:
+        An AnalysisReport whose `resolved_locally` tells whether the LLM can be skipped.
+    """
+    started = time.perf_counter()
+    report = AnalysisReport(code=code, diagnostics=analyze(code))
+    report.patch = _propose_patch(code, report.diagnostics)
+
+    if report.patch is not None and not analyze(report.patch.code):
+        result = execute(report.patch.code)
+        report.patch.result = result
+        if expected_stdout is not None:
+            confirmed = result.stdout.strip() == expected_stdout.strip()
+        else:
+            # Running cleanly proves little on its own; the diagnosis must be confirmed by the original run.
+            name = next(d.name for d in report.diagnostics if d.name is not None)
+            original = execute(code)
+            confirmed = f"NameError: name '{name}' is not defined" in (original.error or "")
+        report.patch.verified = result.ok and confirmed
+    report.seconds = time.perf_counter() - started
+    return report
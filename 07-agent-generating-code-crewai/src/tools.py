@@ -0,0 +1,27 @@
+"""
+Custom tools for the Code Generation & Debugging CrewAI Example.
+
+This module wraps the local sandbox pool as a CrewAI tool so agents can run
+Python code on pre-started workers instead of CrewAI's built-in code execution.
+An optional execution cache answers repeated runs of identical snippets.
+"""
+
+from typing import Any
+
+from crewai_tools import BaseTool
+
+class SandboxCodeInterpreterTool(BaseTool):
+    name: str = "Python Sandbox Interpreter"
+    description: str = (
+        "Executes a Python code snippet in an isolated sandbox and returns its printed output, "
+        "the value of the last expression and any error. The sandbox has no network access "
+        "and limited CPU time and memory. Input: the full Python code to run."
+    )
+    pool: Any = None
+    cache: Any = None
+    crew_name: str = "default"
+
+    def _run(self, code: str) -> str:
+        if self.cache is not None:
+            return self.cache.run(self.pool, code, crew=self.crew_name).format()
+        return self.pool.run(code).format()
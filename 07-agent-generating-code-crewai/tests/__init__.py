@@ -0,0 +1 @@
+"""Test package for the Code Generation & Debugging CrewAI Example."""
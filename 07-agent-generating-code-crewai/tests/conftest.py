@@ -0,0 +1,12 @@
+"""Pytest configuration and fixtures."""
+
+import pytest
+
+from src.sandbox import SandboxLimits, SandboxPool
+
+
+@pytest.fixture(scope="session")
+def sandbox_pool():
+    """A small warm pool shared by the tests that run code."""
+    with SandboxPool(size=2, limits=SandboxLimits(cpu_seconds=5, wall_seconds=10)) as pool:
+        yield pool
@@ -0,0 +1,83 @@
+"""Tests for the execution result cache."""
+
+import pytest
+
+from src.exec_cache import ExecutionCache, cache_key, find_non_deterministic
+from src.sandbox import ExecutionResult
+
+
+class FakeRunner:
+    """Returns a fixed result and counts its runs."""
+
+    def __init__(self, result):
+        self.result = result
+        self.runs = 0
+
+    def run(self, code, inputs=None):
+        self.runs += 1
+        return self.result
+
+# --- Cache key ---
+
+def test_formatting_and_comments_do_not_change_the_key():
+    assert cache_key("x = 1 + 2\nprint(x)") == cache_key("x=(1+2)  # sum\n\nprint( x )\n")
+
+def test_code_changes_the_key():
+    assert cache_key("print(1)") != cache_key("print(2)")
+
+def test_inputs_change_the_key_but_not_their_order():
+    assert cache_key("print(a)", {"a": 1}) != cache_key("print(a)", {"a": 2})
+    assert cache_key("print(a, b)", {"a": 1, "b": 2}) == cache_key("print(a, b)", {"b": 2, "a": 1})
+
+def test_interpreter_changes_the_key():
+    assert cache_key("print(1)", interpreter="CPython 3.10.0") != cache_key("print(1)", interpreter="CPython 3.11.0")
+
+# --- Non-deterministic snippets ---
+
+@pytest.mark.parametrize("code, reason", [
+    ("import random\nprint(random.random())", "imports random"),
+    ("from datetime import datetime\nprint(datetime.now())", "imports from datetime"),
+    ("import numpy.random", "imports numpy.random"),
+    ("from numpy import random", "imports numpy.random"),
+    ("from time import perf_counter", "imports perf_counter"),
+    ("print(open('data.txt').read())", "calls open()"),
+    ("print(id(object()))", "calls id()"),
+    ("x = clock.time()", "uses .time"),
+])
+def test_non_deterministic_snippets_are_detected(code, reason):
+    assert reason in find_non_deterministic(code)
+
+def test_deterministic_snippet_has_no_reason():
+    assert find_non_deterministic("import math\nimport numpy\nprint(math.sqrt(numpy.float64(4)))") == []
+
+def test_non_deterministic_snippet_is_run_every_time():
+    cache, runner = ExecutionCache(), FakeRunner(ExecutionResult(stdout="0.5\n"))
+    for _ in range(2):
+        assert not cache.run(runner, "import random\nprint(random.random())").cached
+    assert runner.runs == 2 and cache.stats["default"].refused == 2
+
+def test_snippet_that_does_not_parse_is_refused():
+    cache, runner = ExecutionCache(), FakeRunner(ExecutionResult(error="SyntaxError"))
+    cache.run(runner, "print(")
+    assert cache.stats["default"].refused == 1
+
+# --- Hits ---
+
+def test_repeated_snippet_is_answered_from_the_cache(tmp_path):
+    cache, runner = ExecutionCache(tmp_path), FakeRunner(ExecutionResult(stdout="3\n"))
+    cache.run(runner, "print(1 + 2)")
+    result = ExecutionCache(tmp_path).run(runner, "print(1+2)  # again")
+    assert result.cached and result.stdout == "3\n" and runner.runs == 1
+
+def test_saved_time_excludes_the_queue_wait():
+    original = ExecutionResult(stdout="3\n", duration_seconds=0.5, overhead_seconds=2.1, queued_seconds=2.0)
+    cache, runner = ExecutionCache(), FakeRunner(original)
+    cache.run(runner, "print(1 + 2)")
+    cache.run(runner, "print(1 + 2)")
+    assert cache.stats["default"].saved_seconds == pytest.approx(0.6)
+
+def test_timeouts_are_not_cached():
+    cache, runner = ExecutionCache(), FakeRunner(ExecutionResult(timed_out=True))
+    cache.run(runner, "while True: pass")
+    cache.run(runner, "while True: pass")
+    assert runner.runs == 2
@@ -0,0 +1,71 @@
+"""Tests for the sandbox worker pool."""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from src.sandbox import SandboxLimits, SandboxPool
+
+# --- Execution ---
+
+def test_run_returns_the_last_expression(sandbox_pool):
+    result = sandbox_pool.run("x = 6 * 7\nprint('done')\nx")
+    assert result.ok and result.stdout == "done\n" and result.return_value == "42"
+
+def test_run_reports_the_error(sandbox_pool):
+    result = sandbox_pool.run("1 / 0")
+    assert not result.ok and "ZeroDivisionError" in result.error
+
+# --- Network ---
+
+def test_network_access_fails_inside_a_worker(sandbox_pool):
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        port = server.getsockname()[1]
+        result = sandbox_pool.run(f"import socket\nsocket.create_connection(('127.0.0.1', {port}), timeout=1)")
+        server.settimeout(0.2)
+        with pytest.raises(socket.timeout):
+            server.accept()
+    assert "Network access is disabled in the sandbox." in result.error
+
+def test_raw_socket_module_is_guarded_too(sandbox_pool):
+    result = sandbox_pool.run("import _socket\n_socket.socket(_socket.AF_INET, _socket.SOCK_STREAM)")
+    assert "PermissionError" in result.error
+
+# --- Closing ---
+
+def test_close_during_a_run_keeps_its_result():
+    pool = SandboxPool(size=1, limits=SandboxLimits(wall_seconds=10))
+    assert pool.wait_ready()
+    results = []
+    runner = threading.Thread(target=lambda: results.append(pool.run("import time\ntime.sleep(1)\n42")))
+    runner.start()
+    time.sleep(0.2)
+    pool.close()
+    runner.join(10)
+    assert [result.return_value for result in results] == ["42"]
+    assert pool._ready.get_nowait() is None
+
+def test_close_wakes_a_run_waiting_for_a_worker():
+    # No worker can start, so run() waits until the pool is closed.
+    pool = SandboxPool(size=1, python="/nonexistent/python")
+    errors = []
+
+    def run():
+        try:
+            pool.run("1")
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    runner = threading.Thread(target=run)
+    runner.start()
+    pool.close()
+    runner.join(10)
+    assert not runner.is_alive() and errors == ["The sandbox pool is closed."]
+
+def test_run_on_a_closed_pool_fails():
+    pool = SandboxPool(size=1)
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.run("1")
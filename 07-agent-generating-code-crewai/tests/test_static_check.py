@@ -0,0 +1,89 @@
+"""Tests for the static-analysis pre-pass of the debugging crew."""
+
+from src.sandbox import ExecutionResult
+from src.static_check import analyze, prepass
+
+# --- Undefined names ---
+
+def test_typo_of_a_module_name():
+    [diagnostic] = analyze("numbers = [1, 2]\nprint(numbrs)\n")
+    assert (diagnostic.kind, diagnostic.name, diagnostic.line) == ("possible-typo", "numbrs", 2)
+    assert diagnostic.suggestions[0] == "numbers"
+
+def test_typo_of_a_builtin():
+    [diagnostic] = analyze("print(lne([1]))\n")
+    assert diagnostic.suggestions[0] == "len"
+
+def test_undefined_name_without_candidate():
+    [diagnostic] = analyze("print(completely_unknown_thing)\n")
+    assert diagnostic.kind == "undefined-name" and not diagnostic.suggestions
+
+def test_comprehension_variable_is_a_candidate():
+    [diagnostic] = analyze("squares = [n * m for n in range(3)]\n")
+    assert diagnostic.name == "m" and "n" in diagnostic.suggestions
+
+def test_name_bound_by_a_global_declaration_is_defined():
+    assert analyze("def f():\n    global g\n    g = 1\nf()\nprint(g)\n") == []
+
+def test_global_declaration_without_binding_is_still_undefined():
+    [diagnostic] = analyze("def f():\n    global g\n    return g\nf()\n")
+    assert diagnostic.name == "g"
+
+def test_class_scope_names_are_not_module_names():
+    # A class attribute is not visible as a bare name outside the class body.
+    [diagnostic] = analyze("class Config:\n    retries = 3\nprint(retries)\n")
+    assert (diagnostic.name, diagnostic.line) == ("retries", 3)
+    assert analyze("class Config:\n    retries = 3\n    doubled = retries * 2\n") == []
+
+def test_location_is_the_read_not_a_store():
+    [diagnostic] = analyze("def f():\n    h = 1\n    return valeu\nvalue = 2\n")
+    assert (diagnostic.line, diagnostic.col) == (3, 11)
+
+def test_syntax_error():
+    [diagnostic] = analyze("print('unclosed'\n")
+    assert diagnostic.kind == "syntax-error"
+
+# --- Unreachable code ---
+
+def test_code_after_return_is_unreachable():
+    diagnostics = analyze("def f():\n    return 1\n    print('never')\n")
+    assert [(d.kind, d.line) for d in diagnostics] == [("unreachable-code", 3)]
+
+def test_false_constant_condition_is_unreachable():
+    diagnostics = analyze("if False:\n    print('never')\nwhile 0:\n    pass\n")
+    assert [(d.kind, d.line) for d in diagnostics] == [("unreachable-code", 2), ("unreachable-code", 4)]
+
+# --- Patch verification ---
+
+def test_patch_verified_against_expected_output(sandbox_pool):
+    report = prepass("ages = [23, 35]\nprint(sum(ages) / lne(ages))\n", "29.0", execute=sandbox_pool.run)
+    assert report.resolved_locally
+    assert "len(ages)" in report.patch.code
+
+def test_patch_with_wrong_output_is_not_verified(sandbox_pool):
+    report = prepass("total = 0\nprint(totl)\n", "1", execute=sandbox_pool.run)
+    assert report.patch is not None and not report.resolved_locally
+
+def test_patch_without_expected_output_needs_the_original_to_fail(sandbox_pool):
+    report = prepass("value = 3\nprint(valeu)\n", execute=sandbox_pool.run)
+    assert report.resolved_locally and report.patch.result.stdout.strip() == "3"
+
+def test_no_patch_for_valid_code_with_a_global_declaration(sandbox_pool):
+    report = prepass("def f():\n    global g\n    g = 1\nf()\nprint(g)\n", execute=sandbox_pool.run)
+    assert report.diagnostics == [] and report.patch is None
+
+def test_patch_is_not_verified_when_the_original_runs():
+    # The analysis is wrong about the name (e.g. it is defined through exec); the original run refutes it.
+    calls = []
+
+    def execute(code):
+        calls.append(code)
+        return ExecutionResult(stdout="1\n")
+
+    report = prepass("exec('totl = 1')\nprint(totl)\ntotal = 0\n", execute=execute)
+    assert report.patch is not None and not report.resolved_locally
+    assert len(calls) == 2
+
+def test_ambiguous_candidates_give_no_patch():
+    report = prepass("xa = 1\nxc = 2\nprint(xb)\n", execute=lambda code: ExecutionResult())
+    assert report.patch is None
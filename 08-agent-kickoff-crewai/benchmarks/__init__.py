@@ -0,0 +1 @@
+"""Benchmarks for the Crew Execution Examples."""
@@ -0,0 +1,77 @@
+"""
+Benchmark of prompt size and latency versus dataset size.
+
+Compares the inline prompt, which interpolates every age into the task
+description, with the handle prompt, where the agent only sees a dataset handle
+and the compact JSON returned by the statistics tool. For each size it reports
+prompt tokens, the local time to build the prompt or compute the statistics,
+and the estimated LLM prefill time at an assumed token throughput (measuring
+real LLM latency needs an API key).
+
+Tokens are counted with `tiktoken` when it is installed, otherwise estimated at
+four characters per token.
+
+Usage:
+    python -m benchmarks.stats_prompt --sizes 5 1000 100000 1000000 10000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.crew import HANDLE_TASK_DESCRIPTION, INLINE_TASK_DESCRIPTION
+from src.stats_tool import DatasetRegistry, DatasetStatisticsTool, compute
+
+DEFAULT_SIZES = [5, 1_000, 100_000, 1_000_000, 10_000_000]
+
+def token_counter():
+    try:
+        import tiktoken
+    except ImportError:
+        return lambda text: len(text) // 4
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inline versus handle-based dataset prompts.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--prefill-tokens-per-second", type=float, default=5000.0,
+                        help="Assumed LLM prompt processing speed used for the latency estimate.")
+    parser.add_argument("--context-window", type=int, default=128_000,
+                        help="Model context window; larger inline prompts cannot be sent at all.")
+    args = parser.parse_args()
+
+    count_tokens = token_counter()
+    registry = DatasetRegistry()
+    tool_description = DatasetStatisticsTool().description
+    rng = np.random.default_rng(0)
+
+    print(f"{'values':>10} | {'inline tokens':>13} {'build':>9} {'est. prefill':>12} | "
+          f"{'handle tokens':>13} {'compute':>9} {'est. prefill':>12}")
+    for size in args.sizes:
+        ages = rng.integers(18, 91, size=size)
+
+        started = time.perf_counter()
+        inline_prompt = INLINE_TASK_DESCRIPTION.format(ages=ages.tolist())
+        inline_build = time.perf_counter() - started
+        inline_tokens = count_tokens(inline_prompt)
+        if inline_tokens > args.context_window:
+            inline_prefill = "too large"
+        else:
+            inline_prefill = f"{inline_tokens / args.prefill_tokens_per_second:.2f} s"
+        del inline_prompt
+
+        handle = registry.register(f"ages-{size}", ages)
+        started = time.perf_counter()
+        tool_output = str(compute(handle, source=registry))
+        compute_seconds = time.perf_counter() - started
+        # The handle prompt carries the task, the tool description and the tool result.
+        handle_tokens = count_tokens(HANDLE_TASK_DESCRIPTION.format(dataset=handle) + tool_description + tool_output)
+
+        print(f"{size:>10,} | {inline_tokens:>13,} {inline_build * 1000:>6.1f} ms {inline_prefill:>12} | "
+              f"{handle_tokens:>13,} {compute_seconds * 1000:>6.1f} ms "
+              f"{handle_tokens / args.prefill_tokens_per_second:>10.2f} s")
+
+if __name__ == "__main__":
+    main()
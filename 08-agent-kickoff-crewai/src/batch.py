@@ -0,0 +1,280 @@
+"""
+Parallel batch execution for the Crew Execution Examples.
+
+`kickoff_for_each` runs one input at a time. This module runs a crew factory
+over a large batch of inputs with a thread, asyncio or process-pool backend.
+Concurrency is adapted with an AIMD controller: it grows additively while calls
+succeed and is cut multiplicatively on rate limits (HTTP 429) or latency
+spikes. Results come back in input order, failed items are retried, and each
+batch reports its throughput and p50/p95 latency.
+"""
+
+import asyncio
+import heapq
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("thread", "asyncio", "process")
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Recognizes HTTP 429 / rate-limit errors across OpenAI, LiteLLM and requests exceptions."""
+    for candidate in (error, getattr(error, "response", None)):
+        if getattr(candidate, "status_code", None) == 429 or getattr(candidate, "status", None) == 429:
+            return True
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "ratelimit" in message
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit.
+
+    Args:
+        initial: Starting concurrency.
+        minimum: Concurrency never drops below this.
+        maximum: Concurrency never grows above this.
+        increase: Slots gained per "round" of successes (one success per current slot).
+        decrease_factor: Multiplier applied on a rate limit or a latency spike.
+        spike_factor: A latency above `spike_factor` times the moving average counts as a spike.
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 64, increase: float = 1.0,
+                 decrease_factor: float = 0.5, spike_factor: float = 3.0, ewma_alpha: float = 0.2):
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("Expected 1 <= minimum <= initial <= maximum.")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.spike_factor = spike_factor
+        self.ewma_alpha = ewma_alpha
+        self.peak = initial
+        self.backoffs = 0
+        self._limit = float(initial)
+        self._latency_ewma: Optional[float] = None
+        self._last_backoff = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _back_off(self) -> None:
+        # At most one cut per average latency, so a burst of failures from the
+        # same window does not collapse the limit to the minimum.
+        now = time.monotonic()
+        if now - self._last_backoff < (self._latency_ewma or 0.0):
+            return
+        self._last_backoff = now
+        self._limit = max(self.minimum, self._limit * self.decrease_factor)
+        self.backoffs += 1
+
+    def on_success(self, latency: float) -> None:
+        with self._lock:
+            if self._latency_ewma is not None and latency > self.spike_factor * self._latency_ewma:
+                self._back_off()
+            else:
+                self._limit = min(self.maximum, self._limit + self.increase / self._limit)
+                self.peak = max(self.peak, self.limit)
+            average = self._latency_ewma if self._latency_ewma is not None else latency
+            self._latency_ewma = (1 - self.ewma_alpha) * average + self.ewma_alpha * latency
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self._back_off()
+
+@dataclass
+class ItemResult:
+    """Outcome of one input of the batch."""
+    index: int
+    inputs: Dict[str, Any]
+    output: Any = None
+    error: Optional[str] = None
+    attempts: int = 0
+    latency_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+@dataclass
+class BatchReport:
+    """Ordered results of a batch together with its throughput and latency figures."""
+    backend: str
+    results: List[ItemResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    retries: int = 0
+    peak_concurrency: int = 0
+    final_concurrency: int = 0
+    backoffs: int = 0
+
+    @property
+    def outputs(self) -> List[Any]:
+        return [result.output for result in self.results]
+
+    @property
+    def failures(self) -> List[ItemResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def throughput(self) -> float:
+        succeeded = len(self.results) - len(self.failures)
+        return succeeded / self.wall_seconds if self.wall_seconds else 0.0
+
+    def latency_percentile(self, fraction: float) -> float:
+        latencies = sorted(result.latency_seconds for result in self.results if result.ok)
+        if not latencies:
+            return 0.0
+        return latencies[min(int(fraction * len(latencies)), len(latencies) - 1)]
+
+    def format(self) -> str:
+        return (
+            f"backend={self.backend} items={len(self.results)} failed={len(self.failures)} "
+            f"retries={self.retries} wall={self.wall_seconds:.2f}s throughput={self.throughput:.2f} items/s "
+            f"p50={self.latency_percentile(0.5):.2f}s p95={self.latency_percentile(0.95):.2f}s "
+            f"concurrency peak={self.peak_concurrency} final={self.final_concurrency} backoffs={self.backoffs}"
+        )
+
+def _kickoff_item(crew_factory: Callable[..., Any], factory_kwargs: Dict[str, Any],
+                  inputs: Dict[str, Any], raw_only: bool) -> Tuple[Any, float]:
+    """Builds a fresh crew and runs it on one input. Module-level so process pools can pickle it."""
+    crew = crew_factory(**factory_kwargs)
+    started = time.perf_counter()
+    output = crew.kickoff(inputs=inputs)
+    latency = time.perf_counter() - started
+    return (str(getattr(output, "raw", output)) if raw_only else output), latency
+
+class BatchExecutor:
+    """
+    Runs a crew factory over many inputs in parallel with adaptive concurrency.
+
+    Args:
+        crew_factory: Builds a new crew per item, e.g. `create_analysis_crew`. A fresh crew
+            per item keeps agents' memory and state from leaking between inputs.
+        backend: "thread", "asyncio" (uses `kickoff_async`) or "process". With the process
+            backend the factory must be importable at module level, and outputs are
+            returned as raw text because crew outputs cannot cross process boundaries.
+        controller: The AIMD controller; a default one is created when omitted.
+        max_retries: Extra attempts for a failed item.
+        retry_backoff: Base delay in seconds of the exponential retry backoff.
+        factory_kwargs: Keyword arguments passed to `crew_factory`.
+    """
+
+    def __init__(self, crew_factory: Callable[..., Any], backend: str = "thread",
+                 controller: Optional[AIMDController] = None, max_retries: int = 2,
+                 retry_backoff: float = 1.0, factory_kwargs: Optional[Dict[str, Any]] = None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {', '.join(BACKENDS)}.")
+        self.crew_factory = crew_factory
+        self.backend = backend
+        self.controller = controller or AIMDController()
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.factory_kwargs = factory_kwargs or {}
+
+    def _retry_delay(self, attempt: int) -> float:
+        return self.retry_backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+
+    def _record(self, report: BatchReport, item: ItemResult, outcome: Any, error: Optional[BaseException],
+                delayed: list) -> None:
+        """Updates the controller and decides whether an item is done or goes back for a retry."""
+        if error is None:
+            item.output, item.latency_seconds = outcome
+            item.error = None
+            self.controller.on_success(item.latency_seconds)
+            return
+
+        if is_rate_limit_error(error):
+            self.controller.on_throttle()
+        item.error = f"{type(error).__name__}: {error}"
+        if item.attempts <= self.max_retries:
+            report.retries += 1
+            heapq.heappush(delayed, (time.monotonic() + self._retry_delay(item.attempts), item.index))
+            logger.warning(f"Item {item.index} failed (attempt {item.attempts}), retrying: {item.error}")
+        else:
+            logger.error(f"Item {item.index} failed after {item.attempts} attempts: {item.error}")
+
+    def run(self, inputs: List[Dict[str, Any]]) -> BatchReport:
+        """Runs the whole batch and returns the results in input order."""
+        if self.backend == "asyncio":
+            return asyncio.run(self.run_async(inputs))
+
+        report = BatchReport(backend=self.backend, results=[ItemResult(i, item) for i, item in enumerate(inputs)])
+        ready = list(range(len(inputs)))
+        ready.reverse()
+        delayed: list = []
+        in_flight = {}
+        pool_class = ProcessPoolExecutor if self.backend == "process" else ThreadPoolExecutor
+        started = time.perf_counter()
+
+        with pool_class(max_workers=self.controller.maximum) as pool:
+            while ready or delayed or in_flight:
+                while delayed and delayed[0][0] <= time.monotonic():
+                    ready.append(heapq.heappop(delayed)[1])
+                while ready and len(in_flight) < self.controller.limit:
+                    item = report.results[ready.pop()]
+                    item.attempts += 1
+                    future = pool.submit(_kickoff_item, self.crew_factory, self.factory_kwargs,
+                                         item.inputs, self.backend == "process")
+                    in_flight[future] = item
+
+                timeout = max(delayed[0][0] - time.monotonic(), 0.0) if delayed else None
+                if not in_flight:
+                    time.sleep(timeout or 0.0)
+                    continue
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = in_flight.pop(future)
+                    error = future.exception()
+                    self._record(report, item, None if error else future.result(), error, delayed)
+
+        return self._finish(report, started)
+
+    async def run_async(self, inputs: List[Dict[str, Any]]) -> BatchReport:
+        """Runs the whole batch on the current event loop using `kickoff_async`."""
+        report = BatchReport(backend="asyncio", results=[ItemResult(i, item) for i, item in enumerate(inputs)])
+        ready = list(range(len(inputs)))
+        ready.reverse()
+        delayed: list = []
+        in_flight = {}
+        started = time.perf_counter()
+
+        async def kickoff(inputs_for_item):
+            crew = self.crew_factory(**self.factory_kwargs)
+            item_started = time.perf_counter()
+            output = await crew.kickoff_async(inputs=inputs_for_item)
+            return output, time.perf_counter() - item_started
+
+        while ready or delayed or in_flight:
+            while delayed and delayed[0][0] <= time.monotonic():
+                ready.append(heapq.heappop(delayed)[1])
+            while ready and len(in_flight) < self.controller.limit:
+                item = report.results[ready.pop()]
+                item.attempts += 1
+                in_flight[asyncio.ensure_future(kickoff(item.inputs))] = item
+
+            timeout = max(delayed[0][0] - time.monotonic(), 0.0) if delayed else None
+            if not in_flight:
+                await asyncio.sleep(timeout or 0.0)
+                continue
+            done, _ = await asyncio.wait(in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                item = in_flight.pop(task)
+                error = task.exception()
+                self._record(report, item, None if error else task.result(), error, delayed)
+
+        return self._finish(report, started)
+
+    def _finish(self, report: BatchReport, started: float) -> BatchReport:
+        report.wall_seconds = time.perf_counter() - started
+        report.peak_concurrency = self.controller.peak
+        report.final_concurrency = self.controller.limit
+        report.backoffs = self.controller.backoffs
+        logger.info(f"Batch finished: {report.format()}")
+        return report
@@ -7,12 +7,22 @@ analyze numerical data.
 
 from crewai import Agent, Task, Crew
 
-def create_analysis_crew(async_execution=False):
+from .stats_tool import DatasetStatisticsTool
+
+INLINE_TASK_DESCRIPTION = "Analyze the given dataset and calculate the average age of participants. Ages: {ages}"
+HANDLE_TASK_DESCRIPTION = (
+    "Analyze the dataset of participant ages referenced by the handle {dataset} and report the "
+    "average age. Use the Dataset Statistics tool to compute the figures; never estimate them yourself."
+)
+
+def create_analysis_crew(async_execution=False, use_stats_tool=False):
     """
     Creates and configures an analysis crew.
 
     Args:
         async_execution (bool): Whether the tasks should be executed asynchronously.
+        use_stats_tool (bool): Whether the dataset is passed by handle (`{dataset}`) and analyzed
+            with the statistics tool instead of being inlined into the prompt (`{ages}`).
 
     Returns:
         Crew: An instance of the analysis crew.
@@ -23,12 +33,13 @@ def create_analysis_crew(async_execution=False):
         goal="Analyze data and provide insights.",
         backstory="You are an experienced mathematician with a strong background in statistics.",
         verbose=True,
-        memory=True
+        memory=True,
+        tools=[DatasetStatisticsTool()] if use_stats_tool else []
     )
 
     # Create a data analysis task
     data_analysis_task = Task(
-        description="Analyze the given dataset and calculate the average age of participants. Ages: {ages}",
+        description=HANDLE_TASK_DESCRIPTION if use_stats_tool else INLINE_TASK_DESCRIPTION,
         agent=analysis_agent,
         expected_output="A report with the dataset and the calculated average age.",
         async_execution=async_execution
@@ -1,61 +1,85 @@
 """
 Main execution script for the Crew Execution Examples.
 
-This script demonstrates two different ways to execute a CrewAI crew:
-1. Asynchronously using `kickoff_async`.
+This script demonstrates three different ways to execute a CrewAI crew:
+1. Asynchronously, streaming each crew's result as soon as it completes.
 2. Sequentially over a list of inputs using `kickoff_for_each`.
+3. In parallel over a large batch of inputs with adaptive concurrency.
 """
 
 import argparse
+import json
 import logging
 import asyncio
+import tempfile
+from functools import partial
+from pathlib import Path
+import numpy as np
 from .config import app_config
 from .crew import create_analysis_crew
+from .batch import AIMDController, BatchExecutor
+from .stats_tool import registry
+from .streaming import CrewJob, as_completed_crews
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-async def run_async_crews():
-    """Initializes and runs two crews to demonstrate async execution."""
+def to_dataset_handles(datasets, directory=None):
+    """
+    Replaces inline `{"ages": [...]}` inputs with `{"dataset": <handle>}` for the statistics tool.
+
+    Datasets are kept in the in-memory registry, or saved as `.npy` files in
+    `directory` when the crews run in other processes and cannot see the registry.
+    """
+    handles = []
+    for index, inputs in enumerate(datasets):
+        if directory is None:
+            handle = registry.register(f"ages-{index}", inputs["ages"])
+        else:
+            handle = str(Path(directory) / f"ages-{index}.npy")
+            np.save(handle, np.asarray(inputs["ages"], dtype=np.float64))
+        handles.append({"dataset": handle})
+    return handles
+
+async def run_async_crews(use_stats_tool=False, timeout=None):
+    """Initializes and runs two crews to demonstrate async execution, printing each result as it completes."""
     logger.info("Starting asynchronous crew execution example...")
-    
-    # Create two crews: one configured for async, one for sync
-    async_crew = create_analysis_crew(async_execution=True)
-    sync_crew = create_analysis_crew(async_execution=False)
 
     # Define inputs
     inputs_1 = {"ages": [25, 30, 35, 40, 45]}
     inputs_2 = {"ages": [20, 25, 30, 35, 40]}
+    if use_stats_tool:
+        inputs_1, inputs_2 = to_dataset_handles([inputs_1, inputs_2])
 
-    # Kick off both crews
-    # The async crew is awaited directly.
-    # The sync crew's blocking kickoff is run in an executor to not block the event loop.
-    loop = asyncio.get_running_loop()
-    sync_task = loop.run_in_executor(None, sync_crew.kickoff, inputs_2)
-    
-    # Await both tasks
-    result_1 = await async_crew.kickoff_async(inputs=inputs_1)
-    result_2 = await sync_task
+    # Two jobs: one started with `kickoff_async`, one whose blocking `kickoff`
+    # runs on the stream's dedicated executor so it does not block the event loop.
+    jobs = [
+        CrewJob(partial(create_analysis_crew, async_execution=True, use_stats_tool=use_stats_tool),
+                inputs_1, name="Async Crew"),
+        CrewJob(partial(create_analysis_crew, async_execution=False, use_stats_tool=use_stats_tool),
+                inputs_2, name="Sync Crew", use_async=False),
+    ]
+
+    async for completed in as_completed_crews(jobs, max_concurrency=2, timeout=timeout, sync_workers=1):
+        print(f"\n--- {completed.name} Result ({completed.latency_seconds:.1f}s) ---")
+        print(completed.output if completed.ok else f"FAILED: {completed.error}")
+        print("-------------------------\n")
 
     logger.info("Asynchronous execution example finished.")
-    print("\n--- Async Crew Result ---")
-    print(result_1)
-    print("-------------------------\n")
-    print("\n--- Sync Crew Result (run in parallel) ---")
-    print(result_2)
-    print("------------------------------------------\n")
-
-def run_for_each_crew():
+
+def run_for_each_crew(use_stats_tool=False):
     """Initializes and runs a crew for each item in a list of inputs."""
     logger.info("Starting crew execution for a list of inputs...")
     
-    analysis_crew = create_analysis_crew()
+    analysis_crew = create_analysis_crew(use_stats_tool=use_stats_tool)
 
     datasets = [
         {"ages": [25, 30, 35, 40, 45]},
         {"ages": [20, 25, 30, 35, 40]},
         {"ages": [30, 35, 40, 45, 50]}
     ]
+    if use_stats_tool:
+        datasets = to_dataset_handles(datasets)
 
     results = analysis_crew.kickoff_for_each(inputs=datasets)
     
@@ -66,23 +90,86 @@ def run_for_each_crew():
         print("--------------------------")
     print("\n")
 
+def load_datasets(path=None):
+    """Loads batch inputs from a JSONL file (one `{"ages": [...]}` object per line)."""
+    if path is None:
+        return [
+            {"ages": [25, 30, 35, 40, 45]},
+            {"ages": [20, 25, 30, 35, 40]},
+            {"ages": [30, 35, 40, 45, 50]}
+        ]
+    with open(path, "r") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+async def run_parallel_crews(datasets, backend="thread", max_concurrency=16, use_stats_tool=False):
+    """Runs a fresh analysis crew per input in parallel with AIMD-controlled concurrency."""
+    logger.info(f"Starting parallel execution of {len(datasets)} inputs with the {backend} backend...")
+
+    controller = AIMDController(initial=min(4, max_concurrency), maximum=max_concurrency)
+    executor = BatchExecutor(create_analysis_crew, backend=backend, controller=controller,
+                             factory_kwargs={"use_stats_tool": use_stats_tool})
+    with tempfile.TemporaryDirectory() as directory:
+        if use_stats_tool:
+            datasets = to_dataset_handles(datasets, directory if backend == "process" else None)
+        if backend == "asyncio":
+            report = await executor.run_async(datasets)
+        else:
+            # The thread and process backends block, so keep them off the event loop.
+            report = await asyncio.get_running_loop().run_in_executor(None, executor.run, datasets)
+
+    logger.info("Parallel execution finished.")
+    print("\n--- Parallel Batch Results ---")
+    for result in report.results:
+        print(result.output if result.ok else f"FAILED after {result.attempts} attempts: {result.error}")
+        print("------------------------------")
+    print(report.format())
+    print("\n")
+
 async def main():
     """Parses command-line arguments to determine which execution method to run."""
     parser = argparse.ArgumentParser(description="Run a CrewAI example for different execution methods.")
     parser.add_argument(
         "method", 
-        choices=["async", "batch"], 
-        help="Specify which execution method to run ('async' or 'batch')."
+        choices=["async", "batch", "parallel"],
+        help="Specify which execution method to run ('async', 'batch' or 'parallel')."
+    )
+    parser.add_argument(
+        "--inputs",
+        help="JSONL file with one input per line for the 'parallel' method."
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["thread", "asyncio", "process"],
+        default="thread",
+        help="Concurrency backend for the 'parallel' method."
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=16,
+        help="Upper bound for the adaptive concurrency of the 'parallel' method."
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Per-crew timeout in seconds for the 'async' method."
+    )
+    parser.add_argument(
+        "--stats-tool",
+        action="store_true",
+        help="Pass datasets by handle and compute statistics with NumPy instead of inlining them into the prompt."
     )
     args = parser.parse_args()
 
     _ = app_config
 
     if args.method == "async":
-        await run_async_crews()
+        await run_async_crews(args.stats_tool, args.timeout)
     elif args.method == "batch":
         # This function is synchronous, but we call it from an async main
-        run_for_each_crew()
+        run_for_each_crew(args.stats_tool)
+    elif args.method == "parallel":
+        await run_parallel_crews(load_datasets(args.inputs), args.backend, args.max_concurrency, args.stats_tool)
 
 if __name__ == "__main__":
     asyncio.run(main())
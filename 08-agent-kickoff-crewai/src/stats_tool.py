@@ -0,0 +1,133 @@
+"""
+Dataset statistics tool for the Crew Execution Examples.
+
+Interpolating raw data such as `{ages}` into a prompt makes prompt size and cost
+grow with the data and leaves the arithmetic to the LLM. This module keeps the
+data out of the prompt: datasets are referenced by a handle (an in-memory
+registry entry or a `.npy`, `.npz`, `.csv` or `.json` file) and the agent calls
+a tool that computes vectorized NumPy statistics and returns a compact summary.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from crewai_tools import BaseTool
+
+MEMORY_SCHEME = "mem://"
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+class DatasetRegistry:
+    """Maps dataset handles to NumPy arrays, optionally with group keys per value."""
+
+    def __init__(self):
+        self._datasets: Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, values: Sequence[float], groups: Optional[Sequence[Any]] = None) -> str:
+        """Stores a dataset in memory and returns its handle, e.g. `mem://ages-0`."""
+        array = np.asarray(values, dtype=np.float64)
+        group_array = None if groups is None else np.asarray(groups)
+        if group_array is not None and len(group_array) != len(array):
+            raise ValueError("groups must have the same length as values.")
+        with self._lock:
+            self._datasets[name] = (array, group_array)
+        return f"{MEMORY_SCHEME}{name}"
+
+    def resolve(self, handle: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Returns `(values, groups)` for a handle; `groups` is None when the dataset has none."""
+        if handle.startswith(MEMORY_SCHEME):
+            with self._lock:
+                try:
+                    return self._datasets[handle[len(MEMORY_SCHEME):]]
+                except KeyError:
+                    raise ValueError(f"Unknown dataset handle: {handle}") from None
+
+        path = Path(handle)
+        if not path.exists():
+            raise ValueError(f"Dataset file not found: {handle}")
+        suffix = path.suffix.lower()
+        if suffix == ".npy":
+            # Memory-mapped, so even very large files are not read in full up front.
+            return np.load(path, mmap_mode="r"), None
+        if suffix == ".npz":
+            archive = np.load(path)
+            return archive["values"], archive["groups"] if "groups" in archive.files else None
+        if suffix in (".csv", ".txt"):
+            return np.loadtxt(path, delimiter=",", ndmin=1), None
+        if suffix == ".json":
+            data = json.loads(path.read_text())
+            if isinstance(data, dict):
+                groups = data.get("groups")
+                return np.asarray(data["values"], dtype=np.float64), None if groups is None else np.asarray(groups)
+            return np.asarray(data, dtype=np.float64), None
+        raise ValueError(f"Unsupported dataset format: {suffix}")
+
+# Registry shared by the crews and the tool within one process.
+registry = DatasetRegistry()
+
+def summarize(values: np.ndarray, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+    """Count, mean, standard deviation, extremes, median and percentiles in a few vectorized passes."""
+    if values.size == 0:
+        return {"count": 0}
+    points = np.percentile(values, list(percentiles))
+    return {
+        "count": int(values.size),
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "median": float(np.median(values)),
+        "percentiles": {f"p{p:g}": float(v) for p, v in zip(percentiles, points)},
+    }
+
+def histogram(values: np.ndarray, bins: int = 10) -> Dict[str, Any]:
+    counts, edges = np.histogram(values, bins=bins)
+    return {"bin_edges": [round(float(edge), 4) for edge in edges], "counts": counts.tolist()}
+
+def grouped(values: np.ndarray, groups: np.ndarray) -> Dict[str, Dict[str, float]]:
+    """Count, mean, min and max per group, computed with `bincount` and `ufunc.at` instead of a loop."""
+    keys, codes = np.unique(groups, return_inverse=True)
+    counts = np.bincount(codes)
+    sums = np.bincount(codes, weights=values)
+    minimums = np.full(len(keys), np.inf)
+    maximums = np.full(len(keys), -np.inf)
+    np.minimum.at(minimums, codes, values)
+    np.maximum.at(maximums, codes, values)
+    return {
+        str(key): {"count": int(c), "mean": float(s / c), "min": float(lo), "max": float(hi)}
+        for key, c, s, lo, hi in zip(keys, counts, sums, minimums, maximums)
+    }
+
+def compute(handle: str, operation: str = "summary", percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+            bins: int = 10, source: DatasetRegistry = registry) -> Dict[str, Any]:
+    """Runs one statistics operation ("summary", "histogram" or "grouped") on a dataset handle."""
+    values, groups = source.resolve(handle)
+    values = np.asarray(values, dtype=np.float64)
+    if operation == "summary":
+        return summarize(values, percentiles)
+    if operation == "histogram":
+        return histogram(values, bins)
+    if operation == "grouped":
+        if groups is None:
+            raise ValueError(f"Dataset {handle} has no group keys.")
+        return grouped(values, groups)
+    raise ValueError(f"Unknown operation '{operation}', expected summary, histogram or grouped.")
+
+class DatasetStatisticsTool(BaseTool):
+    name: str = "Dataset Statistics"
+    description: str = (
+        "Computes exact statistics for a dataset referenced by its handle, without reading the raw values. "
+        "Arguments: dataset (the handle, e.g. 'mem://ages-0' or a file path), operation ('summary' for "
+        "count/mean/std/min/max/median/percentiles, 'histogram', or 'grouped' for per-group aggregates), "
+        "percentiles (optional comma-separated list, e.g. '10,90'), bins (histogram bins, default 10)."
+    )
+
+    def _run(self, dataset: str, operation: str = "summary", percentiles: str = "", bins: int = 10) -> str:
+        points = [float(p) for p in percentiles.split(",") if p.strip()] or DEFAULT_PERCENTILES
+        try:
+            return json.dumps(compute(dataset, operation, points, int(bins)))
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
@@ -0,0 +1,118 @@
+"""
+As-completed streaming of crew results for the Crew Execution Examples.
+
+Awaiting crews one after another holds every result back until the slowest one
+is done. `as_completed_crews` runs many (crew factory, inputs) jobs on one event
+loop, bounded by a semaphore, and yields each result as soon as its crew
+finishes, so consumers can start working on early results right away. Crews
+can have a timeout, closing the generator cancels everything still running,
+and sync-only crews run on a dedicated, sized thread pool instead of the
+loop's default executor.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CrewJob:
+    """
+    One crew run.
+
+    Args:
+        crew_factory: Builds the crew, called once the job gets a concurrency slot.
+        inputs: Inputs passed to the crew's kickoff.
+        name: Label used in results and logs; defaults to the job's position.
+        use_async: Run with `kickoff_async`; set to False for crews that only support
+            the blocking `kickoff`, which then runs on the dedicated executor.
+        timeout: Seconds before the job is cancelled; overrides the generator's default.
+    """
+    crew_factory: Callable[[], Any]
+    inputs: Dict[str, Any]
+    name: Optional[str] = None
+    use_async: bool = True
+    timeout: Optional[float] = None
+
+@dataclass
+class CompletedCrew:
+    """Outcome of one job, yielded in completion order."""
+    index: int
+    name: str
+    inputs: Dict[str, Any]
+    output: Any = None
+    error: Optional[str] = None
+    timed_out: bool = False
+    latency_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+async def _run_job(index: int, job: CrewJob, semaphore: asyncio.Semaphore, executor: ThreadPoolExecutor,
+                   default_timeout: Optional[float]) -> CompletedCrew:
+    result = CompletedCrew(index=index, name=job.name or f"crew-{index}", inputs=job.inputs)
+    timeout = job.timeout if job.timeout is not None else default_timeout
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            crew = job.crew_factory()
+            if job.use_async:
+                run = crew.kickoff_async(inputs=job.inputs)
+            else:
+                run = asyncio.get_running_loop().run_in_executor(executor, crew.kickoff, job.inputs)
+            result.output = await asyncio.wait_for(run, timeout)
+        except asyncio.TimeoutError:
+            # A blocking kickoff cannot be interrupted; its thread finishes in the
+            # background but the result is discarded.
+            result.timed_out = True
+            result.error = f"Timed out after {timeout} seconds."
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        result.latency_seconds = time.perf_counter() - started
+    if result.ok:
+        logger.info(f"{result.name} finished in {result.latency_seconds:.2f}s")
+    else:
+        logger.warning(f"{result.name} failed: {result.error}")
+    return result
+
+async def as_completed_crews(jobs: Iterable[CrewJob], max_concurrency: int = 8, timeout: Optional[float] = None,
+                             sync_workers: int = 4) -> AsyncIterator[CompletedCrew]:
+    """
+    Runs crew jobs concurrently and yields each result as soon as it completes.
+
+    Args:
+        jobs: The crews to run.
+        max_concurrency: Maximum number of crews running at the same time.
+        timeout: Default per-crew timeout in seconds; None waits indefinitely.
+        sync_workers: Size of the thread pool that runs jobs with `use_async=False`.
+
+    Yields:
+        CompletedCrew results in completion order; failures and timeouts are
+        yielded too rather than raised.
+
+    Breaking out of the loop, calling `aclose()` or cancelling the consumer
+    cancels every job that is still queued or running.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    executor = ThreadPoolExecutor(max_workers=sync_workers, thread_name_prefix="sync-crew")
+    pending = {
+        asyncio.ensure_future(_run_job(index, job, semaphore, executor, timeout))
+        for index, job in enumerate(jobs)
+    }
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.info(f"Cancelled {len(pending)} unfinished crews.")
+            await asyncio.gather(*pending, return_exceptions=True)
+        executor.shutdown(wait=False)
@@ -5,45 +5,85 @@ This module defines the agents, tasks, and crew responsible for collecting,
 verifying, and summarizing event data based on a conditional workflow.
 """
 
-from typing import List
+from functools import partial
+from typing import List, Optional
 from pydantic import BaseModel
 from crewai import Agent, Task, Crew
 from crewai.tasks.conditional_task import ConditionalTask
 from crewai.tasks.task_output import TaskOutput
 from crewai_tools import SerperDevTool
 
+from .events import CountingSerperTool, EventAccumulator, KnownEventsTool
+from .structured_output import parse_model, repairing_converter
+
+# Number of events the crew is asked to collect
+MIN_EVENTS = 8
+
 # --- Pydantic Model for Task Output ---
 class EventsData(BaseModel):
     """Data model for a list of events."""
     events: List[str]
 
 # --- Condition Function for the Conditional Task ---
-def should_fetch_more_data(output: TaskOutput) -> bool:
+def should_fetch_more_data(output: TaskOutput, metrics=None) -> bool:
     """
     Determines if more data needs to be fetched based on the number of events found.
 
     Args:
         output (TaskOutput): The output from the previous task.
+        metrics (RunMetrics, optional): Counts outputs that had to be parsed locally.
 
     Returns:
         bool: True if the number of events is less than 8, False otherwise.
     """
     # Check if the pydantic model is not None and has the 'events' attribute
     if output.pydantic and hasattr(output.pydantic, 'events'):
-        return len(output.pydantic.events) < 8
+        return len(output.pydantic.events) < MIN_EVENTS
+    # The conversion failed; parse the raw output locally before paying for a whole extra round
+    events_data = parse_model(str(getattr(output, "raw", "") or ""), EventsData)
+    if events_data is not None:
+        if metrics is not None:
+            metrics.local_repairs += 1
+            metrics.llm_calls_avoided += 1
+        return len(events_data.events) < MIN_EVENTS
     # Fallback if the output is not as expected
     return True
 
 # --- Crew Definition ---
-def create_event_crew():
-    """Creates and configures the event planning crew."""
+def create_event_crew(accumulator: Optional[EventAccumulator] = None, incremental: bool = True,
+                      structured_output: bool = False):
+    """
+    Creates and configures the event planning crew.
+
+    Args:
+        accumulator (EventAccumulator, optional): Collects and deduplicates the events of
+            every fetch round and counts rounds and Serper calls in its metrics.
+        incremental (bool): With an accumulator, let the agents see the events collected so
+            far so a re-fetch round only searches for the missing ones. When False the
+            accumulator only measures the run, which gives a baseline for comparison.
+        structured_output (bool): When malformed JSON cannot be repaired locally, convert it
+            with the provider's JSON-schema structured output before CrewAI's default conversion.
+
+    Returns:
+        Crew: The event planning crew.
+    """
+    incremental = accumulator is not None and incremental
+    if accumulator is not None:
+        search_tool = CountingSerperTool(metrics=accumulator.metrics)
+    else:
+        search_tool = SerperDevTool()
+    known_events_tools = [KnownEventsTool(accumulator=accumulator)] if incremental else []
+    metrics = accumulator.metrics if accumulator is not None else None
+    # Malformed JSON is repaired locally before any LLM conversion.
+    converter_cls = repairing_converter(metrics, use_provider_schema=structured_output)
+
     # Define Agents
     data_collector = Agent(
         role="Data Collector",
         goal="Retrieve event data using the Serper tool",
         backstory="You have a knack for finding the most exciting events happening around.",
         verbose=True,
-        tools=[SerperDevTool()],
+        tools=[search_tool],
         allow_delegation=False,
     )
 
@@ -52,6 +92,7 @@ def create_event_crew():
         goal="Analyze the collected data and trigger re-collection if needed",
         backstory="You're known for your analytical skills, ensuring data quality and completeness.",
         verbose=True,
+        tools=known_events_tools + [search_tool] if incremental else [],
         allow_delegation=False,
     )
 
@@ -60,6 +101,7 @@ def create_event_crew():
         goal="Produce a concise summary from the event data",
         backstory="You're a skilled writer, able to summarize information clearly and effectively.",
         verbose=True,
+        tools=known_events_tools,
         allow_delegation=False,
     )
 
@@ -69,18 +111,41 @@ def create_event_crew():
         expected_output="A list of 8 exciting events happening in NYC this week",
         agent=data_collector,
         output_pydantic=EventsData,
+        converter_cls=converter_cls,
+        callback=accumulator.on_task_output if accumulator is not None else None,
     )
 
-    verify_data_task = ConditionalTask(
-        description="Ensure that sufficient event data has been collected. If fewer than 8 events are found, delegate back to the data_collector to gather more.",
-        expected_output="An updated list of at least 8 events happening in NYC this week",
-        condition=should_fetch_more_data,
-        agent=data_analyzer,
-        tasks=[fetch_task] # Task to run if condition is met
-    )
+    if incremental:
+        # Decide on the deduplicated total rather than on the last round alone, and
+        # only ask for the events that are still missing.
+        verify_data_task = ConditionalTask(
+            description=(
+                f"Ensure that at least {MIN_EVENTS} distinct events have been collected. First call the "
+                "Known Events tool to see which events are already collected, then use the Serper tool to "
+                "find only additional events that are not on that list. Do not repeat known events."
+            ),
+            expected_output="A list of the newly found events happening in NYC this week, excluding known events",
+            condition=lambda output: len(accumulator) < MIN_EVENTS,
+            agent=data_analyzer,
+            output_pydantic=EventsData,
+            converter_cls=converter_cls,
+            callback=accumulator.on_task_output,
+        )
+    else:
+        verify_data_task = ConditionalTask(
+            description="Ensure that sufficient event data has been collected. If fewer than 8 events are found, delegate back to the data_collector to gather more.",
+            expected_output="An updated list of at least 8 events happening in NYC this week",
+            condition=partial(should_fetch_more_data, metrics=metrics),
+            agent=data_analyzer,
+            tasks=[fetch_task], # Task to run if condition is met
+            callback=accumulator.on_task_output if accumulator is not None else None,
+        )
 
+    summary_description = "Summarize the collected events data for NYC into a clear, engaging paragraph."
+    if incremental:
+        summary_description += " Use the Known Events tool for the complete, deduplicated list of events."
     summary_task = Task(
-        description="Summarize the collected events data for NYC into a clear, engaging paragraph.",
+        description=summary_description,
         expected_output="A well-written summary of the events.",
         agent=summary_creator,
         context=[fetch_task, verify_data_task]
@@ -0,0 +1,280 @@
+"""
+Dependency-graph task execution for the Conditional Tasks CrewAI Example.
+
+A sequential crew runs its tasks in list order even when their dependencies
+are declared explicitly through `context`. `DagExecutor` builds a DAG from
+those declarations and runs every task whose dependencies are done on a
+bounded thread pool, so independent tasks run concurrently. Outputs are
+returned in task order whatever the completion order. Each task's wait time
+and the critical path are recorded, and can be exported as JSON, to show
+where the latency comes from.
+
+Dependencies follow CrewAI's sequential semantics:
+- a task with `context=[...]` depends on exactly those tasks;
+- a task without `context` receives the previous task's output, so it depends
+  on the previous task (declare `context=[]` to make it independent);
+- a `ConditionalTask` evaluates its condition on the previous task's output,
+  so it always depends on the previous task as well.
+
+Tasks run through CrewAI's public task API (`interpolate_inputs`,
+`execute_sync`, the agents' delegation tools). Only the planning step has no
+public entry point; it is used when the crew plans, behind a version check.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Dict, List, Optional, Tuple
+
+from crewai.tasks.conditional_task import ConditionalTask
+from crewai.utilities.formatter import aggregate_raw_outputs_from_task_outputs
+
+logger = logging.getLogger(__name__)
+
+# Oldest CrewAI with the task API (execute_sync, ConditionalTask, TaskOutput) the executor runs on.
+MIN_CREWAI_VERSION = (0, 51, 0)
+
+def crewai_version() -> Tuple[int, ...]:
+    """The installed CrewAI version as a tuple of ints, () when it cannot be determined."""
+    try:
+        return tuple(int(part) for part in re.findall(r"\d+", version("crewai"))[:3])
+    except PackageNotFoundError:
+        return ()
+
+def check_crewai_version() -> None:
+    """Fails with a clear message, before any task runs, on a CrewAI the executor does not support."""
+    installed = crewai_version()
+    if installed and installed < MIN_CREWAI_VERSION:
+        raise RuntimeError(
+            f"DagExecutor needs crewai>={'.'.join(map(str, MIN_CREWAI_VERSION))}, but "
+            f"{'.'.join(map(str, installed))} is installed; upgrade crewai or run without --dag."
+        )
+
+@dataclass
+class TaskTiming:
+    """When one task became ready, started and finished, relative to the start of the run."""
+    index: int
+    name: str
+    dependencies: List[int]
+    ready_at: float = 0.0
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    skipped: bool = False
+
+    @property
+    def wait_seconds(self) -> float:
+        """Time between the dependencies finishing and the task starting (pool or agent busy)."""
+        return self.started_at - self.ready_at
+
+    @property
+    def run_seconds(self) -> float:
+        return self.finished_at - self.started_at
+
+@dataclass
+class DagReport:
+    """Outputs in task order, with per-task timings and the critical path of the run."""
+    outputs: List[Any] = field(default_factory=list)
+    timings: List[TaskTiming] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    max_workers: int = 1
+
+    @property
+    def final_output(self) -> Any:
+        return self.outputs[-1] if self.outputs else None
+
+    @property
+    def critical_path(self) -> List[int]:
+        """
+        The chain of tasks that determined the total latency: starting from the task
+        that finished last, repeatedly follow the dependency that finished last.
+        """
+        if not self.timings:
+            return []
+        current = max(self.timings, key=lambda timing: timing.finished_at)
+        path = [current.index]
+        while current.dependencies:
+            current = max((self.timings[i] for i in current.dependencies), key=lambda timing: timing.finished_at)
+            path.append(current.index)
+        return path[::-1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_seconds": self.wall_seconds,
+            "max_workers": self.max_workers,
+            "critical_path": self.critical_path,
+            "tasks": [
+                dict(asdict(timing), wait_seconds=timing.wait_seconds, run_seconds=timing.run_seconds)
+                for timing in self.timings
+            ],
+        }
+
+    def export(self, path: str) -> None:
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def format(self) -> str:
+        critical = set(self.critical_path)
+        lines = [f"{'task':<40} {'deps':<8} {'wait':>7} {'run':>7}  critical"]
+        for timing in self.timings:
+            deps = ",".join(str(i) for i in timing.dependencies) or "-"
+            status = "skipped" if timing.skipped else ""
+            lines.append(
+                f"{timing.index}: {timing.name[:37]:<37} {deps:<8} {timing.wait_seconds:>6.1f}s "
+                f"{timing.run_seconds:>6.1f}s  {'*' if timing.index in critical else ''} {status}".rstrip()
+            )
+        lines.append(f"Wall time {self.wall_seconds:.1f}s with {self.max_workers} workers; "
+                     f"critical path {' -> '.join(str(i) for i in self.critical_path)}.")
+        return "\n".join(lines)
+
+def build_dependencies(tasks: List[Any]) -> List[List[int]]:
+    """Returns the dependency indices of every task and rejects unknown or cyclic dependencies."""
+    position = {id(task): index for index, task in enumerate(tasks)}
+    dependencies: List[List[int]] = []
+    for index, task in enumerate(tasks):
+        if task.context is None or isinstance(task, ConditionalTask):
+            deps = {index - 1} if index > 0 else set()
+        else:
+            deps = set()
+        for context_task in task.context or []:
+            if id(context_task) not in position:
+                raise ValueError(f"Task {index} depends on a task that is not part of the crew.")
+            deps.add(position[id(context_task)])
+        dependencies.append(sorted(deps))
+
+    # Kahn's algorithm: every task must be reachable in topological order.
+    remaining = [len(deps) for deps in dependencies]
+    dependents: List[List[int]] = [[] for _ in tasks]
+    for index, deps in enumerate(dependencies):
+        for dep in deps:
+            dependents[dep].append(index)
+    queue = [index for index, count in enumerate(remaining) if count == 0]
+    visited = 0
+    while queue:
+        index = queue.pop()
+        visited += 1
+        for dependent in dependents[index]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                queue.append(dependent)
+    if visited != len(tasks):
+        raise ValueError("Task context declarations form a cycle.")
+    return dependencies
+
+class DagExecutor:
+    """
+    Runs a crew's tasks as a dependency graph.
+
+    Args:
+        crew: A sequential crew; its agents, tasks, planning and inputs are used as is.
+        max_workers: Maximum number of tasks running at the same time.
+
+    Tasks assigned to the same agent never run at the same time, because an
+    agent's executor is not safe to share between threads; that time is
+    reported as wait time.
+    """
+
+    def __init__(self, crew: Any, max_workers: int = 4):
+        check_crewai_version()
+        self.crew = crew
+        self.max_workers = max_workers
+        self.dependencies = build_dependencies(crew.tasks)
+
+    def _prepare(self, inputs: Optional[Dict[str, Any]]) -> None:
+        # The same preparation Crew.kickoff does before running the tasks.
+        if inputs is not None:
+            for task in self.crew.tasks:
+                task.interpolate_inputs(inputs)
+            for agent in self.crew.agents:
+                agent.interpolate_inputs(inputs)
+        for agent in self.crew.agents:
+            agent.crew = self.crew
+            agent.create_agent_executor()
+        if getattr(self.crew, "planning", False):
+            # Planning has no public entry point (PlanCache.apply turns it off beforehand).
+            handle_planning = getattr(self.crew, "_handle_crew_planning", None)
+            if handle_planning is None:
+                raise RuntimeError(
+                    f"crewai {'.'.join(map(str, crewai_version())) or '(unknown version)'} has no planning step "
+                    "DagExecutor can call; apply a PlanCache or set planning=False to use --dag."
+                )
+            handle_planning()
+
+    def _task_tools(self, task: Any) -> List[Any]:
+        """The tools kickoff gives a task: its own (or its agent's), plus delegation and code execution tools."""
+        agent = task.agent
+        tools = list(task.tools or agent.tools or [])
+        if getattr(agent, "allow_delegation", False):
+            tools += agent.get_delegation_tools([other for other in self.crew.agents if other is not agent])
+        if getattr(agent, "allow_code_execution", False):
+            tools += agent.get_code_execution_tools()
+        return tools
+
+    def _run_task(self, index: int, outputs: List[Any], timing: TaskTiming, agent_lock: threading.Lock,
+                  started: float) -> Any:
+        task = self.crew.tasks[index]
+        with agent_lock:
+            timing.started_at = time.perf_counter() - started
+            if isinstance(task, ConditionalTask) and index > 0 and not task.should_execute(outputs[index - 1]):
+                logger.info(f"Skipping conditional task {index}.")
+                timing.skipped = True
+                output = task.get_skipped_task_output()
+            else:
+                context = aggregate_raw_outputs_from_task_outputs(
+                    [outputs[dep] for dep in self.dependencies[index]]
+                )
+                output = task.execute_sync(agent=task.agent, context=context, tools=self._task_tools(task))
+            timing.finished_at = time.perf_counter() - started
+        return output
+
+    def run(self, inputs: Optional[Dict[str, Any]] = None) -> DagReport:
+        """Runs all tasks and returns their outputs in task order together with the timings."""
+        self._prepare(inputs)
+        tasks = self.crew.tasks
+        report = DagReport(max_workers=self.max_workers)
+        report.timings = [
+            TaskTiming(index, task.description.splitlines()[0] if task.description else f"task-{index}", deps)
+            for index, (task, deps) in enumerate(zip(tasks, self.dependencies))
+        ]
+        outputs: List[Any] = [None] * len(tasks)
+        agent_locks: Dict[int, threading.Lock] = {id(task.agent): threading.Lock() for task in tasks}
+        remaining = [len(deps) for deps in self.dependencies]
+        ready = [index for index, count in enumerate(remaining) if count == 0]
+        in_flight = {}
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dag-task") as pool:
+            while ready or in_flight:
+                # Submit in task order so runs with the same timings schedule identically.
+                for index in sorted(ready):
+                    logger.info(f"Starting task {index} (depends on {self.dependencies[index] or 'nothing'}).")
+                    future = pool.submit(self._run_task, index, outputs, report.timings[index],
+                                         agent_locks[id(tasks[index].agent)], started)
+                    in_flight[future] = index
+                ready = []
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=in_flight.get):
+                    index = in_flight.pop(future)
+                    try:
+                        outputs[index] = future.result()
+                    except Exception:
+                        for pending in in_flight:
+                            pending.cancel()
+                        raise
+                    now = time.perf_counter() - started
+                    for dependent, deps in enumerate(self.dependencies):
+                        if index in deps:
+                            remaining[dependent] -= 1
+                            if remaining[dependent] == 0:
+                                report.timings[dependent].ready_at = now
+                                ready.append(dependent)
+
+        report.outputs = outputs
+        report.wall_seconds = time.perf_counter() - started
+        logger.info(f"DAG execution finished in {report.wall_seconds:.1f}s.")
+        return report
@@ -0,0 +1,289 @@
+"""
+Event accumulation for the Conditional Tasks CrewAI Example.
+
+When the first fetch finds fewer than 8 events, the conditional task fetches
+again, and the second round tends to return the same events in a slightly
+different form. The `EventAccumulator` keeps the events of every round,
+deduplicates them with normalized title/date/venue keys plus a MinHash index
+over title shingles, and exposes what it already has through a tool so the
+collector only searches for the missing events. `RunMetrics` counts rounds and
+Serper calls so runs with and without the accumulator can be compared.
+"""
+
+import re
+import threading
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from crewai_tools import BaseTool, SerperDevTool
+
+from .structured_output import repair_json
+
+_MONTHS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+_DATE_PATTERN = re.compile(
+    r"\b(\d{4}-\d{1,2}-\d{1,2}|\d{1,2}/\d{1,2}(?:/\d{2,4})?|"
+    r"(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*\.?,?\s+)?"
+    r"((?:" + "|".join(_MONTHS) + r")[a-z]*\.?\s+\d{1,2}(?:st|nd|rd|th)?(?:,?\s+\d{4})?|"
+    r"\d{1,2}(?:st|nd|rd|th)?\s+(?:" + "|".join(_MONTHS) + r")[a-z]*\.?(?:,?\s+\d{4})?)?",
+    re.IGNORECASE,
+)
+_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%m/%d", "%b %d %Y", "%b %d", "%d %b %Y", "%d %b")
+_TITLE_STOPWORDS = {"the", "a", "an", "and", "of", "at", "in", "on", "nyc", "new", "york", "city", "event", "live"}
+_VENUE_STOPWORDS = {"the", "at", "nyc", "new", "york", "ny", "theatre", "theater", "hall", "center", "centre"}
+
+# A large Mersenne prime for the MinHash permutations.
+_PRIME = (1 << 61) - 1
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", text.lower().replace("'", "").replace("\u2019", ""))
+
+def normalize_title(title: str) -> str:
+    """Lowercased title words without stopwords, sorted so "Hamlet (Shakespeare in the Park)" matches its reordering."""
+    return " ".join(sorted(word for word in _words(title) if word not in _TITLE_STOPWORDS))
+
+def normalize_venue(venue: str) -> str:
+    return " ".join(word for word in _words(venue) if word not in _VENUE_STOPWORDS)
+
+def normalize_date(text: str) -> Optional[str]:
+    """Returns the first date found in `text` as `MM-DD` (year-less, since searches cover one week), or None."""
+    for match in _DATE_PATTERN.finditer(text):
+        candidate = match.group(1) if match.group(1) and match.group(1)[0].isdigit() else match.group(2)
+        if not candidate:
+            continue
+        cleaned = re.sub(r"(\d)(st|nd|rd|th)\b", r"\1", candidate.replace(",", " ").replace(".", " "))
+        cleaned = " ".join(part[:3] if part.isalpha() else part for part in cleaned.split())
+        for date_format in _DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(cleaned, date_format)
+            except ValueError:
+                continue
+            return f"{parsed.month:02d}-{parsed.day:02d}"
+    return None
+
+@dataclass
+class Event:
+    """One event with its normalized deduplication keys."""
+    text: str
+    title: str
+    date: Optional[str] = None
+    venue: str = ""
+
+    @property
+    def key(self) -> Tuple[str, Optional[str], str]:
+        return self.title, self.date, self.venue
+
+def parse_event(text: str) -> Event:
+    """
+    Splits a free-form event line such as "Jazz Night - Blue Note - June 14" into
+    title, date and venue. The title is the first segment; a segment introduced by
+    "at" or not containing the date is taken as the venue.
+    """
+    cleaned = re.sub(r"^\s*(?:[-*•]|\d+[.)])\s*", "", text).strip()
+    date = normalize_date(cleaned)
+    segments = [s.strip() for s in re.split(r"\s+[-–—|]\s+|;\s*", cleaned) if s.strip()]
+    title_part = segments[0] if segments else cleaned
+    venue = ""
+    at_match = re.search(r"\s+(?:at|@)\s+(.+)$", title_part, re.IGNORECASE)
+    if at_match:
+        venue, title_part = at_match.group(1), title_part[:at_match.start()]
+    for segment in segments[1:]:
+        if not venue and normalize_date(segment) is None:
+            venue = re.sub(r"^(?:at|@)\s+", "", segment, flags=re.IGNORECASE)
+    if date is not None:
+        title_part = _DATE_PATTERN.sub(lambda m: "" if m.group(0).strip() else m.group(0), title_part)
+    return Event(text=cleaned, title=normalize_title(title_part), date=date, venue=normalize_venue(venue))
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Character shingles of a normalized title; short titles yield the title itself."""
+    compact = text.replace(" ", "_")
+    if len(compact) <= size:
+        return {compact}
+    return {compact[i:i + size] for i in range(len(compact) - size + 1)}
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+def containment(a: Set[str], b: Set[str]) -> float:
+    """Share of the smaller set contained in the larger one, so "Flushing Meadows" matches "Flushing Meadows Park"."""
+    return len(a & b) / min(len(a), len(b)) if a and b else 1.0
+
+class MinHashIndex:
+    """
+    Locality-sensitive index over shingle sets.
+
+    Each set gets a MinHash signature of `num_perm` values, split into `bands`
+    bands; two sets become candidates when any band matches exactly, which
+    happens with high probability once their Jaccard similarity is high.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 7):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands.")
+        state = seed
+        self._coefficients = []
+        for _ in range(num_perm):
+            # Small deterministic LCG, so signatures are stable across processes.
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            a = state % (_PRIME - 1) + 1
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            self._coefficients.append((a, state % _PRIME))
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+
+    def signature(self, items: Set[str]) -> List[int]:
+        hashes = [zlib.crc32(item.encode("utf-8")) for item in items]
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in self._coefficients]
+
+    def _bands(self, signature: List[int]):
+        for band in range(self.bands):
+            yield band, tuple(signature[band * self.rows:(band + 1) * self.rows])
+
+    def add(self, item_id: int, items: Set[str]) -> None:
+        for bucket in self._bands(self.signature(items)):
+            self._buckets.setdefault(bucket, []).append(item_id)
+
+    def candidates(self, items: Set[str]) -> Set[int]:
+        found: Set[int] = set()
+        for bucket in self._bands(self.signature(items)):
+            found.update(self._buckets.get(bucket, ()))
+        return found
+
+@dataclass
+class RunMetrics:
+    """Counters of one crew run, used to compare runs with and without the accumulator or plan cache."""
+    rounds: int = 0
+    serper_calls: int = 0
+    events_returned: int = 0
+    duplicates_dropped: int = 0
+    unique_events: int = 0
+    plan_cache_hits: int = 0
+    plan_cache_misses: int = 0
+    planning_seconds_saved: float = 0.0
+    structured_outputs: int = 0
+    parse_failures: int = 0
+    local_repairs: int = 0
+    llm_conversions: int = 0
+    llm_calls_avoided: int = 0
+
+    @property
+    def parse_failure_rate(self) -> float:
+        return self.parse_failures / self.structured_outputs if self.structured_outputs else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(asdict(self), parse_failure_rate=self.parse_failure_rate)
+
+    def format(self) -> str:
+        return (
+            f"rounds={self.rounds} serper_calls={self.serper_calls} events_returned={self.events_returned} "
+            f"duplicates_dropped={self.duplicates_dropped} unique_events={self.unique_events} "
+            f"plan_cache_hits={self.plan_cache_hits} plan_cache_misses={self.plan_cache_misses} "
+            f"planning_seconds_saved={self.planning_seconds_saved:.1f} "
+            f"parse_failures={self.parse_failures}/{self.structured_outputs} local_repairs={self.local_repairs} "
+            f"llm_conversions={self.llm_conversions} llm_calls_avoided={self.llm_calls_avoided}"
+        )
+
+class EventAccumulator:
+    """
+    Keeps the unique events of every fetch round.
+
+    Args:
+        similarity_threshold: Minimum Jaccard similarity of title shingles for two
+            events on compatible dates and venues to count as the same event.
+        metrics: RunMetrics updated as rounds are added.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.6, metrics: Optional[RunMetrics] = None):
+        self.similarity_threshold = similarity_threshold
+        self.metrics = metrics or RunMetrics()
+        self.events: List[Event] = []
+        self._keys: Set[Tuple[str, Optional[str], str]] = set()
+        self._shingles: List[Set[str]] = []
+        self._index = MinHashIndex()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def _is_duplicate(self, event: Event, event_shingles: Set[str]) -> bool:
+        if event.key in self._keys:
+            return True
+        for candidate_id in self._index.candidates(event_shingles):
+            other = self.events[candidate_id]
+            if event.date and other.date and event.date != other.date:
+                continue
+            if event.venue and other.venue and containment(shingles(event.venue), shingles(other.venue)) < 0.6:
+                continue
+            if jaccard(event_shingles, self._shingles[candidate_id]) >= self.similarity_threshold:
+                return True
+        return False
+
+    def add(self, texts: Iterable[str]) -> List[Event]:
+        """Adds one round of fetched events and returns only the ones that are new."""
+        added = []
+        with self._lock:
+            self.metrics.rounds += 1
+            for text in texts:
+                self.metrics.events_returned += 1
+                event = parse_event(text)
+                if not event.title:
+                    continue
+                event_shingles = shingles(event.title)
+                if self._is_duplicate(event, event_shingles):
+                    self.metrics.duplicates_dropped += 1
+                    continue
+                self._index.add(len(self.events), event_shingles)
+                self.events.append(event)
+                self._shingles.append(event_shingles)
+                self._keys.add(event.key)
+                added.append(event)
+            self.metrics.unique_events = len(self.events)
+        return added
+
+    def on_task_output(self, output: Any) -> None:
+        """Task callback that records the events of a fetch round."""
+        if getattr(getattr(output, "output_format", None), "value", None) == "pydantic":
+            self.metrics.structured_outputs += 1
+        self.add(events_from_output(output))
+
+    def known_events(self) -> List[str]:
+        with self._lock:
+            return [event.text for event in self.events]
+
+def events_from_output(output: Any) -> List[str]:
+    """Extracts the event lines of a task output: its pydantic model, JSON, or a bulleted list."""
+    model = getattr(output, "pydantic", None)
+    if model is not None and hasattr(model, "events"):
+        return list(model.events)
+    raw = str(getattr(output, "raw", None) or getattr(output, "raw_output", None) or output)
+    data = repair_json(raw)
+    if isinstance(data, dict) and isinstance(data.get("events"), list):
+        data = data["events"]
+    if isinstance(data, list):
+        return [str(event) for event in data if event is not None]
+    return [line for line in raw.splitlines() if re.match(r"^\s*(?:[-*•]|\d+[.)])\s+\S", line)]
+
+class KnownEventsTool(BaseTool):
+    name: str = "Known Events"
+    description: str = (
+        "Lists the events that have already been collected in earlier rounds. Call it before searching "
+        "and only look for events that are not on this list."
+    )
+    accumulator: Any
+
+    def _run(self, *args, **kwargs) -> str:
+        known = self.accumulator.known_events()
+        if not known:
+            return "No events collected yet."
+        return f"{len(known)} events already collected:\n" + "\n".join(f"- {event}" for event in known)
+
+class CountingSerperTool(SerperDevTool):
+    """SerperDevTool that counts its searches in RunMetrics."""
+    metrics: Any = None
+
+    def _run(self, *args, **kwargs):
+        if self.metrics is not None:
+            self.metrics.serper_calls += 1
+        return super()._run(*args, **kwargs)
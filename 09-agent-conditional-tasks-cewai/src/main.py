@@ -4,27 +4,95 @@ Main execution script for the Conditional Tasks CrewAI Example.
 This script initializes and runs a crew that demonstrates conditional task execution.
 """
 
+import argparse
+import json
 import logging
 from .config import app_config
-from .crew import create_event_crew
+from .crew import MIN_EVENTS, create_event_crew
+from .dag import DagExecutor
+from .events import EventAccumulator
+from .plan_cache import PlanCache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+def save_metrics(path, metrics, incremental):
+    """Appends the run's metrics as one JSON line, so runs can be compared over time."""
+    record = dict(metrics.to_dict(), incremental=incremental, succeeded=metrics.unique_events >= MIN_EVENTS)
+    with open(path, "a") as file:
+        file.write(json.dumps(record) + "\n")
+
 def main():
     """Initializes and runs the event planning crew."""
+    parser = argparse.ArgumentParser(description="Run the conditional event planning crew.")
+    parser.add_argument(
+        "--no-accumulator",
+        action="store_true",
+        help="Do not share the events collected so far with the agents (baseline for comparison)."
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Append the run's rounds, Serper calls and event counts as JSON lines to this file."
+    )
+    parser.add_argument(
+        "--structured-output",
+        action="store_true",
+        help="Use the provider's JSON-schema structured output for outputs that cannot be repaired locally."
+    )
+    parser.add_argument(
+        "--no-plan-cache",
+        action="store_true",
+        help="Let the crew plan on every run instead of reusing a cached plan."
+    )
+    parser.add_argument(
+        "--plan-cache-dir",
+        default=".plan_cache",
+        help="Directory of the plan cache (default: .plan_cache)."
+    )
+    parser.add_argument(
+        "--dag",
+        action="store_true",
+        help="Run tasks as a dependency graph built from their context, with independent tasks in parallel."
+    )
+    parser.add_argument(
+        "--dag-workers",
+        type=int,
+        default=4,
+        help="Maximum number of tasks running at the same time with --dag (default: 4)."
+    )
+    parser.add_argument(
+        "--dag-report",
+        help="With --dag, export per-task wait times and the critical path as JSON to this file."
+    )
+    args = parser.parse_args()
+
     logger.info("Starting the conditional event planning crew...")
     
     # Access the configuration to ensure it's loaded
     _ = app_config
     
-    event_crew = create_event_crew()
-    result = event_crew.kickoff()
+    accumulator = EventAccumulator()
+    event_crew = create_event_crew(accumulator, incremental=not args.no_accumulator,
+                                   structured_output=args.structured_output)
+    if not args.no_plan_cache:
+        PlanCache(args.plan_cache_dir, metrics=accumulator.metrics).apply(event_crew)
+    if args.dag:
+        report = DagExecutor(event_crew, max_workers=args.dag_workers).run()
+        result = report.final_output
+        print("\n--- Task Graph Timings ---")
+        print(report.format())
+        if args.dag_report:
+            report.export(args.dag_report)
+    else:
+        result = event_crew.kickoff()
     
     logger.info("Crew execution finished.")
     print("\n--- Final Result ---")
     print(result)
     print("--------------------\n")
+    print(f"Run metrics: {accumulator.metrics.format()}")
+    if args.metrics_file:
+        save_metrics(args.metrics_file, accumulator.metrics, incremental=not args.no_accumulator)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,169 @@
+"""
+Plan cache for the Conditional Tasks CrewAI Example.
+
+With `planning=True` every kickoff makes an extra planner LLM call before the
+first task starts, although the agents and tasks never change between runs.
+`PlanCache` stores the generated step-by-step plans on disk, keyed by a hash of
+the agents, the tasks and the planner model (and optionally the inputs), and
+applies a cached plan to the crew so repeat runs skip the planning call.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from crewai.utilities.planning_handler import CrewPlanner
+
+logger = logging.getLogger(__name__)
+
+# Model CrewPlanner falls back to when the crew has no planning_llm.
+DEFAULT_PLANNER_MODEL = "gpt-4o-mini"
+
+def _tool_names(tools) -> List[str]:
+    return sorted(getattr(tool, "name", type(tool).__name__) for tool in tools or [])
+
+def _model_name(llm: Any) -> str:
+    if llm is None:
+        return DEFAULT_PLANNER_MODEL
+    if isinstance(llm, str):
+        return llm
+    return str(getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__)
+
+def plan_key(crew: Any, inputs: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Hashes everything the planner sees: agents, tasks (with their templates, before
+    input interpolation) and the planner model. Passing `inputs` makes the key
+    specific to them, for crews whose plans depend on the interpolated values.
+    """
+    fingerprint = {
+        "agents": [
+            {"role": agent.role, "goal": agent.goal, "backstory": agent.backstory, "tools": _tool_names(agent.tools)}
+            for agent in crew.agents
+        ],
+        "tasks": [
+            {
+                "type": type(task).__name__,
+                "description": task.description,
+                "expected_output": task.expected_output,
+                "agent": task.agent.role if task.agent else None,
+                "tools": _tool_names(task.tools),
+            }
+            for task in crew.tasks
+        ],
+        "planner_model": _model_name(getattr(crew, "planning_llm", None)),
+        "inputs": inputs,
+    }
+    encoded = json.dumps(fingerprint, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+@contextmanager
+def _interpolated(tasks: List[Any], inputs: Optional[Dict[str, Any]]):
+    """Formats the task templates with the inputs, as kickoff does, until the block exits."""
+    originals = [(task.description, task.expected_output) for task in tasks]
+    try:
+        if inputs:
+            for task in tasks:
+                task.description = task.description.format(**inputs)
+                task.expected_output = task.expected_output.format(**inputs)
+        yield
+    finally:
+        for task, (description, expected_output) in zip(tasks, originals):
+            task.description, task.expected_output = description, expected_output
+
+def _escape_plan(plan: str, inputs: Dict[str, Any]) -> str:
+    """Escapes the braces of a plan for kickoff's formatting, except the placeholders of `inputs`."""
+    def escape(match):
+        if match.group(1) in inputs:
+            return match.group(0)
+        return match.group(0).replace("{", "{{").replace("}", "}}")
+    return re.sub(r"\{(\w+)\}|[{}]", escape, plan)
+
+class PlanCache:
+    """
+    Stores crew plans as JSON files under `directory`.
+
+    Args:
+        directory: Where plans are kept; created on first write.
+        metrics: Optional RunMetrics whose `plan_cache_hits` and
+            `planning_seconds_saved` are updated on every lookup.
+    """
+
+    def __init__(self, directory: str = ".plan_cache", metrics: Optional[Any] = None):
+        self.directory = Path(directory)
+        self.metrics = metrics
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._path(key).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, plans: List[str], seconds: float) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"plans": plans, "planning_seconds": seconds, "created": time.time()})
+        # Write to a temporary file first so a concurrent reader never sees half a plan.
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as file:
+            file.write(payload)
+        os.replace(temp_path, self._path(key))
+
+    def plans_for(self, crew: Any, inputs: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Returns the plan per task, from the cache or from a timed CrewPlanner call.
+        With `inputs`, the planner sees the interpolated tasks, as it does in kickoff.
+        """
+        key = plan_key(crew, inputs)
+        cached = self.get(key)
+        if cached is not None:
+            logger.info(f"Plan cache hit ({key[:12]}), skipping {cached['planning_seconds']:.1f}s of planning.")
+            if self.metrics is not None:
+                self.metrics.plan_cache_hits += 1
+                self.metrics.planning_seconds_saved += cached["planning_seconds"]
+            return cached["plans"]
+
+        logger.info(f"Plan cache miss ({key[:12]}), planning the crew execution.")
+        started = time.perf_counter()
+        with _interpolated(crew.tasks, inputs):
+            planner = CrewPlanner(tasks=crew.tasks, planning_agent_llm=getattr(crew, "planning_llm", None))
+            result = planner._handle_crew_planning()
+        seconds = time.perf_counter() - started
+        # Newer CrewAI versions return PlanPerTask objects instead of plain strings.
+        plans = [str(getattr(plan, "plan", plan)) for plan in result.list_of_plans_per_task]
+        self.put(key, plans, seconds)
+        if self.metrics is not None:
+            self.metrics.plan_cache_misses += 1
+        return plans
+
+    def apply(self, crew: Any, inputs: Optional[Dict[str, Any]] = None, key_on_inputs: bool = False) -> None:
+        """
+        Appends the cached (or freshly generated) plans to the task descriptions and
+        turns the crew's own planning off, so kickoff makes no planner call.
+
+        With `key_on_inputs`, the plans are made for the interpolated tasks, exactly
+        as `planning=True` would. Otherwise one plan serves every input, so it is
+        made for the task templates: their {placeholders} are kept in the plan and
+        filled in by kickoff along with the descriptions, rather than baking the
+        values of the first run into the cached plan.
+
+        Args:
+            crew: A crew created with `planning=True`.
+            inputs: The inputs that will be passed to `kickoff`, if any.
+            key_on_inputs: Invalidate the plan whenever the inputs change.
+        """
+        plans = self.plans_for(crew, inputs if key_on_inputs else None)
+        for task, plan in zip(crew.tasks, plans):
+            if inputs:
+                # kickoff formats descriptions with the inputs; other braces of the plan stay literal.
+                plan = _escape_plan(plan, {} if key_on_inputs else inputs)
+            task.description += plan
+        crew.planning = False
@@ -0,0 +1,248 @@
+"""
+Structured output handling for the Conditional Tasks CrewAI Example.
+
+When an `output_pydantic` task returns slightly malformed JSON (a code fence,
+single quotes, a trailing comma, Python literals or a truncated list), CrewAI
+asks an LLM to convert it, and a failed conversion leaves `output.pydantic`
+empty, which triggers a whole extra fetch round. This module repairs and
+coerces such output locally and deterministically first. Only when that fails
+does it fall back to an LLM, using the provider's JSON-schema structured output
+when the model supports it. Every step is counted in the run metrics.
+"""
+
+import ast
+import json
+import logging
+import re
+import typing
+from typing import Any, Dict, List, Optional, Type
+
+from crewai.utilities.converter import Converter
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+# Model prefixes with OpenAI JSON-schema structured output (`response_format` of type json_schema).
+STRUCTURED_OUTPUT_MODELS = ("gpt-4o", "gpt-4.1", "gpt-5", "o1", "o3", "o4")
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+def _extract_span(text: str) -> str:
+    """Returns the JSON-looking part of a reply: the fenced block if any, from the first bracket on."""
+    fenced = re.search(r"```(?:json|JSON)?\s*\n?(.*?)(?:```|$)", text, re.DOTALL)
+    if fenced and fenced.group(1).strip():
+        text = fenced.group(1)
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    return text[min(starts):].strip() if starts else text.strip()
+
+def _cut_at_close(span: str) -> str:
+    """
+    Cuts a span after the bracket that closes its first one, dropping trailing
+    prose; a span that never closes (a truncated reply) is returned whole.
+    """
+    depth, quote, i = 0, None, 0
+    while i < len(span):
+        char = span[i]
+        if quote:
+            if char == "\\":
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return span[:i + 1]
+        i += 1
+    return span
+
+def _rewrite(text: str) -> str:
+    """
+    Rewrites JSON-like text into JSON in one pass: single-quoted strings become
+    double-quoted, Python literals become JSON literals, bare keys are quoted,
+    comments and trailing commas are dropped, and unclosed strings and brackets
+    are closed.
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    i, length = 0, len(text)
+    while i < length:
+        char = text[i]
+        if char in "\"'":
+            # Copy a string literal, re-quoting it with double quotes.
+            quote, i = char, i + 1
+            buffer = []
+            while i < length and text[i] != quote:
+                if text[i] == "\\" and i + 1 < length:
+                    escaped = text[i + 1]
+                    buffer.append("'" if escaped == "'" else "\\" + escaped)
+                    i += 2
+                    continue
+                buffer.append('\\"' if text[i] == '"' else ("\\n" if text[i] == "\n" else text[i]))
+                i += 1
+            out.append('"' + "".join(buffer) + '"')
+            i += 1
+            continue
+        if char == "/" and text.startswith("//", i):
+            newline = text.find("\n", i)
+            i = length if newline < 0 else newline
+            continue
+        if char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            while out and out[-1].strip() in (",", ""):
+                out.pop()
+            if stack:
+                stack.pop()
+        elif char.isalpha() or char == "_":
+            match = re.match(r"[A-Za-z_][A-Za-z0-9_]*", text[i:])
+            word = match.group(0)
+            if re.match(r"\s*:", text[i + len(word):]):
+                out.append(f'"{word}"')
+            else:
+                out.append(_PYTHON_LITERALS.get(word, word))
+            i += len(word)
+            continue
+        out.append(char)
+        i += 1
+    # A truncated reply: drop a dangling separator and close what is still open.
+    while out and out[-1].strip() in (",", ":", ""):
+        out.pop()
+    out.extend(reversed(stack))
+    return "".join(out)
+
+def repair_json(text: str) -> Optional[Any]:
+    """Parses JSON-like model output, repairing common defects; returns None if it cannot."""
+    span = _extract_span(text.translate(_SMART_QUOTES))
+    if not span:
+        return None
+    try:
+        # Valid JSON followed by prose ("Here you go: {...} Hope this helps!").
+        return json.JSONDecoder(strict=False).raw_decode(span)[0]
+    except ValueError:
+        pass
+    span = _cut_at_close(span)
+    try:
+        return json.loads(_rewrite(span), strict=False)
+    except ValueError:
+        pass
+    try:
+        # Python reprs such as {'events': ['a', 'b']} that the rewrite could not fix.
+        return ast.literal_eval(span)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+
+def _is_list_of_str(annotation: Any) -> bool:
+    return typing.get_origin(annotation) in (list, List) and typing.get_args(annotation) == (str,)
+
+def _as_text(item: Any) -> str:
+    if isinstance(item, dict):
+        return " - ".join(str(value) for value in item.values() if value not in (None, ""))
+    return str(item)
+
+def coerce(data: Any, model: Type[BaseModel]) -> BaseModel:
+    """
+    Validates parsed data against `model`, first adapting common shape mismatches:
+    a bare list for a single-field model, a single list under a different key, and
+    objects where a list of strings is expected.
+    """
+    fields = model.model_fields
+    if isinstance(data, list) and len(fields) == 1:
+        data = {next(iter(fields)): data}
+    if isinstance(data, dict):
+        if len(fields) == 1 and not fields.keys() & data.keys():
+            lists = [value for value in data.values() if isinstance(value, list)]
+            if len(lists) == 1:
+                data = {next(iter(fields)): lists[0]}
+        data = dict(data)
+        for name, field in fields.items():
+            if isinstance(data.get(name), list) and _is_list_of_str(field.annotation):
+                data[name] = [_as_text(item) for item in data[name] if item is not None]
+    return model.model_validate(data)
+
+def parse_model(text: str, model: Type[BaseModel]) -> Optional[BaseModel]:
+    """Repairs and coerces `text` into `model` without any LLM call; None when it is not possible."""
+    data = repair_json(text)
+    if data is None:
+        return None
+    try:
+        return coerce(data, model)
+    except (ValidationError, TypeError, ValueError):
+        return None
+
+def supports_json_schema(llm: Any) -> bool:
+    model_name = str(getattr(llm, "model_name", None) or getattr(llm, "model", None) or "")
+    return hasattr(llm, "bind") and model_name.startswith(STRUCTURED_OUTPUT_MODELS)
+
+def _strict_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Adds what strict JSON-schema mode requires: closed objects with every property required."""
+    if schema.get("type") == "object":
+        schema["additionalProperties"] = False
+        schema["required"] = list(schema.get("properties", {}))
+    for value in schema.values():
+        if isinstance(value, dict):
+            _strict_schema(value)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict):
+                    _strict_schema(item)
+    return schema
+
+def response_format(model: Type[BaseModel]) -> Dict[str, Any]:
+    """The OpenAI `response_format` asking for output that matches `model`'s JSON schema."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": model.__name__, "schema": _strict_schema(model.model_json_schema()), "strict": True},
+    }
+
+def repairing_converter(metrics: Optional[Any] = None, use_provider_schema: bool = False) -> Type[Converter]:
+    """
+    Builds a converter class for a task's `converter_cls`.
+
+    CrewAI only calls the converter after its own strict JSON parse failed. The
+    converter then tries the local repair first, then (optionally) the provider's
+    JSON-schema structured output, and only then CrewAI's regular LLM conversion.
+
+    Args:
+        metrics: RunMetrics with `parse_failures`, `local_repairs`, `llm_conversions`
+            and `llm_calls_avoided` counters.
+        use_provider_schema: Use `response_format` with a JSON schema when the model supports it.
+    """
+
+    def count(name: str) -> None:
+        if metrics is not None:
+            setattr(metrics, name, getattr(metrics, name) + 1)
+
+    class RepairingConverter(Converter):
+        def _convert(self) -> Optional[BaseModel]:
+            count("parse_failures")
+            repaired = parse_model(self.text, self.model)
+            if repaired is not None:
+                logger.info(f"Repaired malformed {self.model.__name__} output locally.")
+                count("local_repairs")
+                count("llm_calls_avoided")
+                return repaired
+
+            count("llm_conversions")
+            if use_provider_schema and supports_json_schema(self.llm):
+                try:
+                    message = self.llm.bind(response_format=response_format(self.model)).invoke(
+                        [("system", self.instructions), ("human", self.text)]
+                    )
+                    return self.model.model_validate_json(message.content)
+                except Exception as e:
+                    logger.warning(f"Structured output request failed, using the default conversion: {e}")
+            return None
+
+        def to_pydantic(self, current_attempt=1):
+            result = self._convert() if current_attempt == 1 else None
+            return result if result is not None else super().to_pydantic(current_attempt)
+
+        def to_json(self, current_attempt=1):
+            result = self._convert() if current_attempt == 1 else None
+            return json.dumps(result.model_dump()) if result is not None else super().to_json(current_attempt)
+
+    return RepairingConverter
@@ -0,0 +1 @@
+"""Test package for the Conditional Tasks CrewAI Example."""
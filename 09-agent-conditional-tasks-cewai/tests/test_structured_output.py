@@ -0,0 +1,50 @@
+"""Tests for the local repair of malformed structured output."""
+
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+pytest.importorskip("crewai")
+
+from src.structured_output import coerce, parse_model, repair_json
+
+class Events(BaseModel):
+    events: List[str]
+
+# --- repair_json ---
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"events": ["a", "b"]}', {"events": ["a", "b"]}),
+    ('```json\n{"events": ["a"]}\n```', {"events": ["a"]}),
+    ("{'events': ['a', 'b',],}", {"events": ["a", "b"]}),
+    ('{events: ["a"], done: True}', {"events": ["a"], "done": True}),
+    ('{"events": ["a", "b"', {"events": ["a", "b"]}),
+])
+def test_repair_json_fixes_common_defects(text, expected):
+    assert repair_json(text) == expected
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"events": ["a", "b"]} Let me know if you need more events.', {"events": ["a", "b"]}),
+    ('Here: ["a","b"] done', ["a", "b"]),
+    ("Here you go: {'events': ['a', 'b',]} I hope it's useful!", {"events": ["a", "b"]}),
+    ('```json\n{"events": ["a"]}\n```\nThese are the events [1] found.', {"events": ["a"]}),
+])
+def test_repair_json_ignores_trailing_prose(text, expected):
+    assert repair_json(text) == expected
+
+def test_repair_json_gives_up_on_prose():
+    assert repair_json("I could not find any events.") is None
+
+# --- coerce and parse_model ---
+
+def test_coerce_wraps_a_bare_list():
+    assert coerce(["a", "b"], Events).events == ["a", "b"]
+
+def test_coerce_renames_a_single_list_and_flattens_objects():
+    data = {"items": [{"name": "PyCon", "city": "Pittsburgh"}, "EuroPython"]}
+    assert coerce(data, Events).events == ["PyCon - Pittsburgh", "EuroPython"]
+
+def test_parse_model_returns_none_when_invalid():
+    assert parse_model('{"events": "not a list"}', Events) is None
+    assert parse_model('Events: {"events": ["a"]} (2 more to come)', Events).events == ["a"]
@@ -0,0 +1,240 @@
+# Plans many projects concurrently with the planning crew.
+#
+# Project specs are the crew inputs of one project each (project_type,
+# project_objectives, industry, team_members, project_requirements and an
+# optional id), read from YAML files (a list, or a mapping with a `projects`
+# list) or JSONL files (one project per line). All specs are validated before
+# the first LLM call. Projects run on a bounded thread pool, and each plan is
+# written to <output>/<id>.json as soon as it finishes, together with a line
+# in <output>/results.jsonl; projects with an existing plan are skipped, so an
+# interrupted batch can simply be started again. Concurrent crews make
+# crew.usage_metrics unreliable (CrewAI swaps the global LiteLLM callbacks on
+# every call), so the usage of a batch is collected with --metrics-dir instead.
+#
+# Usage:
+#     python batch_runner.py projects.example.yaml --output plans --concurrency 8
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import yaml
+
+from config_loader import ConfigError, CrewConfig, load_crew_config
+from parallel_estimation import plan_project_parallel
+from planning_crew import check_planning_inputs, plan_project
+from scheduler import schedule_plan
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProjectResult:
+    """Outcome of one project of a batch."""
+    project_id: str
+    inputs: Dict[str, Any]
+    plan: Optional[Any] = None
+    schedule: Optional[Any] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchSummary:
+    succeeded: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:60] or "project"
+
+
+def load_specs(paths: Iterable[Union[str, Path]]) -> List[Dict[str, Any]]:
+    """Reads project specs from YAML and JSONL files, giving each a unique `id`."""
+    specs: List[Dict[str, Any]] = []
+    for path in map(Path, paths):
+        if path.suffix == ".jsonl":
+            with open(path, "r") as file:
+                specs += [json.loads(line) for line in file if line.strip()]
+            continue
+        with open(path, "r") as file:
+            data = yaml.safe_load(file)
+        if isinstance(data, dict):
+            data = data.get("projects", [data])
+        if not isinstance(data, list) or not all(isinstance(spec, dict) for spec in data):
+            raise ConfigError(f"{path}: expected a list of projects")
+        specs += data
+
+    seen = set()
+    for index, spec in enumerate(specs):
+        project_id = str(spec.get("id") or f"{index:04d}-{_slug(str(spec.get('project_type', '')))}")
+        if project_id in seen:
+            raise ConfigError(f"Duplicate project id '{project_id}'")
+        seen.add(project_id)
+        spec["id"] = project_id
+    return specs
+
+
+def _write_json(path: Path, data: Any) -> None:
+    # Written to a temporary file first, so a plan file is either complete or absent.
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w") as file:
+        json.dump(data, file, indent=2, default=str)
+    os.replace(temp_path, path)
+
+
+def _run_project(spec: Dict[str, Any], crew_config: CrewConfig, metrics: Optional[Any],
+                 schedule: bool, parallel_estimation: bool) -> ProjectResult:
+    inputs = {key: value for key, value in spec.items() if key != "id"}
+    result = ProjectResult(spec["id"], inputs)
+    started = time.perf_counter()
+    try:
+        if parallel_estimation:
+            result.plan = plan_project_parallel(inputs, crew_config, metrics)
+        else:
+            result.plan = plan_project(inputs, crew_config, metrics)
+        if schedule:
+            result.schedule = schedule_plan(result.plan, inputs.get("team_members", ""))
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def run_batch(specs: List[Dict[str, Any]], output_dir: Union[str, Path], max_concurrency: int = 8,
+              schedule: bool = True, rerun: bool = False, metrics: Optional[Any] = None,
+              store: Optional[Any] = None, crew_config: Optional[CrewConfig] = None,
+              on_result: Optional[Callable[[ProjectResult], None]] = None,
+              parallel_estimation: bool = False) -> BatchSummary:
+    """
+    Plans every project with at most `max_concurrency` crews running at once.
+
+    Args:
+        specs: Project specs as returned by load_specs.
+        output_dir: Receives <id>.json per project and results.jsonl.
+        schedule: Also compute the local critical-path schedule of every plan.
+        rerun: Plan projects again even when their plan file exists.
+        metrics: An installed CrewMetrics collecting usage over the whole batch.
+        store: A RunStore to record every plan in the run history.
+        on_result: Called in the calling thread with every ProjectResult.
+        parallel_estimation: Estimate the areas of every breakdown concurrently
+            (see parallel_estimation.py).
+    """
+    crew_config = crew_config or load_crew_config('config')
+    for spec in specs:
+        try:
+            check_planning_inputs(spec, crew_config)
+        except ConfigError as e:
+            raise ConfigError(f"Project '{spec['id']}': {e}") from None
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summary = BatchSummary()
+    pending = []
+    for spec in specs:
+        if not rerun and (output_dir / f"{spec['id']}.json").exists():
+            summary.skipped.append(spec["id"])
+        else:
+            pending.append(spec)
+    logger.info(f"Planning {len(pending)} projects ({len(summary.skipped)} already planned), "
+                f"{max_concurrency} at a time.")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="planning-crew") as pool, \
+            open(output_dir / "results.jsonl", "a") as results_file:
+        futures = [pool.submit(_run_project, spec, crew_config, metrics, schedule, parallel_estimation)
+                   for spec in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            if result.ok:
+                document = {"id": result.project_id, "plan": result.plan.model_dump()}
+                if result.schedule is not None:
+                    document["schedule"] = {
+                        "duration_hours": result.schedule.duration_hours,
+                        "leveled_duration_hours": result.schedule.leveled_duration_hours,
+                        "critical_path": result.schedule.critical_path,
+                        "milestones": result.schedule.milestones,
+                        "warnings": result.schedule.warnings,
+                        "tasks": result.schedule.rows(),
+                    }
+                _write_json(output_dir / f"{result.project_id}.json", document)
+                if store is not None:
+                    store.record_run(result.inputs, plan=result.plan, schedule=result.schedule)
+                summary.succeeded.append(result.project_id)
+                logger.info(f"Planned {result.project_id} in {result.seconds:.1f}s.")
+            else:
+                summary.failed[result.project_id] = result.error
+                logger.error(f"Planning {result.project_id} failed: {result.error}")
+            results_file.write(json.dumps({
+                "id": result.project_id, "ok": result.ok, "error": result.error,
+                "seconds": round(result.seconds, 3), "finished_at": time.time(),
+            }) + "\n")
+            results_file.flush()
+            if on_result is not None:
+                on_result(result)
+    summary.seconds = time.perf_counter() - started
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Plan many projects concurrently with the planning crew.")
+    parser.add_argument("specs", nargs="+", help="YAML or JSONL files with one crew input set per project.")
+    parser.add_argument("--output", default="plans", help="Directory for the plans and results.jsonl.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum number of crews running at once.")
+    parser.add_argument("--model", default="gpt-4o-mini", help="OpenAI model of the agents.")
+    parser.add_argument("--no-schedule", action="store_true", help="Do not compute the local schedules.")
+    parser.add_argument("--parallel-estimation", action="store_true",
+                        help="Estimate the areas of every task breakdown concurrently.")
+    parser.add_argument("--rerun", action="store_true", help="Plan projects again even if a plan exists.")
+    parser.add_argument("--history", help="Record the plans in this run history directory (Parquet).")
+    parser.add_argument("--metrics-dir", help="Write Prometheus and JSONL usage metrics of the batch here.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    from helper import load_env
+    load_env()
+    os.environ['OPENAI_MODEL_NAME'] = args.model
+
+    specs = load_specs(args.specs)
+    metrics = store = None
+    if args.metrics_dir:
+        from metrics import CrewMetrics
+        metrics = CrewMetrics(crew_name='planning_batch')
+        metrics.install()
+    if args.history:
+        from run_store import RunStore
+        store = RunStore(args.history)
+    try:
+        summary = run_batch(specs, args.output, args.concurrency, schedule=not args.no_schedule,
+                            rerun=args.rerun, metrics=metrics, store=store,
+                            parallel_estimation=args.parallel_estimation)
+    finally:
+        if store is not None:
+            store.close()
+        if metrics is not None:
+            metrics.uninstall()
+            metrics.write_prometheus(os.path.join(args.metrics_dir, 'planning_batch.prom'))
+            metrics.write_jsonl(os.path.join(args.metrics_dir, 'runs.jsonl'))
+
+    logger.info(f"Batch finished in {summary.seconds:.1f}s: {len(summary.succeeded)} planned, "
+                f"{len(summary.failed)} failed, {len(summary.skipped)} skipped.")
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
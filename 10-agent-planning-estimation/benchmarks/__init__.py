@@ -0,0 +1 @@
+"""Benchmarks for the planning and estimation crew."""
@@ -0,0 +1,76 @@
+# Benchmark of crew config loading at startup.
+#
+# Compares the original loading (yaml.safe_load of both files on every start)
+# with the config loader: a cold compile, a start from the binary cache (a new
+# process, empty memory cache) and a repeat load in a running service. Each
+# mode loads N copies of the config directory, as a service hosting N crew
+# definitions would.
+#
+# Usage (from the project directory):
+#     python -m benchmarks.config_loader --crews 200
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+import config_loader
+
+
+def load_with_safe_load(directory):
+    configs = {}
+    for config_type in ("agents", "tasks"):
+        with open(directory / f"{config_type}.yaml", "r") as file:
+            configs[config_type] = yaml.safe_load(file)
+    return configs
+
+
+def timed(function):
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark YAML config loading versus the compiled config cache.")
+    parser.add_argument("--crews", type=int, default=200, help="Number of crew definitions to load.")
+    parser.add_argument("--repeat", type=int, default=5, help="Best of this many runs per mode.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        root = Path(root)
+        directories = []
+        for i in range(args.crews):
+            directory = root / f"crew-{i}"
+            shutil.copytree(config_loader.PROJECT_DIR / "config", directory)
+            directories.append(directory)
+        config_loader.CACHE_DIR = root / ".config_cache"
+
+        def cold():
+            shutil.rmtree(config_loader.CACHE_DIR, ignore_errors=True)
+            config_loader.clear_memory_cache()
+            config_loader.load_many(directories)
+
+        def from_disk_cache():
+            config_loader.clear_memory_cache()
+            config_loader.load_many(directories)
+
+        modes = [
+            ("yaml.safe_load (original)", lambda: [load_with_safe_load(d) for d in directories]),
+            ("compile, no cache", cold),
+            ("binary cache (new process)", from_disk_cache),
+            ("memory cache (running service)", lambda: config_loader.load_many(directories)),
+        ]
+        baseline = None
+        print(f"Loading {args.crews} crew definitions (best of {args.repeat}):")
+        for name, function in modes:
+            seconds = min(timed(function) for _ in range(args.repeat))
+            baseline = baseline or seconds
+            print(f"  {name:<32} {seconds * 1000:>9.1f} ms  {baseline / seconds:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# Benchmark of the historical estimate index.
+#
+# Builds an index of N past estimates with distinct task names (the worst case
+# for a lookup, since records of the same task are aggregated into one row),
+# then times single lookups and the batch lookup of a whole plan, and compares
+# the estimation agent's input with and without the index: the reused tasks are
+# removed from the breakdown it reads, while the history of the other tasks is
+# added. Prompt tokens are estimated at 4 characters per token. With --live
+# (needs crewai and OPENAI_API_KEY), the estimation task is run on both inputs
+# and its prompt and completion tokens are measured with CrewMetrics.
+#
+# Usage (from the project directory):
+#     python -m benchmarks.estimate_index --records 1000000
+#     python -m benchmarks.estimate_index --records 100000 --live
+
+import argparse
+import itertools
+import random
+import time
+import zlib
+
+from estimate_index import EstimateIndex, historical_context, remove_tasks
+
+VERBS = ["design", "implement", "test", "review", "deploy", "document", "refactor", "migrate", "integrate",
+         "configure", "monitor", "optimize", "secure", "prototype", "audit", "automate", "benchmark", "plan",
+         "validate", "build", "set up", "scale", "analyze", "specify", "train", "package", "release", "support",
+         "harden", "instrument", "containerize", "localize", "archive", "estimate", "model", "debug", "profile",
+         "simulate", "approve", "onboard"]
+OBJECTS = [f"{a} {b}" for a, b in itertools.product(
+    ["user", "order", "payment", "market data", "portfolio", "account", "report", "search", "notification", "admin",
+     "billing", "inventory", "audit log", "session", "identity", "pricing", "risk", "compliance", "analytics",
+     "content"],
+    ["service", "database schema", "api", "dashboard", "pipeline", "ui", "cache", "queue", "tests", "module"])]
+QUALIFIERS = [f"{a} {b}" for a, b in itertools.product(
+    ["for mobile", "for web", "for partners", "in staging", "in production"],
+    ["v1", "v2", "phase 1", "phase 2", "with mfa", "with sso", "with caching", "with retries", "at scale",
+     "for eu", "for us", "for apac", "with audit", "with encryption", "with metrics", "with alerts", "on kubernetes",
+     "on aws", "on gcp", "offline", "realtime", "batch", "multi tenant", "single tenant", "beta"])]
+
+
+def task_names(count):
+    names = (f"{verb} {obj} {qualifier}" for verb, obj, qualifier in itertools.product(VERBS, OBJECTS, QUALIFIERS))
+    return list(itertools.islice(names, count))
+
+
+def breakdown_of(plan):
+    """A breakdown in the layout the planning agent writes, one numbered task with its fields each."""
+    return "\n".join(f"{number}. {name}\n   - Description: {name}, as specified in the requirements.\n"
+                     f"   - Dependencies: {plan[number - 2] if number > 1 else 'none'}\n"
+                     f"   - Deliverable: {name} done and reviewed."
+                     for number, name in enumerate(plan, 1))
+
+
+def measure_live(breakdown, history):
+    """Runs the estimation task on a breakdown; returns its prompt and completion tokens from CrewMetrics."""
+    from crewai import Agent, Crew, Task
+
+    from config_loader import load_crew_config
+    from metrics import CrewMetrics
+
+    crew_config = load_crew_config()
+    agent = Agent(config=crew_config.agents["estimation_agent"])
+    config = crew_config.tasks["time_resource_estimation"]
+    # The breakdown is given in the description, as the crew gives it in the task context.
+    escaped = breakdown.replace("{", "{{").replace("}", "}}")
+    config["description"] += history + "\n\nThe task breakdown:\n" + escaped
+    crew = Crew(agents=[agent], tasks=[Task(config=config, agent=agent)])
+    metrics = CrewMetrics(crew_name="estimate_index_benchmark")
+    metrics.watch(crew, crew_config)
+    with metrics:
+        crew.kickoff(inputs={"project_type": "Online Stock Trading Platform"})
+    records = [record for record in metrics.records() if record["kind"] == "llm"]
+    return sum(r["prompt_tokens"] for r in records), sum(r["completion_tokens"] for r in records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the historical estimate index.")
+    parser.add_argument("--records", type=int, default=1_000_000, help="Distinct past tasks in the index.")
+    parser.add_argument("--plan-tasks", type=int, default=40, help="Tasks in the plan looked up at once.")
+    parser.add_argument("--repeat", type=int, default=20, help="Lookups timed per mode.")
+    parser.add_argument("--live", action="store_true", help="Measure the estimation task's tokens with the LLM.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    names = task_names(args.records)
+    index = EstimateIndex()
+    started = time.perf_counter()
+    # Three samples per task, so the close matches are reusable.
+    for _ in range(3):
+        index.add(names, (8 * (1 + zlib.crc32(name.encode()) % 5) * rng.uniform(0.95, 1.05) for name in names))
+    index.search(["warm up"], 1)
+    print(f"Indexed {len(index):,} tasks ({3 * len(names):,} records) in {time.perf_counter() - started:.1f}s, "
+          f"matrix {index._matrix.nbytes / 2**20:.0f} MiB.")
+
+    # A plan whose tasks are half known (worded differently) and half new.
+    known = [rng.choice(names).replace(" for ", " for the ") for _ in range(args.plan_tasks // 2)]
+    new = [f"write {rng.choice(['onboarding guide', 'press release', 'legal review', 'training plan'])} {i}"
+           for i in range(args.plan_tasks - len(known))]
+    plan = known + new
+
+    for label, queries in (("single task", plan[:1]), (f"whole plan ({len(plan)} tasks)", plan)):
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            index.search(queries, k=3)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        print(f"  lookup {label:<24} median {timings[len(timings) // 2] * 1000:7.1f} ms, "
+              f"p95 {timings[int(len(timings) * 0.95) - 1] * 1000:7.1f} ms")
+
+    text, reused = historical_context(index, plan)
+    breakdown = breakdown_of(plan)
+    seeded = remove_tasks(breakdown, reused)
+    print(f"Per plan: {len(reused)}/{len(plan)} estimates reused; estimation input ~{len(breakdown) // 4} "
+          f"prompt tokens without the index, ~{(len(seeded) + len(text)) // 4} with it "
+          f"(~{len(text) // 4} of history).")
+    if args.live:
+        for label, (task_breakdown, history) in (("without the index", (breakdown, "")),
+                                                 ("with the index", (seeded, text))):
+            prompt_tokens, completion_tokens = measure_live(task_breakdown, history)
+            print(f"  estimation task {label:<18} {prompt_tokens:>7,} prompt, {completion_tokens:>6,} completion "
+                  f"tokens (CrewMetrics)")
+
+if __name__ == "__main__":
+    main()
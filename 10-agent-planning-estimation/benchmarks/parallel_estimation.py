@@ -0,0 +1,90 @@
+# Benchmark of the map-reduce estimation over a large task breakdown.
+#
+# Generates a breakdown of many areas and tasks, and estimates it with a
+# simulated estimator whose latency is that of an LLM writing the report: a
+# time to first token plus the output tokens at a fixed generation rate
+# (TOKENS_PER_ESTIMATE per task). Compares one estimation of the whole
+# breakdown with the chunked, concurrent estimation, and reports whether the
+# single report would exceed the model's output token limit. Latencies are
+# scaled down by --time-scale so the benchmark runs in seconds.
+#
+# Usage (from the project directory):
+#     python -m benchmarks.parallel_estimation --areas 8 --tasks-per-area 25 --concurrency 4
+
+import argparse
+import time
+
+from estimate_index import extract_task_names
+from parallel_estimation import estimate_chunks, merge_estimates, split_breakdown
+
+AREAS = ["Architecture", "Backend Development", "Frontend Development", "Data", "Security",
+         "Testing", "CI/CD", "Documentation", "Compliance", "Operations"]
+TOKENS_PER_ESTIMATE = 150
+SUMMARY_TOKENS = 300
+FIRST_TOKEN_SECONDS = 0.8
+MAX_OUTPUT_TOKENS = 16_384
+
+
+def generate_breakdown(areas, tasks_per_area):
+    lines = ["Here is the breakdown of the project into tasks.", ""]
+    for a in range(areas):
+        area = AREAS[a % len(AREAS)] + (f" {a // len(AREAS) + 1}" if a >= len(AREAS) else "")
+        lines += [f"### {a + 1}. {area}", ""]
+        for t in range(tasks_per_area):
+            lines += [
+                f"{t + 1}. **Deliver {area} item {t + 1}** - build and review the {area.lower()} item {t + 1}",
+                f"   - Dependencies: Deliver {area} item {t}" if t else "   - Dependencies: none",
+                f"   - Deliverable: {area.lower()} artefact {t + 1}",
+            ]
+        lines.append("")
+    return "\n".join(lines)
+
+
+def simulated_estimator(tokens_per_second, time_scale):
+    def estimate(chunk):
+        tokens = chunk.tasks * TOKENS_PER_ESTIMATE + SUMMARY_TOKENS
+        time.sleep((FIRST_TOKEN_SECONDS + tokens / tokens_per_second) * time_scale)
+        return "\n".join(f"- {name}: 8 hours" for name in extract_task_names(chunk.text))
+    return estimate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the chunked, concurrent estimation.")
+    parser.add_argument("--areas", type=int, default=8, help="Number of areas of the breakdown.")
+    parser.add_argument("--tasks-per-area", type=int, default=25, help="Number of tasks of every area.")
+    parser.add_argument("--max-tasks", type=int, default=12, help="Maximum number of tasks of a chunk.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum number of chunks estimated at once.")
+    parser.add_argument("--tokens-per-second", type=float, default=80, help="Simulated generation rate.")
+    parser.add_argument("--time-scale", type=float, default=0.01, help="Factor applied to the simulated latency.")
+    args = parser.parse_args()
+
+    breakdown = generate_breakdown(args.areas, args.tasks_per_area)
+    estimate = simulated_estimator(args.tokens_per_second, args.time_scale)
+    whole = split_breakdown(breakdown, max_tasks=len(breakdown))
+
+    started = time.perf_counter()
+    estimate_chunks(whole, estimate, 1)
+    single_seconds = (time.perf_counter() - started) / args.time_scale
+
+    started = time.perf_counter()
+    chunks = split_breakdown(breakdown, args.max_tasks)
+    reports = estimate_chunks(chunks, estimate, args.concurrency)
+    merged = merge_estimates(chunks, reports)
+    parallel_seconds = (time.perf_counter() - started) / args.time_scale
+
+    tasks = sum(chunk.tasks for chunk in chunks)
+    single_tokens = tasks * TOKENS_PER_ESTIMATE + SUMMARY_TOKENS
+    largest_tokens = max(chunk.tasks for chunk in chunks) * TOKENS_PER_ESTIMATE + SUMMARY_TOKENS
+    assert all(f"- {name}: 8 hours" in merged for name in extract_task_names(breakdown))
+    print(f"{tasks} tasks in {args.areas} areas ({len(breakdown) / 1024:.0f} KiB breakdown), "
+          f"{len(chunks)} chunks of at most {args.max_tasks} tasks, {args.concurrency} at a time, "
+          f"{args.tokens_per_second:g} tokens/s:")
+    print(f"  single estimation              {single_seconds:>8.1f} s (simulated), {single_tokens} output tokens"
+          f"{' - over the output limit, would be cut off' if single_tokens > MAX_OUTPUT_TOKENS else ''}")
+    print(f"  chunked, concurrent            {parallel_seconds:>8.1f} s (simulated), at most "
+          f"{largest_tokens} output tokens per call")
+    print(f"  speed-up                       {single_seconds / parallel_seconds:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
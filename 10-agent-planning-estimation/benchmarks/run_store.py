@@ -0,0 +1,92 @@
+# Benchmark of the columnar run history.
+#
+# Appends N synthetic runs (each with usage rows and a few hundred estimated
+# tasks) in batches, then times the aggregate queries on the full history,
+# before and after compacting the partitions, and with partition pruning.
+#
+# Usage (from the project directory):
+#     python -m benchmarks.run_store --runs 2000 --tasks 500
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pyarrow.compute as pc
+
+from run_store import RunStore
+
+PROJECTS = ["Online Stock Trading Platform", "Website", "Mobile App", "Data Platform", "CRM Migration"]
+AGENTS = ["project_planning_agent", "estimation_agent", "resource_allocation_agent"]
+TASKS = ["task_breakdown", "time_resource_estimation", "resource_allocation"]
+
+
+def synthetic_run(store, rng, index, task_count, first_day):
+    run_id = f"run-{index}"
+    day = (first_day + timedelta(days=index % 180)).isoformat()
+    project = PROJECTS[index % len(PROJECTS)]
+    common = {"run_id": [run_id], "date": [day], "project": [project]}
+    store.append("runs", dict(common, llm_calls=[12], prompt_tokens=[40_000], completion_tokens=[6_000],
+                              cost_usd=[rng.uniform(0.005, 0.02)], task_count=[task_count]))
+    usage = len(AGENTS)
+    store.append("usage", {
+        "run_id": [run_id] * usage, "date": [day] * usage, "project": [project] * usage,
+        "kind": ["llm"] * usage, "agent": AGENTS, "task": TASKS, "model": ["gpt-4o-mini"] * usage,
+        "calls": [4] * usage, "prompt_tokens": [13_000] * usage, "completion_tokens": [2_000] * usage,
+        "cost_usd": [rng.uniform(0.001, 0.008) for _ in range(usage)],
+    })
+    # Estimates drift upwards over the half year.
+    drift = 1 + (index % 180) / 360
+    store.append("tasks", {
+        "run_id": [run_id] * task_count, "date": [day] * task_count, "project": [project] * task_count,
+        "task_name": [f"Task {t}" for t in range(task_count)],
+        "task_key": [f"task {t}" for t in range(task_count)],
+        "estimated_time_hours": [(4 + t % 40) * drift for t in range(task_count)],
+        "dependency_count": [t % 3 for t in range(task_count)],
+    })
+
+
+def timed(label, function):
+    started = time.perf_counter()
+    result = function()
+    print(f"  {label:<44} {(time.perf_counter() - started) * 1000:>9.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark appends and queries of the run history store.")
+    parser.add_argument("--runs", type=int, default=2000, help="Number of synthetic runs.")
+    parser.add_argument("--tasks", type=int, default=500, help="Estimated tasks per run.")
+    parser.add_argument("--batch-rows", type=int, default=200_000, help="Rows buffered before a flush.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    first_day = date(2024, 1, 1)
+    with tempfile.TemporaryDirectory() as root:
+        store = RunStore(root, batch_rows=args.batch_rows)
+        started = time.perf_counter()
+        for index in range(args.runs):
+            synthetic_run(store, rng, index, args.tasks, first_day)
+        store.close()
+        seconds = time.perf_counter() - started
+        rows = args.runs * (args.tasks + len(AGENTS) + 1)
+        print(f"Appended {args.runs} runs, {rows:,} rows in {seconds:.1f}s ({rows / seconds:,.0f} rows/s).")
+
+        last_month = ((first_day + timedelta(days=150)).isoformat(), (first_day + timedelta(days=179)).isoformat())
+        for phase in ("before compaction", "after compaction"):
+            print(f"Queries {phase}:")
+            timed("cost per project type", lambda: store.cost_by(("project",)))
+            timed("cost per project, agent and task", lambda: store.cost_by(("project", "agent", "task")))
+            drift = timed(f"estimate drift per month ({args.runs * args.tasks:,} rows)", lambda: store.estimate_drift())
+            timed("estimate drift, one project, last month", lambda: store.estimate_drift(
+                "day", *last_month, projects=[PROJECTS[0]]))
+            if phase == "before compaction":
+                compacted = sum(store.compact(table) for table in ("runs", "usage", "tasks"))
+                print(f"  compacted {compacted} partitions")
+        task = drift.filter(pc.equal(drift["task_key"], "task 1")).to_pylist()
+        print(f"Drift of 'task 1' in {task[-1]['project']}: {task[-1]['drift']:+.0%} by {task[-1]['period']}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Benchmark of the local critical-path scheduler.
+#
+# Generates a random plan (each task depends on up to three earlier tasks and
+# needs one of the team's roles) and times the critical-path computation and
+# the resource leveling, the work the resource_allocation task used to leave
+# to an LLM.
+#
+# Usage (from the project directory):
+#     python -m benchmarks.scheduler --tasks 10000
+
+import argparse
+import random
+import time
+
+from models import Milestone, TaskEstimate
+from scheduler import critical_path, level_resources, parse_team_members, schedule_tasks
+
+TEAM = """
+- Alex Chen (Project Manager)
+- Maria Rodriguez (Solutions Architect)
+- David Kim (Full-Stack Engineer)
+- Emily White (Backend Engineer)
+- Sarah Lee (Frontend Engineer)
+- Ben Carter (QA Engineer)
+- Jessica Green (DevOps Engineer)
+- Mike Johnson (UI/UX Designer)
+- Chloe Davis (Compliance & Legal Specialist)
+"""
+
+
+def random_plan(count, seed=0):
+    rng = random.Random(seed)
+    roles = [member.role for member in parse_team_members(TEAM)]
+    tasks = []
+    for i in range(count):
+        dependencies = [f"task-{j}" for j in sorted(set(rng.randrange(i) for _ in range(rng.randint(0, 3))))] if i else []
+        tasks.append(TaskEstimate(
+            task_name=f"task-{i}",
+            estimated_time_hours=rng.choice([2, 4, 8, 16, 24, 40]),
+            required_resources=[rng.choice(roles)],
+            dependencies=dependencies,
+        ))
+    milestones = [Milestone(milestone_name=f"milestone-{m}", tasks=[f"task-{i}" for i in range(m, count, 100)])
+                  for m in range(10)]
+    return tasks, milestones
+
+
+def best_of(repeat, function):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark critical-path scheduling and resource leveling.")
+    parser.add_argument("--tasks", type=int, default=10_000, help="Number of tasks in the generated plan.")
+    parser.add_argument("--repeat", type=int, default=5, help="Best of this many runs.")
+    args = parser.parse_args()
+
+    tasks, milestones = random_plan(args.tasks)
+    team = parse_team_members(TEAM)
+    edges = sum(len(task.dependencies) for task in tasks)
+
+    cpm_seconds, result = best_of(args.repeat, lambda: critical_path(tasks))
+    level_seconds, _ = best_of(args.repeat, lambda: level_resources(critical_path(tasks), team))
+    total_seconds, result = best_of(args.repeat, lambda: schedule_tasks(tasks, team, milestones))
+    print(f"{args.tasks} tasks, {edges} dependencies, {len(team)} team members (best of {args.repeat}):")
+    print(f"  critical path                  {cpm_seconds * 1000:>8.1f} ms")
+    print(f"  critical path + leveling       {level_seconds * 1000:>8.1f} ms")
+    print(f"  full schedule with milestones  {total_seconds * 1000:>8.1f} ms")
+    print(f"  critical path: {len(result.critical_path)} tasks, {result.duration_hours:.0f}h; "
+          f"leveled: {result.leveled_duration_hours:.0f}h")
+
+
+if __name__ == "__main__":
+    main()
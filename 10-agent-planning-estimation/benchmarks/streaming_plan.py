@@ -0,0 +1,64 @@
+# Benchmark of the streaming ProjectPlan parser.
+#
+# Serializes a generated plan the way a model writes it, splits it into chunks
+# of about one token, and compares parsing it chunk by chunk with
+# PlanStreamParser against validating the whole document at the end (what
+# output_pydantic does). At the given generation rate it also reports when the
+# first task, and the average task, is available to downstream code, compared
+# with waiting for the whole plan.
+#
+# Usage (from the project directory):
+#     python -m benchmarks.streaming_plan --tasks 500 --tokens-per-second 80
+
+import argparse
+import json
+
+from benchmarks.scheduler import best_of, random_plan
+from models import ProjectPlan, TaskEstimate
+from streaming_plan import PlanStreamParser
+
+CHARACTERS_PER_TOKEN = 4
+
+
+def parse_streamed(chunks):
+    parser = PlanStreamParser()
+    # The number of chunks read when each task completed, and the largest buffer.
+    completed_at, peak_buffer = [], 0
+    for index, chunk in enumerate(chunks, 1):
+        for item in parser.feed(chunk):
+            if isinstance(item, TaskEstimate):
+                completed_at.append(index)
+        peak_buffer = max(peak_buffer, len(parser._buffer))
+    return parser.close(), completed_at, peak_buffer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streaming ProjectPlan parser.")
+    parser.add_argument("--tasks", type=int, default=500, help="Number of tasks in the generated plan.")
+    parser.add_argument("--tokens-per-second", type=float, default=80, help="Simulated generation rate.")
+    parser.add_argument("--repeat", type=int, default=5, help="Best of this many runs.")
+    args = parser.parse_args()
+
+    tasks, milestones = random_plan(args.tasks)
+    document = json.dumps(ProjectPlan(tasks=tasks, milestones=milestones).model_dump(), indent=2)
+    chunks = [document[i:i + CHARACTERS_PER_TOKEN] for i in range(0, len(document), CHARACTERS_PER_TOKEN)]
+
+    whole_seconds, expected = best_of(args.repeat, lambda: ProjectPlan.model_validate_json(document))
+    stream_seconds, (plan, completed_at, peak_buffer) = best_of(args.repeat, lambda: parse_streamed(chunks))
+    assert plan == expected
+
+    generation = len(chunks) / args.tokens_per_second
+    first = completed_at[0] / args.tokens_per_second
+    mean = sum(completed_at) / len(completed_at) / args.tokens_per_second
+    print(f"{args.tasks} tasks, {len(document) / 1024:.0f} KiB, {len(chunks)} chunks (best of {args.repeat}):")
+    print(f"  validate whole document        {whole_seconds * 1000:>8.1f} ms")
+    print(f"  streaming parse, all chunks    {stream_seconds * 1000:>8.1f} ms "
+          f"({stream_seconds / len(chunks) * 1e6:.1f} us per chunk)")
+    print(f"  peak parser buffer             {peak_buffer:>8} characters")
+    print(f"At {args.tokens_per_second:g} tokens/s the plan takes {generation:.1f}s to generate:")
+    print(f"  first task available after     {first:>8.1f} s (instead of {generation:.1f} s)")
+    print(f"  average task available after   {mean:>8.1f} s")
+
+
+if __name__ == "__main__":
+    main()
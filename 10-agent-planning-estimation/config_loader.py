@@ -0,0 +1,226 @@
+# Loads and caches the YAML agent and task configurations of a crew.
+#
+# The YAML files are resolved relative to this project (not the current
+# directory), validated once, and compiled together with the placeholders each
+# entry uses (e.g. {project_type}). The compiled result is cached in memory and
+# in a binary cache file that is invalidated when a file's mtime/size change
+# and its SHA-256 no longer matches.
+#
+# Projects 10 and 11 each ship a copy of this module, as every project is
+# self-contained; project 11's tests/test_shared_modules.py checks that the
+# copies stay identical.
+
+import hashlib
+import os
+import pickle
+import string
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, Optional, Tuple, Union
+
+import yaml
+
+PROJECT_DIR = Path(__file__).resolve().parent
+CACHE_DIR = PROJECT_DIR / ".config_cache"
+# Bump when the compiled format changes, so old cache files are ignored.
+CACHE_VERSION = 1
+
+AGENT_REQUIRED = ("role", "goal", "backstory")
+TASK_REQUIRED = ("description", "expected_output")
+BOOLEAN_KEYS = ("allow_delegation", "verbose", "async_execution", "human_input", "memory", "cache")
+
+# The C loader is several times faster when libyaml is available.
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_memory_cache: Dict[Path, "CrewConfig"] = {}
+_memory_lock = threading.Lock()
+
+
+class ConfigError(ValueError):
+    """Raised when a configuration file is missing or does not match the schema."""
+
+
+@dataclass
+class CrewConfig:
+    """Validated agent and task configs of one crew, with the placeholders each entry needs."""
+    directory: str
+    agents_config: Dict[str, Dict[str, Any]]
+    tasks_config: Dict[str, Dict[str, Any]]
+    placeholders: Dict[str, FrozenSet[str]]
+    fingerprints: Dict[str, Tuple[int, int, str]] = field(default_factory=dict)
+
+    @property
+    def agents(self) -> Dict[str, Dict[str, Any]]:
+        # Copies, so a crew that mutates its config cannot affect the next one.
+        return {name: dict(config) for name, config in self.agents_config.items()}
+
+    @property
+    def tasks(self) -> Dict[str, Dict[str, Any]]:
+        return {name: dict(config) for name, config in self.tasks_config.items()}
+
+    @property
+    def required_inputs(self) -> FrozenSet[str]:
+        return frozenset().union(*self.placeholders.values())
+
+    def check_inputs(self, inputs: Mapping[str, Any], tasks: Optional[Iterable[str]] = None) -> None:
+        """
+        Fails fast, before any LLM call, when kickoff inputs miss a placeholder of
+        the agents or of the given tasks (all tasks by default).
+        """
+        required = self.required_inputs
+        if tasks is not None:
+            entries = [key for key in self.placeholders if key.startswith("agents.")]
+            for name in tasks:
+                if f"tasks.{name}" not in self.placeholders:
+                    raise ConfigError(f"Unknown task '{name}'")
+                entries.append(f"tasks.{name}")
+            required = frozenset().union(*(self.placeholders[key] for key in entries))
+        missing = sorted(required - set(inputs))
+        if missing:
+            raise ConfigError(f"Missing crew inputs: {', '.join(missing)}")
+
+
+def _placeholders(value: Any) -> FrozenSet[str]:
+    if isinstance(value, str):
+        try:
+            return frozenset(
+                name.split(".")[0].split("[")[0]
+                for _, name, _, _ in string.Formatter().parse(value) if name
+            )
+        except ValueError as e:
+            raise ConfigError(f"Malformed placeholder in {value[:60]!r}: {e}") from None
+    if isinstance(value, dict):
+        return frozenset().union(*map(_placeholders, value.values()))
+    if isinstance(value, list):
+        return frozenset().union(*map(_placeholders, value))
+    return frozenset()
+
+
+def _validate(kind: str, data: Any, required: Tuple[str, ...], path: Path) -> Dict[str, Dict[str, Any]]:
+    if not isinstance(data, dict) or not data:
+        raise ConfigError(f"{path}: expected a mapping of {kind} names to their settings")
+    for name, entry in data.items():
+        if not isinstance(entry, dict):
+            raise ConfigError(f"{path}: {kind} '{name}' must be a mapping")
+        for key in required:
+            if not isinstance(entry.get(key), str) or not entry[key].strip():
+                raise ConfigError(f"{path}: {kind} '{name}' needs a non-empty '{key}'")
+        for key in BOOLEAN_KEYS:
+            if key in entry and not isinstance(entry[key], bool):
+                raise ConfigError(f"{path}: {kind} '{name}' has a non-boolean '{key}'")
+    return data
+
+
+def _fingerprint(path: Path, content: Optional[bytes] = None) -> Tuple[int, int, str]:
+    stat = path.stat()
+    if content is None:
+        content = path.read_bytes()
+    return stat.st_mtime_ns, stat.st_size, hashlib.sha256(content).hexdigest()
+
+
+def _resolve(config_dir: Union[str, Path]) -> Path:
+    directory = Path(config_dir)
+    return (directory if directory.is_absolute() else PROJECT_DIR / directory).resolve()
+
+
+def _files(directory: Path) -> Dict[str, Path]:
+    return {"agents": directory / "agents.yaml", "tasks": directory / "tasks.yaml"}
+
+
+def compile_config(config_dir: Union[str, Path] = "config") -> CrewConfig:
+    """Parses, validates and compiles a config directory without using any cache."""
+    directory = _resolve(config_dir)
+    fingerprints, data = {}, {}
+    for kind, path in _files(directory).items():
+        try:
+            content = path.read_bytes()
+        except OSError as e:
+            raise ConfigError(f"Cannot read {path}: {e}") from None
+        fingerprints[kind] = _fingerprint(path, content)
+        data[kind] = yaml.load(content, Loader=_Loader)
+
+    agents = _validate("agent", data["agents"], AGENT_REQUIRED, _files(directory)["agents"])
+    tasks = _validate("task", data["tasks"], TASK_REQUIRED, _files(directory)["tasks"])
+    placeholders = {f"agents.{name}": _placeholders(entry) for name, entry in agents.items()}
+    placeholders.update({f"tasks.{name}": _placeholders(entry) for name, entry in tasks.items()})
+    return CrewConfig(str(directory), agents, tasks, placeholders, fingerprints)
+
+
+def _is_current(config: CrewConfig) -> bool:
+    """Cheap stat check first; a changed mtime only invalidates the cache if the content changed too."""
+    for kind, path in _files(Path(config.directory)).items():
+        mtime, size, digest = config.fingerprints.get(kind, (None, None, None))
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        if (stat.st_mtime_ns, stat.st_size) == (mtime, size):
+            continue
+        current = _fingerprint(path)
+        if current[2] != digest:
+            return False
+        # Touched but unchanged: remember the new mtime so the next check is a stat again.
+        config.fingerprints[kind] = current
+    return True
+
+
+def _cache_path(directory: Path) -> Path:
+    return CACHE_DIR / f"{hashlib.sha256(str(directory).encode('utf-8')).hexdigest()[:16]}.pickle"
+
+
+def _read_cache(directory: Path) -> Optional[CrewConfig]:
+    try:
+        with open(_cache_path(directory), "rb") as file:
+            version, config = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError, ImportError):
+        return None
+    return config if version == CACHE_VERSION else None
+
+
+def _write_cache(directory: Path, config: CrewConfig) -> None:
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            pickle.dump((CACHE_VERSION, config), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, _cache_path(directory))
+    except OSError:
+        # A read-only checkout still works, it just compiles on every start.
+        pass
+
+
+def load_crew_config(config_dir: Union[str, Path] = "config", use_cache: bool = True) -> CrewConfig:
+    """
+    Returns the validated configs of a crew, from memory, the binary cache, or
+    by compiling the YAML files, whichever is the first that is still current.
+    `config_dir` is relative to this project unless it is absolute.
+    """
+    directory = _resolve(config_dir)
+    if not use_cache:
+        return compile_config(directory)
+
+    with _memory_lock:
+        config = _memory_cache.get(directory)
+    if config is None or not _is_current(config):
+        config = _read_cache(directory)
+        if config is None or not _is_current(config):
+            config = compile_config(directory)
+            _write_cache(directory, config)
+        with _memory_lock:
+            _memory_cache[directory] = config
+    return config
+
+
+def load_many(config_dirs: Iterable[Union[str, Path]], max_workers: int = 8) -> Dict[str, CrewConfig]:
+    """Loads many crew definitions at once (e.g. when a service starts), keyed by the given directory."""
+    config_dirs = list(config_dirs)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        configs = pool.map(load_crew_config, config_dirs)
+    return {str(config_dir): config for config_dir, config in zip(config_dirs, configs)}
+
+
+def clear_memory_cache() -> None:
+    with _memory_lock:
+        _memory_cache.clear()
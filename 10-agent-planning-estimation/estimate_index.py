@@ -0,0 +1,335 @@
+# Retrieval index of past task estimates for the estimation agent.
+#
+# Every past TaskEstimate is reduced to a normalized task key; records with the
+# same key are aggregated (count, mean and spread of the hours), so the index
+# holds one row per distinct task. Each key is embedded by feature hashing its
+# words and word pairs into a fixed number of dimensions (no model, no network
+# call) and the L2-normalized vectors form a float32 NumPy matrix; a lookup is
+# one matrix product with the query vectors, after which only the rows above a
+# minimum cosine similarity are sorted for the top k.
+#
+# In the crew, the breakdown task's callback looks up the tasks it produced and
+# adds the similar historical tasks to the estimation task's description. Tasks
+# with a close, consistent match are removed from the breakdown the estimation
+# agent reads, so it does not estimate them at all, and their historical
+# estimate is merged into the plan afterwards.
+
+import re
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from crewai_tools import BaseTool
+
+from models import TaskEstimate
+
+DIMENSIONS = 128
+# A match this similar, with a consistent history, replaces the LLM estimate.
+REUSE_SIMILARITY = 0.9
+REUSE_MIN_SAMPLES = 3
+REUSE_MAX_SPREAD = 0.25
+STOPWORDS = frozenset("a an and as at by for from in into of on or the to with".split())
+# List items that are fields of a task rather than tasks.
+FIELD_LABELS = frozenset("deliverable dependency dependencie description duration effort owner resource risk scope timeline".split())
+# Breakdown lines that name a task: "1. Design the schema", "- Task 3: Build the API", "### Testing"
+TASK_LINE = re.compile(r"^\s*(?:#{1,6}\s*|[-*•]\s+|\d+[.)]\s+|task\s*\d+\s*[:.-]\s*)+(?P<name>[^:\n]{3,120})", re.I)
+
+
+def tokens(text: str) -> List[str]:
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    # A light plural stemming, so "tests" and "test" share a feature.
+    return [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w
+            for w in words if w not in STOPWORDS]
+
+
+def normalize(text: str) -> str:
+    return " ".join(tokens(text))
+
+
+def _features(key: str) -> List[Tuple[str, float]]:
+    words = key.split()
+    return [(w, 1.0) for w in words] + [(f"{a} {b}", 0.5) for a, b in zip(words, words[1:])]
+
+
+def embed(keys: Sequence[str], dimensions: int = DIMENSIONS) -> np.ndarray:
+    """Feature-hashed, L2-normalized float32 vectors of normalized task keys."""
+    matrix = np.zeros((len(keys), dimensions), dtype=np.float32)
+    for row, key in enumerate(keys):
+        for feature, weight in _features(key):
+            code = zlib.crc32(feature.encode("utf-8"))
+            # The top bit picks the sign, so colliding features tend to cancel out.
+            matrix[row, code % dimensions] += weight if code & 0x80000000 else -weight
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+@dataclass
+class Match:
+    task_name: str
+    similarity: float
+    mean_hours: float
+    std_hours: float
+    samples: int
+
+    @property
+    def reusable(self) -> bool:
+        """Close enough and consistent enough to reuse the historical estimate as is."""
+        spread = self.std_hours / self.mean_hours if self.mean_hours else 0.0
+        return (self.similarity >= REUSE_SIMILARITY and self.samples >= REUSE_MIN_SAMPLES
+                and spread <= REUSE_MAX_SPREAD)
+
+
+class EstimateIndex:
+    """
+    Aggregated past estimates with a cosine top-k lookup.
+
+    index = EstimateIndex.from_run_store(RunStore('run_history'))
+    index.search(['Design the database schema'], k=3)
+    """
+
+    def __init__(self, dimensions: int = DIMENSIONS):
+        self.dimensions = dimensions
+        self.names: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._count: List[int] = []
+        self._sum: List[float] = []
+        self._sum_squares: List[float] = []
+        self._matrix = np.zeros((0, dimensions), dtype=np.float32)
+        self._pending: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, task_names: Iterable[str], hours: Iterable[float]) -> None:
+        """Adds past estimates; a task already in the index only updates its statistics."""
+        for name, value in zip(task_names, hours):
+            if value is None:
+                continue
+            key = normalize(name)
+            if not key:
+                continue
+            row = self._rows.get(key)
+            if row is None:
+                row = self._rows[key] = len(self.names)
+                self.names.append(name)
+                self._count.append(0)
+                self._sum.append(0.0)
+                self._sum_squares.append(0.0)
+                self._pending.append(key)
+            self._count[row] += 1
+            self._sum[row] += value
+            self._sum_squares[row] += value * value
+
+    def _ensure_matrix(self) -> np.ndarray:
+        if self._pending:
+            self._matrix = np.vstack([self._matrix, embed(self._pending, self.dimensions)])
+            self._pending = []
+        return self._matrix
+
+    def _stats(self, row: int) -> Tuple[float, float, int]:
+        count = self._count[row]
+        mean = self._sum[row] / count
+        variance = max(self._sum_squares[row] / count - mean * mean, 0.0)
+        return mean, variance ** 0.5, count
+
+    def search(self, queries: Sequence[str], k: int = 5, min_similarity: float = 0.3,
+               chunk_rows: int = 262_144) -> List[List[Match]]:
+        """Top-k historical tasks per query, most similar first."""
+        matrix = self._ensure_matrix()
+        if not len(queries) or not len(matrix):
+            return [[] for _ in queries]
+        vectors = embed([normalize(query) for query in queries], self.dimensions)
+        candidates: List[List[Tuple[float, int]]] = [[] for _ in queries]
+        # In chunks, so the score matrix stays small however large the index is. Only
+        # the few rows above min_similarity are sorted.
+        for start in range(0, len(matrix), chunk_rows):
+            scores = vectors @ matrix[start:start + chunk_rows].T
+            for query, row_scores in enumerate(scores):
+                rows = np.flatnonzero(row_scores >= min_similarity)
+                if len(rows) > k:
+                    rows = rows[np.argpartition(row_scores[rows], -k)[-k:]]
+                candidates[query].extend(zip(row_scores[rows].tolist(), (rows + start).tolist()))
+
+        results = []
+        for found in candidates:
+            matches = []
+            for score, row in sorted(found, key=lambda item: (-item[0], item[1]))[:k]:
+                mean, std, count = self._stats(row)
+                matches.append(Match(self.names[row], round(score, 4), mean, std, count))
+            results.append(matches)
+        return results
+
+    def save(self, path: Union[str, Path]) -> None:
+        np.savez(path, matrix=self._ensure_matrix(), names=np.array(self.names, dtype=str),
+                 count=np.array(self._count), sum=np.array(self._sum), sum_squares=np.array(self._sum_squares))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "EstimateIndex":
+        with np.load(path, allow_pickle=False) as data:
+            index = cls(data["matrix"].shape[1])
+            index._matrix = data["matrix"]
+            index.names = data["names"].tolist()
+            index._count = data["count"].tolist()
+            index._sum = data["sum"].tolist()
+            index._sum_squares = data["sum_squares"].tolist()
+        index._rows = {normalize(name): row for row, name in enumerate(index.names)}
+        return index
+
+    @classmethod
+    def from_run_store(cls, store: Any, projects: Optional[Iterable[str]] = None,
+                       dimensions: int = DIMENSIONS) -> "EstimateIndex":
+        """
+        Builds the index from the `tasks` dataset of a RunStore, without the
+        estimates that were themselves reused from the index: indexing them again
+        would count one estimate as several samples and lock it in.
+        """
+        table = store.scan("tasks", ["task_name", "estimated_time_hours", "reused"], projects=projects)
+        rows = [(name, hours) for name, hours, reused in zip(table["task_name"].to_pylist(),
+                                                             table["estimated_time_hours"].to_pylist(),
+                                                             table["reused"].to_pylist()) if not reused]
+        index = cls(dimensions)
+        index.add([name for name, _ in rows], [hours for _, hours in rows])
+        return index
+
+
+def _task_name(line: str) -> Optional[str]:
+    """The task named by a breakdown line, if any."""
+    match = TASK_LINE.match(re.sub(r"[*_`]{2,}", "", line))
+    if not match:
+        return None
+    # "Design the schema - define the tables": the name is before the dash.
+    name = re.split(r"\s+[-–—]\s+", match.group("name"))[0].strip(" *_#").strip()
+    key = normalize(name)
+    return name if key and key.split()[0] not in FIELD_LABELS else None
+
+
+def extract_task_names(text: str) -> List[str]:
+    """The task names of a breakdown: its list items and headings, first occurrence only."""
+    names, seen = [], set()
+    for line in text.splitlines():
+        name = _task_name(line)
+        key = normalize(name) if name is not None else None
+        if key is not None and key not in seen:
+            seen.add(key)
+            names.append(name)
+    return names
+
+
+def remove_tasks(text: str, task_names: Iterable[str]) -> str:
+    """
+    The breakdown without the given tasks: the line of each task and the lines
+    under it (its fields, its sub-items), up to the next task that is not
+    indented more.
+    """
+    keys = {normalize(name) for name in task_names}
+    lines: List[str] = []
+    removed_indent: Optional[int] = None
+    for line in text.splitlines():
+        name = _task_name(line)
+        indent = len(line) - len(line.lstrip())
+        if name is not None and (removed_indent is None or indent <= removed_indent):
+            removed_indent = indent if normalize(name) in keys else None
+        if removed_indent is None:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def historical_context(index: EstimateIndex, task_names: Sequence[str], k: int = 3) -> Tuple[str, Dict[str, float]]:
+    """
+    The text added to the estimation task and the estimates reused as is, by task
+    name. Only the lines for the tasks with a match that are still estimated are
+    included, to keep it short.
+    """
+    reused: Dict[str, float] = {}
+    lines = []
+    for name, matches in zip(task_names, index.search(task_names, k)):
+        if not matches:
+            continue
+        if matches[0].reusable:
+            reused[name] = round(matches[0].mean_hours, 1)
+        else:
+            similar = "; ".join(f"{m.task_name} {m.mean_hours:.1f}h (n={m.samples}, sim={m.similarity:.2f})"
+                                for m in matches)
+            lines.append(f"- {name}: similar past tasks: {similar}")
+    if not lines:
+        return "", reused
+    text = "\n\nHistorical estimates of similar tasks from past projects, as a reference:\n" + "\n".join(lines)
+    return text, reused
+
+
+def seed_estimation(index: EstimateIndex, breakdown_task: Any, estimation_task: Any,
+                    k: int = 3) -> Dict[str, float]:
+    """
+    Sets callbacks on the breakdown and estimation tasks: the historical estimates
+    of the breakdown's tasks are added to the estimation task, and the tasks with
+    a reusable estimate are removed from the breakdown until the estimation is
+    done, so that the later steps read the whole breakdown again. Returns the
+    dict that receives the reused estimates, for apply_reused_estimates after
+    the run.
+    """
+    reused: Dict[str, float] = {}
+    hidden: List[Tuple[Any, str]] = []
+    previous_breakdown, previous_estimation = breakdown_task.callback, estimation_task.callback
+
+    def on_breakdown(output: Any) -> None:
+        if previous_breakdown is not None:
+            previous_breakdown(output)
+        text, found = historical_context(index, extract_task_names(output.raw), k)
+        estimation_task.description += text
+        reused.update(found)
+        if found:
+            # The estimation task's context is this output, read when the estimation starts.
+            hidden.append((output, output.raw))
+            output.raw = remove_tasks(output.raw, found)
+
+    def on_estimation(output: Any) -> None:
+        while hidden:
+            breakdown, raw = hidden.pop()
+            breakdown.raw = raw
+        if previous_estimation is not None:
+            previous_estimation(output)
+
+    breakdown_task.callback = on_breakdown
+    estimation_task.callback = on_estimation
+    return reused
+
+
+def apply_reused_estimates(plan: Any, reused: Dict[str, float]) -> List[str]:
+    """
+    Sets the reused historical estimates on the plan's tasks and adds the reused
+    tasks the plan lacks (without resources or dependencies); returns the names
+    of the plan's tasks that got a reused estimate, for RunStore.record_run.
+    """
+    by_key = {normalize(name): (name, hours) for name, hours in reused.items()}
+    applied = []
+    for task in plan.tasks:
+        name, hours = by_key.pop(normalize(task.task_name), (None, None))
+        if hours is not None:
+            task.estimated_time_hours = hours
+            applied.append(task.task_name)
+    for name, hours in by_key.values():
+        plan.tasks.append(TaskEstimate(task_name=name, estimated_time_hours=hours, required_resources=[]))
+        applied.append(name)
+    return applied
+
+
+class HistoricalEstimatesTool(BaseTool):
+    name: str = "Historical Estimates Lookup"
+    description: str = (
+        "Looks up the hours of similar tasks in past projects. Input: task_names, the task names "
+        "separated by newlines. Returns the most similar past tasks with their mean hours, spread "
+        "and number of samples."
+    )
+    index: Any
+
+    def _run(self, task_names: str) -> str:
+        names = [name.strip() for name in task_names.splitlines() if name.strip()]
+        lines = []
+        for name, matches in zip(names, self.index.search(names, 3)):
+            found = "; ".join(f"{m.task_name}: {m.mean_hours:.1f}h +/- {m.std_hours:.1f}h "
+                              f"(n={m.samples}, similarity {m.similarity:.2f})" for m in matches)
+            lines.append(f"{name} -> {found or 'no similar past task'}")
+        return "\n".join(lines)
@@ -11,7 +11,6 @@ from helper import load_env
 load_env()
 
 import os
-import yaml
 from crewai import Agent, Task, Crew
 
 # Set OpenAI Model
@@ -19,39 +18,21 @@ os.environ['OPENAI_MODEL_NAME'] = 'gpt-4o-mini'
 
 # Loading Tasks and Agents YAML files
 
-# Define file paths for YAML configurations
-files = {
-    'agents': 'config/agents.yaml',
-    'tasks': 'config/tasks.yaml'
-}
+# Load the validated configurations; paths are resolved relative to this
+# project and the compiled result is cached until the YAML files change
+from config_loader import load_crew_config
 
-# Load configurations from YAML files
-configs = {}
-for config_type, file_path in files.items():
-    with open(file_path, 'r') as file:
-        configs[config_type] = yaml.safe_load(file)
+crew_config = load_crew_config('config')
 
 # Assign loaded configurations to specific variables
-agents_config = configs['agents']
-tasks_config = configs['tasks']
-
-
-# Create Pydantic Models for Structured Output
-from typing import List
-from pydantic import BaseModel, Field
-
-class TaskEstimate(BaseModel):
-    task_name: str = Field(..., description="Name of the task")
-    estimated_time_hours: float = Field(..., description="Estimated time to complete the task in hours")
-    required_resources: List[str] = Field(..., description="List of resources required to complete the task")
+agents_config = crew_config.agents
+tasks_config = crew_config.tasks
 
-class Milestone(BaseModel):
-    milestone_name: str = Field(..., description="Name of the milestone")
-    tasks: List[str] = Field(..., description="List of task IDs associated with this milestone")
 
-class ProjectPlan(BaseModel):
-    tasks: List[TaskEstimate] = Field(..., description="List of tasks with their estimates")
-    milestones: List[Milestone] = Field(..., description="List of project milestones")
+# Pydantic Models for Structured Output
+# The crew only extracts the estimates, dependencies and milestones; the
+# schedule itself is computed locally (see scheduler.py)
+from models import TaskEstimate, Milestone, ProjectPlan
 
 
 # Create Crew, Agents and Tasks
@@ -79,10 +60,11 @@ time_resource_estimation = Task(
   agent=estimation_agent
 )
 
+# The structured ProjectPlan is streamed from this task after the crew has run
+# (see streaming_plan.py), so its tasks can be used while it is being written
 resource_allocation = Task(
   config=tasks_config['resource_allocation'],
-  agent=resource_allocation_agent,
-  output_pydantic=ProjectPlan # This is the structured output we want
+  agent=resource_allocation_agent
 )
 
 # Creating Crew
@@ -94,8 +76,7 @@ crew = Crew(
   ],
   tasks=[
     task_breakdown,
-    time_resource_estimation,
-    resource_allocation
+    time_resource_estimation
   ],
   verbose=True
 )
@@ -175,28 +156,66 @@ inputs = {
   'project_requirements': project_requirements
 }
 
-# Run the crew
-result = crew.kickoff(
-  inputs=inputs
-)
+# Fail fast if an input used by the YAML placeholders is missing
+crew_config.check_inputs(inputs, tasks=['task_breakdown', 'time_resource_estimation', 'resource_allocation'])
+
+# Seed the estimation with the estimates of similar tasks from past runs: close,
+# consistent matches are reused as is instead of being estimated again
+from run_store import RunStore
+from estimate_index import EstimateIndex, seed_estimation, apply_reused_estimates
+
+estimate_index = EstimateIndex.from_run_store(RunStore('run_history'))
+reused_estimates = seed_estimation(estimate_index, task_breakdown, time_resource_estimation)
+
+# Run the crew, collecting per-agent, per-task and per-model usage and latency
+from metrics import CrewMetrics
+from streaming_plan import PlanStreamParser, stream_plan
+
+metrics = CrewMetrics(crew_name='project_planning')
+metrics.watch(crew, crew_config, tasks=[resource_allocation])
+with metrics:
+  result = crew.kickoff(
+    inputs=inputs
+  )
+
+  # Stream the structured plan: every task and milestone is validated as soon as
+  # the model has written it, without waiting for the whole document
+  resource_allocation.interpolate_inputs(inputs)
+  plan_parser = PlanStreamParser()
+  for item in stream_plan(resource_allocation, [output.raw for output in result.tasks_output], plan_parser):
+    print(item)
+plan = plan_parser.close()
 
 
 # Usage Metrics and Costs: Let’s see how much it would cost each time if this crew runs at scale.
 import pandas as pd
 
-costs = 0.150 * (crew.usage_metrics.prompt_tokens + crew.usage_metrics.completion_tokens) / 1_000_000
+# Costs use the per-model price table, with cached prompt tokens at the cached price
+costs = metrics.total_cost()
 print(f"Total costs: ${costs:.4f}")
 
-# Convert UsageMetrics instance to a DataFrame
-df_usage_metrics = pd.DataFrame([crew.usage_metrics.dict()])
+# Export for Prometheus (textfile collector) and append this run to the JSONL history
+metrics.write_prometheus('run_metrics/project_planning.prom')
+metrics.write_jsonl('run_metrics/runs.jsonl')
+
+# One row per agent, task and model (and per tool)
+df_usage_metrics = pd.DataFrame(metrics.records())
 df_usage_metrics
 
 # result
-result.pydantic.dict()
+plan.dict()
+
+# Schedule the plan locally: critical path, earliest and latest start times and
+# a resource-leveled allocation over the team members
+from datetime import date
+from scheduler import schedule_plan
+
+reused_tasks = apply_reused_estimates(plan, reused_estimates)
+schedule = schedule_plan(plan, team_members)
+print(schedule.summary())
 
 # Inspect further
-tasks = result.pydantic.dict()['tasks']
-df_tasks = pd.DataFrame(tasks)
+df_tasks = pd.DataFrame(schedule.rows(start_date=date.today()))
 
 # Display the DataFrame as an HTML table
 df_tasks.style.set_table_attributes('border="1"').set_caption("Task Details").set_table_styles(
@@ -205,10 +224,45 @@ df_tasks.style.set_table_attributes('border="1"').set_caption("Task Details").se
 
 # Inspecting Milestones
 
-milestones = result.pydantic.dict()['milestones']
+milestones = plan.dict()['milestones']
+for milestone in milestones:
+    milestone['finish_hours'] = schedule.milestones.get(milestone['milestone_name'])
 df_milestones = pd.DataFrame(milestones)
 
 # Display the DataFrame as an HTML table
 df_milestones.style.set_table_attributes('border="1"').set_caption("Task Details").set_table_styles(
     [{'selector': 'th, td', 'props': [('font-size', '120%')]}]
 )
+
+
+# Explaining the schedule: the LLM only explains the computed numbers
+schedule_explanation = Task(
+  config=tasks_config['schedule_explanation'],
+  agent=resource_allocation_agent
+)
+
+explanation_crew = Crew(
+  agents=[resource_allocation_agent],
+  tasks=[schedule_explanation],
+  verbose=True
+)
+
+explanation_inputs = dict(inputs, schedule_summary=schedule.summary())
+crew_config.check_inputs(explanation_inputs, tasks=['schedule_explanation'])
+
+metrics.watch(explanation_crew, crew_config)
+with metrics:
+  explanation = explanation_crew.kickoff(
+    inputs=explanation_inputs
+  )
+
+display(Markdown(explanation.raw))
+
+
+# Keep the run in the columnar run history (Parquet, partitioned by date and project)
+with RunStore('run_history') as store:
+  store.record_run(inputs, metrics, plan, schedule, reused=reused_tasks)
+
+# Cost per project type and estimate drift across all recorded runs
+store.cost_by(('project',)).to_pandas()
+store.estimate_drift('month', projects=[project]).to_pandas()
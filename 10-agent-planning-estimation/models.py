@@ -0,0 +1,25 @@
+# Pydantic models for the structured output of the planning crew.
+#
+# The crew only extracts these (tasks, estimates, dependencies and milestones);
+# start and end times, the critical path and the allocation to team members are
+# computed from them locally by scheduler.py.
+
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class TaskEstimate(BaseModel):
+    task_name: str = Field(..., description="Name of the task")
+    estimated_time_hours: float = Field(..., description="Estimated time to complete the task in hours")
+    required_resources: List[str] = Field(..., description="List of resources required to complete the task")
+    dependencies: List[str] = Field(default_factory=list, description="Names of the tasks that must be finished before this task can start")
+
+
+class Milestone(BaseModel):
+    milestone_name: str = Field(..., description="Name of the milestone")
+    tasks: List[str] = Field(..., description="List of task IDs associated with this milestone")
+
+
+class ProjectPlan(BaseModel):
+    tasks: List[TaskEstimate] = Field(..., description="List of tasks with their estimates")
+    milestones: List[Milestone] = Field(..., description="List of project milestones")
@@ -0,0 +1,191 @@
+# Map-reduce estimation over the task breakdown.
+#
+# The time_resource_estimation task estimates every task of the breakdown in one
+# generation, so its latency grows with the size of the project and a long
+# report can be cut off. Here the breakdown is split into chunks along its
+# areas (the headings of the breakdown, e.g. Architecture, Development,
+# Testing, CI/CD): small areas are packed together and large ones are split
+# between their tasks, so that no chunk has more than `max_tasks` tasks. The
+# chunks are estimated concurrently by their own estimation crews, all asked
+# for the same units and format, and the reports are merged in breakdown
+# order. The resource_allocation step then reads the merged report as it
+# would read the single one (see streaming_plan.py).
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, List, Mapping, Optional
+
+from crewai import Agent, Crew, Task
+
+from config_loader import CrewConfig, load_crew_config
+from estimate_index import extract_task_names
+from models import ProjectPlan
+from planning_crew import check_planning_inputs
+from streaming_plan import PlanStreamParser, stream_plan
+
+DEFAULT_MAX_TASKS = 12
+# Headings of the breakdown areas: "## Architecture", "**2. Testing:**"
+AREA_HEADING = re.compile(r"^(?:#{1,4}\s*(?P<heading>.+?)\s*#*|\*\*(?P<bold>[^*]+?)\*\*:?)\s*$")
+LIST_ITEM = re.compile(r"^(?P<indent>\s*)(?:[-*•]|\d+[.)])\s+")
+CHUNK_INSTRUCTIONS = (
+    "\n\nThe breakdown is estimated in parts. Estimate only the following tasks, "
+    "from the {area} part of the breakdown; give every estimate in hours and keep "
+    "the exact task names:\n\n{tasks}"
+)
+
+
+@dataclass
+class BreakdownChunk:
+    """A part of the task breakdown, estimated on its own."""
+    area: str
+    text: str
+    tasks: int
+
+
+def _area_name(line: str) -> Optional[str]:
+    match = AREA_HEADING.match(line)
+    if not match:
+        return None
+    name = (match.group("heading") or match.group("bold")).strip(" *:")
+    return re.sub(r"^\d+[.)]\s*", "", name) or None
+
+
+def _sections(text: str) -> List[BreakdownChunk]:
+    sections: List[BreakdownChunk] = []
+    area, heading, lines = "General", [], []
+
+    def close_section() -> None:
+        if any(line.strip() for line in lines):
+            body = "\n".join(lines)
+            # The heading itself is not one of the tasks.
+            sections.append(BreakdownChunk(area, "\n".join(heading + lines).strip("\n"),
+                                           len(extract_task_names(body))))
+
+    for line in text.splitlines():
+        name = _area_name(line)
+        if name is not None:
+            close_section()
+            area, heading, lines = name, [line], []
+        else:
+            lines.append(line)
+    close_section()
+    return sections
+
+
+def _split_section(section: BreakdownChunk, max_tasks: int) -> List[BreakdownChunk]:
+    """Splits a section between its outermost list items into parts of at most `max_tasks` items."""
+    lines = section.text.splitlines()
+    indents = [len(m.group("indent")) for m in map(LIST_ITEM.match, lines) if m]
+    if not indents:
+        return [section]
+    outer = min(indents)
+    starts = [i for i, line in enumerate(lines)
+              if (m := LIST_ITEM.match(line)) and len(m.group("indent")) == outer]
+    # Text before the first item (the heading) is repeated in every part.
+    header = lines[:starts[0]]
+    # Parts of even size: 25 items at 12 a part are 9 + 8 + 8, not 12 + 12 + 1.
+    size, larger = divmod(len(starts), -(-len(starts) // max_tasks))
+    bounds = [0]
+    while bounds[-1] < len(starts):
+        bounds.append(bounds[-1] + size + (len(bounds) <= larger))
+    parts = []
+    for first, last in zip(bounds, bounds[1:]):
+        end = starts[last] if last < len(starts) else len(lines)
+        items = lines[starts[first]:end]
+        parts.append(BreakdownChunk(section.area, "\n".join(header + items).strip("\n"),
+                                    len(extract_task_names("\n".join(items)))))
+    return parts
+
+
+def split_breakdown(text: str, max_tasks: int = DEFAULT_MAX_TASKS) -> List[BreakdownChunk]:
+    """
+    Splits a task breakdown into chunks of at most about `max_tasks` tasks along
+    its areas, in breakdown order.
+    """
+    chunks: List[BreakdownChunk] = []
+    for section in _sections(text):
+        parts = _split_section(section, max_tasks) if section.tasks > max_tasks else [section]
+        for part in parts:
+            last = chunks[-1] if chunks else None
+            # Small areas are packed together, so short areas do not each cost a call.
+            if last is not None and last.tasks + part.tasks <= max_tasks:
+                # An area without tasks (an introduction) does not name the chunk.
+                if part.area == last.area or not part.tasks:
+                    area = last.area
+                elif not last.tasks:
+                    area = part.area
+                else:
+                    area = f"{last.area} / {part.area}"
+                chunks[-1] = BreakdownChunk(area, f"{last.text}\n\n{part.text}", last.tasks + part.tasks)
+            else:
+                chunks.append(part)
+    return chunks
+
+
+def estimate_chunks(chunks: List[BreakdownChunk], estimate: Callable[[BreakdownChunk], str],
+                    max_concurrency: int = 4) -> List[str]:
+    """Runs `estimate` on every chunk, at most `max_concurrency` at once; reports in chunk order."""
+    if len(chunks) <= 1 or max_concurrency <= 1:
+        return [estimate(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(chunks)),
+                            thread_name_prefix="estimation") as pool:
+        return list(pool.map(estimate, chunks))
+
+
+def merge_estimates(chunks: List[BreakdownChunk], reports: List[str]) -> str:
+    """One estimation report with a section per chunk, in breakdown order."""
+    sections = [f"## {chunk.area}\n\n{report.strip()}" for chunk, report in zip(chunks, reports)]
+    return (f"Estimation report of {sum(chunk.tasks for chunk in chunks)} tasks, by area of "
+            f"the breakdown. All estimates are in hours.\n\n" + "\n\n".join(sections))
+
+
+def crew_estimator(inputs: Mapping[str, Any], crew_config: Optional[CrewConfig] = None,
+                   metrics: Optional[Any] = None, verbose: bool = False) -> Callable[[BreakdownChunk], str]:
+    """An `estimate` function that runs a new one-task estimation crew per chunk."""
+    crew_config = crew_config or load_crew_config('config')
+
+    def estimate(chunk: BreakdownChunk) -> str:
+        config = crew_config.tasks['time_resource_estimation']
+        # The chunk is interpolated with the inputs too, so its braces are escaped.
+        config['description'] += CHUNK_INSTRUCTIONS.format(
+            area=chunk.area.replace("{", "{{").replace("}", "}}"),
+            tasks=chunk.text.replace("{", "{{").replace("}", "}}"),
+        )
+        agent = Agent(config=crew_config.agents['estimation_agent'], verbose=verbose)
+        task = Task(config=config, agent=agent, name='time_resource_estimation')
+        crew = Crew(agents=[agent], tasks=[task], verbose=verbose)
+        if metrics is not None:
+            metrics.watch(crew, crew_config)
+        return crew.kickoff(inputs=dict(inputs)).raw
+
+    return estimate
+
+
+def plan_project_parallel(inputs: Mapping[str, Any], crew_config: Optional[CrewConfig] = None,
+                          metrics: Optional[Any] = None, max_concurrency: int = 4,
+                          max_tasks: int = DEFAULT_MAX_TASKS, verbose: bool = False) -> ProjectPlan:
+    """
+    plan_project with the estimation split over the areas of the breakdown: the
+    breakdown crew runs first, its chunks are estimated concurrently, and the
+    structured plan is streamed from the breakdown and the merged report.
+    """
+    crew_config = crew_config or load_crew_config('config')
+    check_planning_inputs(inputs, crew_config)
+    planning_agent = Agent(config=crew_config.agents['project_planning_agent'], verbose=verbose)
+    allocation_agent = Agent(config=crew_config.agents['resource_allocation_agent'], verbose=verbose)
+    breakdown_task = Task(config=crew_config.tasks['task_breakdown'], agent=planning_agent)
+    allocation_task = Task(config=crew_config.tasks['resource_allocation'], agent=allocation_agent)
+    crew = Crew(agents=[planning_agent, allocation_agent], tasks=[breakdown_task], verbose=verbose)
+    if metrics is not None:
+        metrics.watch(crew, crew_config, tasks=[allocation_task])
+
+    breakdown = crew.kickoff(inputs=dict(inputs)).raw
+    chunks = split_breakdown(breakdown, max_tasks)
+    reports = estimate_chunks(chunks, crew_estimator(inputs, crew_config, metrics, verbose), max_concurrency)
+
+    allocation_task.interpolate_inputs(dict(inputs))
+    parser = PlanStreamParser()
+    for _ in stream_plan(allocation_task, [breakdown, merge_estimates(chunks, reports)], parser):
+        pass
+    return parser.close()
@@ -0,0 +1,60 @@
+# Reusable template of the planning, estimation and allocation crew.
+#
+# l1.py walks through building the crew step by step for one project. This
+# module builds the same crew on demand, without any notebook dependency, so
+# many projects can be planned from one process: every call returns a new crew
+# with its own agents and tasks, because a crew and its agents keep per-run
+# state and must not be shared between concurrent runs.
+
+from typing import Any, Dict, Mapping, Optional
+
+from crewai import Agent, Crew, Task
+
+from config_loader import CrewConfig, load_crew_config
+from models import ProjectPlan
+
+PLANNING_AGENTS = ("project_planning_agent", "estimation_agent", "resource_allocation_agent")
+PLANNING_TASKS = (
+    ("task_breakdown", "project_planning_agent"),
+    ("time_resource_estimation", "estimation_agent"),
+    ("resource_allocation", "resource_allocation_agent"),
+)
+
+
+def build_planning_crew(crew_config: Optional[CrewConfig] = None, verbose: bool = False) -> Crew:
+    """Builds a new planning crew whose last task returns a ProjectPlan."""
+    crew_config = crew_config or load_crew_config('config')
+    agents_config, tasks_config = crew_config.agents, crew_config.tasks
+    agents: Dict[str, Agent] = {
+        name: Agent(config=agents_config[name], verbose=verbose) for name in PLANNING_AGENTS
+    }
+    tasks = [
+        Task(config=tasks_config[name], agent=agents[agent_name])
+        for name, agent_name in PLANNING_TASKS
+    ]
+    tasks[-1].output_pydantic = ProjectPlan  # This is the structured output we want
+    return Crew(agents=list(agents.values()), tasks=tasks, verbose=verbose)
+
+
+def check_planning_inputs(inputs: Mapping[str, Any], crew_config: Optional[CrewConfig] = None) -> None:
+    """Raises ConfigError when `inputs` miss a placeholder of the planning agents or tasks."""
+    crew_config = crew_config or load_crew_config('config')
+    crew_config.check_inputs(inputs, tasks=[name for name, _ in PLANNING_TASKS])
+
+
+def plan_project(inputs: Mapping[str, Any], crew_config: Optional[CrewConfig] = None,
+                 metrics: Optional[Any] = None, verbose: bool = False) -> ProjectPlan:
+    """
+    Runs a new planning crew for one project and returns its ProjectPlan. When a
+    CrewMetrics is given, the crew is registered with it (install it once for
+    the whole batch).
+    """
+    crew_config = crew_config or load_crew_config('config')
+    check_planning_inputs(inputs, crew_config)
+    crew = build_planning_crew(crew_config, verbose)
+    if metrics is not None:
+        metrics.watch(crew, crew_config)
+    result = crew.kickoff(inputs=dict(inputs))
+    if result.pydantic is None:
+        raise ValueError("The crew did not return a valid ProjectPlan.")
+    return result.pydantic
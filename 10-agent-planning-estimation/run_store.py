@@ -0,0 +1,303 @@
+# Append-only columnar history of the planning crew's runs.
+#
+# Every run adds rows to four Parquet datasets under one root directory:
+#   runs        one row per run: totals of tokens, cost and the schedule
+#   usage       one row per agent, task and model (or tool), from CrewMetrics
+#   tasks       one row per estimated task, with its scheduled times
+#   milestones  one row per milestone
+# Each dataset is hive-partitioned by date and project (the project_type input),
+# so a query for a date range or a project only opens those directories, and
+# only the columns it needs. Rows are buffered and written in batches; files
+# are never modified, each flush adds new ones. compact() merges the small
+# files of a partition once it is no longer written to.
+
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+PARTITIONING = ds.partitioning(pa.schema([("date", pa.string()), ("project", pa.string())]), flavor="hive")
+COMMON = [("run_id", pa.string()), ("date", pa.string()), ("project", pa.string())]
+
+SCHEMAS = {
+    "runs": pa.schema(COMMON + [
+        ("timestamp", pa.timestamp("ms", tz="UTC")),
+        ("industry", pa.string()),
+        ("llm_calls", pa.int64()),
+        ("prompt_tokens", pa.int64()),
+        ("cached_tokens", pa.int64()),
+        ("completion_tokens", pa.int64()),
+        ("cost_usd", pa.float64()),
+        ("task_count", pa.int64()),
+        ("estimated_hours", pa.float64()),
+        ("duration_hours", pa.float64()),
+        ("leveled_duration_hours", pa.float64()),
+    ]),
+    "usage": pa.schema(COMMON + [
+        ("kind", pa.string()),
+        ("agent", pa.string()),
+        ("task", pa.string()),
+        ("model", pa.string()),
+        ("tool", pa.string()),
+        ("calls", pa.int64()),
+        ("errors", pa.int64()),
+        ("retries", pa.int64()),
+        ("prompt_tokens", pa.int64()),
+        ("cached_tokens", pa.int64()),
+        ("completion_tokens", pa.int64()),
+        ("cost_usd", pa.float64()),
+        ("latency_seconds", pa.float64()),
+    ]),
+    "tasks": pa.schema(COMMON + [
+        ("task_name", pa.string()),
+        ("task_key", pa.string()),
+        ("estimated_time_hours", pa.float64()),
+        ("required_resources", pa.list_(pa.string())),
+        ("dependency_count", pa.int64()),
+        ("assignee", pa.string()),
+        ("start_hours", pa.float64()),
+        ("finish_hours", pa.float64()),
+        ("slack_hours", pa.float64()),
+        ("critical", pa.bool_()),
+        # Estimate reused from the history rather than estimated in this run.
+        ("reused", pa.bool_()),
+    ]),
+    "milestones": pa.schema(COMMON + [
+        ("milestone_name", pa.string()),
+        ("task_count", pa.int64()),
+        ("finish_hours", pa.float64()),
+    ]),
+}
+PERIODS = {"year": 4, "month": 7, "day": 10}
+
+
+def task_key(name: str) -> str:
+    """Normalizes a task name so the same task can be followed across runs."""
+    return re.sub(r"\s+", " ", name).strip().lower()
+
+
+class RunStore:
+    """
+    Writes and queries the run history under `root`.
+
+    Args:
+        root: Directory of the datasets; created on the first flush.
+        batch_rows: Buffered rows (over all datasets) that trigger a flush.
+
+    with RunStore('run_history') as store:
+        store.record_run(inputs, metrics, result.pydantic, schedule)
+    """
+
+    def __init__(self, root: Union[str, Path] = "run_history", batch_rows: int = 100_000):
+        self.root = Path(root)
+        self.batch_rows = batch_rows
+        self._buffers: Dict[str, Dict[str, List[Any]]] = {}
+        self._buffered = 0
+
+    # Writing
+
+    def append(self, table: str, rows: Mapping[str, Sequence[Any]]) -> None:
+        """Buffers column-oriented rows for a dataset; columns it leaves out are null."""
+        schema = SCHEMAS[table]
+        count = len(next(iter(rows.values()))) if rows else 0
+        buffer = self._buffers.setdefault(table, {name: [] for name in schema.names})
+        for name in schema.names:
+            values = rows.get(name)
+            buffer[name].extend(values if values is not None else [None] * count)
+        self._buffered += count
+        if self._buffered >= self.batch_rows:
+            self.flush()
+
+    def record_run(self, inputs: Mapping[str, Any], metrics: Optional[Any] = None, plan: Optional[Any] = None,
+                   schedule: Optional[Any] = None, run_id: Optional[str] = None,
+                   timestamp: Optional[float] = None, reused: Iterable[str] = ()) -> str:
+        """
+        Buffers the rows of one crew run: the kickoff inputs, a CrewMetrics, the
+        ProjectPlan and the Schedule computed from it (each optional). `reused`
+        names the plan's tasks whose estimate came from the history. Returns the run id.
+        """
+        run_id = run_id or getattr(metrics, "run_id", None) or uuid.uuid4().hex
+        timestamp = timestamp or getattr(metrics, "started_at", None) or time.time()
+        moment = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+        common = {"run_id": run_id, "date": moment.strftime("%Y-%m-%d"), "project": str(inputs.get("project_type", ""))}
+
+        usage = metrics.records() if metrics is not None else []
+        llm = [r for r in usage if r["kind"] == "llm"]
+        tasks = list(plan.tasks) if plan is not None else []
+        self.append("runs", {key: [value] for key, value in dict(
+            common,
+            timestamp=moment,
+            industry=inputs.get("industry"),
+            llm_calls=sum(r["calls"] for r in llm),
+            prompt_tokens=sum(r["prompt_tokens"] for r in llm),
+            cached_tokens=sum(r["cached_tokens"] for r in llm),
+            completion_tokens=sum(r["completion_tokens"] for r in llm),
+            cost_usd=sum(r["cost_usd"] for r in llm),
+            task_count=len(tasks),
+            estimated_hours=sum(task.estimated_time_hours for task in tasks),
+            duration_hours=getattr(schedule, "duration_hours", None),
+            leveled_duration_hours=getattr(schedule, "leveled_duration_hours", None),
+        ).items()})
+
+        if usage:
+            columns = {name: [r.get(name) for r in usage] for name in SCHEMAS["usage"].names if name not in common}
+            self.append("usage", dict(columns, **{key: [value] * len(usage) for key, value in common.items()}))
+
+        if tasks:
+            reused = set(reused)
+            scheduled = {task.name: task for task in schedule.tasks} if schedule is not None else {}
+            rows = [scheduled.get(task.task_name) for task in tasks]
+            self.append("tasks", dict(
+                {key: [value] * len(tasks) for key, value in common.items()},
+                task_name=[task.task_name for task in tasks],
+                task_key=[task_key(task.task_name) for task in tasks],
+                estimated_time_hours=[task.estimated_time_hours for task in tasks],
+                required_resources=[list(task.required_resources) for task in tasks],
+                dependency_count=[len(getattr(task, "dependencies", None) or []) for task in tasks],
+                assignee=[row.assignee if row else None for row in rows],
+                start_hours=[row.start if row else None for row in rows],
+                finish_hours=[row.finish if row else None for row in rows],
+                slack_hours=[row.slack if row else None for row in rows],
+                critical=[row.critical if row else None for row in rows],
+                reused=[task.task_name in reused for task in tasks],
+            ))
+
+        milestones = list(plan.milestones) if plan is not None else []
+        if milestones:
+            finish = getattr(schedule, "milestones", {}) or {}
+            self.append("milestones", dict(
+                {key: [value] * len(milestones) for key, value in common.items()},
+                milestone_name=[m.milestone_name for m in milestones],
+                task_count=[len(m.tasks) for m in milestones],
+                finish_hours=[finish.get(m.milestone_name) for m in milestones],
+            ))
+        return run_id
+
+    def flush(self) -> None:
+        """Writes the buffered rows as new Parquet files, one per dataset and partition."""
+        for table, buffer in self._buffers.items():
+            if not buffer["run_id"]:
+                continue
+            ds.write_dataset(
+                pa.Table.from_pydict(buffer, schema=SCHEMAS[table]),
+                self.root / table,
+                format="parquet",
+                partitioning=PARTITIONING,
+                # A unique name per flush: existing files are never touched.
+                basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+        self._buffers.clear()
+        self._buffered = 0
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "RunStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def compact(self, table: str, min_files: int = 2) -> int:
+        """
+        Rewrites every partition of `table` that has at least `min_files` files as a
+        single file. Run it when no run writes to those partitions (e.g. nightly for
+        past dates). Returns the number of partitions compacted.
+        """
+        compacted = 0
+        for directory in sorted({path.parent for path in (self.root / table).glob("date=*/project=*/*.parquet")}):
+            files = sorted(directory.glob("*.parquet"))
+            if len(files) < min_files:
+                continue
+            merged = pa.concat_tables(pq.ParquetFile(path).read() for path in files)
+            target = directory / f"part-{uuid.uuid4().hex}-compacted.tmp"
+            pq.write_table(merged, target)
+            target.rename(target.with_suffix(".parquet"))
+            for path in files:
+                path.unlink()
+            compacted += 1
+        return compacted
+
+    # Querying
+
+    def dataset(self, table: str) -> Optional[ds.Dataset]:
+        directory = self.root / table
+        if not directory.exists():
+            return None
+        return ds.dataset(directory, schema=SCHEMAS[table], format="parquet", partitioning=PARTITIONING)
+
+    def scan(self, table: str, columns: Optional[Iterable[str]] = None, start: Optional[str] = None,
+             end: Optional[str] = None, projects: Optional[Iterable[str]] = None,
+             filter: Optional[pc.Expression] = None) -> pa.Table:
+        """
+        Reads the given columns of a dataset; `start` and `end` are inclusive
+        YYYY-MM-DD dates. Date and project filters prune whole partitions.
+        """
+        columns = list(columns) if columns is not None else None
+        dataset = self.dataset(table)
+        if dataset is None:
+            schema = SCHEMAS[table]
+            return schema.empty_table().select(columns) if columns else schema.empty_table()
+        expression = filter
+        for condition in (
+            pc.field("date") >= start if start else None,
+            pc.field("date") <= end if end else None,
+            pc.field("project").isin(pa.array(list(projects), pa.string())) if projects is not None else None,
+        ):
+            if condition is not None:
+                expression = condition if expression is None else expression & condition
+        return dataset.to_table(columns=columns, filter=expression)
+
+    def cost_by(self, keys: Sequence[str] = ("project",), start: Optional[str] = None, end: Optional[str] = None,
+                projects: Optional[Iterable[str]] = None) -> pa.Table:
+        """
+        Cost and tokens grouped by any usage columns, e.g. ("project",) for the cost per
+        project type, or ("project", "agent", "task") to find the expensive steps.
+        """
+        keys = list(keys)
+        table = self.scan("usage", keys + ["run_id", "cost_usd", "prompt_tokens", "completion_tokens", "calls"],
+                          start, end, projects, filter=pc.field("kind") == "llm")
+        result = table.group_by(keys).aggregate([
+            ("run_id", "count_distinct"),
+            ("cost_usd", "sum"),
+            ("prompt_tokens", "sum"),
+            ("completion_tokens", "sum"),
+            ("calls", "sum"),
+        ])
+        result = result.rename_columns([{"run_id_count_distinct": "runs"}.get(n, n) for n in result.column_names])
+        cost_per_run = pc.divide(result["cost_usd_sum"], pc.cast(result["runs"], pa.float64()))
+        return result.append_column("cost_usd_per_run", cost_per_run).sort_by([(key, "ascending") for key in keys])
+
+    def estimate_drift(self, period: str = "month", start: Optional[str] = None, end: Optional[str] = None,
+                       projects: Optional[Iterable[str]] = None, min_samples: int = 1) -> pa.Table:
+        """
+        How the estimate of each task (by normalized name and project) moves over
+        time: the mean estimate per period and its change relative to the first
+        period in which the task appears.
+        """
+        if period not in PERIODS:
+            raise ValueError(f"period must be one of {', '.join(PERIODS)}")
+        table = self.scan("tasks", ["date", "project", "task_key", "estimated_time_hours"], start, end, projects)
+        table = table.append_column("period", pc.utf8_slice_codeunits(table["date"], 0, PERIODS[period]))
+        grouped = table.group_by(["project", "task_key", "period"]).aggregate([
+            ("estimated_time_hours", "mean"),
+            ("estimated_time_hours", "count"),
+        ]).sort_by([("project", "ascending"), ("task_key", "ascending"), ("period", "ascending")])
+        grouped = grouped.filter(pc.field("estimated_time_hours_count") >= min_samples)
+
+        # The grouped table has one row per task and period, so a Python pass is cheap.
+        baseline: Dict[tuple, float] = {}
+        drift = []
+        for project, key, mean in zip(grouped["project"].to_pylist(), grouped["task_key"].to_pylist(),
+                                      grouped["estimated_time_hours_mean"].to_pylist()):
+            first = baseline.setdefault((project, key), mean)
+            drift.append(mean / first - 1.0 if first else None)
+        return grouped.append_column("drift", pa.array(drift, pa.float64()))
@@ -0,0 +1,209 @@
+# Streaming structured output of the planning crew.
+#
+# With output_pydantic, CrewAI only returns a ProjectPlan once the model has
+# written the whole JSON document and pydantic has validated it at once. Here
+# the structuring step (the resource_allocation task) is sent to the model with
+# stream=True, and PlanStreamParser scans the JSON text as it arrives: every
+# object of the "tasks" and "milestones" arrays is validated as a TaskEstimate
+# or Milestone as soon as its closing brace is read, so rendering, scheduling
+# or storage can start while the model is still writing. Only the text of the
+# item being read is kept, never the whole document.
+#
+# The messages use the same "You are {role}." and "Current Task:" prompts as
+# CrewAI, so CrewMetrics attributes the streamed call to its agent and task.
+
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from pydantic import ValidationError
+
+from models import Milestone, ProjectPlan, TaskEstimate
+
+PlanItem = Union[TaskEstimate, Milestone]
+ITEM_MODELS = {"tasks": TaskEstimate, "milestones": Milestone}
+# The next character that changes the parser state, outside and inside a string.
+STRUCTURE = re.compile(r'[{}\[\]"]')
+STRING_END = re.compile(r'["\\]')
+
+
+class PlanStreamError(ValueError):
+    """The streamed plan is not valid JSON or an item does not validate."""
+
+
+class PlanStreamParser:
+    """
+    Incremental parser of a streamed ProjectPlan JSON document.
+
+    parser = PlanStreamParser()
+    for chunk in chunks:
+        for item in parser.feed(chunk):
+            ...
+    plan = parser.close()
+
+    Any text before the first "{" (a code fence or a sentence) is skipped. With
+    keep_items=False the items are only returned by feed, and close returns None.
+    """
+
+    def __init__(self, keep_items: bool = True):
+        self.keep_items = keep_items
+        self.tasks: List[TaskEstimate] = []
+        self.milestones: List[Milestone] = []
+        self.counts = {name: 0 for name in ITEM_MODELS}
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._finished = False
+        # Open containers; the document is depth 1, its arrays 2, their items 3.
+        self._depth = 0
+        self._in_string = False
+        self._string_start = -1
+        self._item_start = -1
+        self._key: Optional[str] = None
+        self._array: Optional[str] = None
+
+    def feed(self, text: str) -> List[PlanItem]:
+        """Adds the next chunk of the document; returns the items it completed."""
+        if self._finished:
+            return []
+        self._buffer += text
+        if not self._started:
+            start = self._buffer.find("{")
+            if start < 0:
+                self._buffer = ""
+                return []
+            self._buffer, self._pos, self._started = self._buffer[start:], 0, True
+
+        completed: List[PlanItem] = []
+        buffer = self._buffer
+        pos = self._pos
+        while not self._finished:
+            if self._in_string:
+                match = STRING_END.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.group() == "\\":
+                    if match.end() >= len(buffer):
+                        # The escaped character is in the next chunk.
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                pos = match.end()
+                self._in_string = False
+                if self._depth == 1:
+                    # The last string read at the top level is the key of the next array.
+                    self._key = json.loads(buffer[self._string_start:pos])
+                continue
+
+            match = STRUCTURE.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            char, pos = match.group(), match.end()
+            if char == '"':
+                self._in_string = True
+                self._string_start = match.start()
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 2 and char == "[":
+                    self._array = self._key if self._key in ITEM_MODELS else None
+                elif self._depth == 3 and char == "{" and self._array is not None:
+                    self._item_start = match.start()
+            else:
+                self._depth -= 1
+                if self._depth == 2 and self._item_start >= 0:
+                    completed.append(self._item(buffer[self._item_start:pos]))
+                    self._item_start = -1
+                elif self._depth == 1:
+                    self._array = None
+                elif self._depth == 0:
+                    self._finished = True
+                elif self._depth < 0:
+                    raise PlanStreamError(f"Unbalanced '{char}' in the streamed plan")
+
+        # Drop the text that no open string or item needs any more.
+        keep = min(i for i in (pos, self._item_start, self._string_start if self._in_string else -1) if i >= 0)
+        self._buffer = buffer[keep:]
+        self._pos = pos - keep
+        if self._item_start >= 0:
+            self._item_start -= keep
+        if self._in_string:
+            self._string_start -= keep
+        return completed
+
+    def _item(self, text: str) -> PlanItem:
+        model = ITEM_MODELS[self._array]
+        try:
+            item = model.model_validate_json(text)
+        except ValidationError as e:
+            raise PlanStreamError(f"Invalid item {self.counts[self._array]} of '{self._array}': {e}") from None
+        self.counts[self._array] += 1
+        if self.keep_items:
+            getattr(self, self._array).append(item)
+        return item
+
+    def close(self) -> Optional[ProjectPlan]:
+        """Checks that the whole document was read; returns the plan when the items were kept."""
+        if not self._finished:
+            raise PlanStreamError("The streamed plan ended before its closing brace")
+        if not self.keep_items:
+            return None
+        return ProjectPlan(tasks=self.tasks, milestones=self.milestones)
+
+
+def iter_plan_items(chunks: Iterable[str], parser: Optional[PlanStreamParser] = None) -> Iterator[PlanItem]:
+    """Yields the TaskEstimate and Milestone items of a streamed plan as they complete."""
+    parser = parser or PlanStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    parser.close()
+
+
+def plan_messages(task: Any, context: Sequence[str]) -> List[Dict[str, str]]:
+    """The prompt of a structuring task, asking for a bare ProjectPlan JSON object."""
+    agent = task.agent
+    schema = json.dumps(ProjectPlan.model_json_schema())
+    user = (
+        f"\nCurrent Task: {task.description}\n"
+        f"\nThis is the expected criteria for your final answer: {task.expected_output}\n"
+        f"\nAnswer with a single JSON object that matches this JSON schema, and nothing else:\n{schema}"
+    )
+    if context:
+        user += "\n\nThis is the context you're working with:\n" + "\n\n----------\n\n".join(context)
+    return [
+        {"role": "system", "content": f"You are {agent.role}. {agent.backstory}\nYour personal goal is: {agent.goal}"},
+        {"role": "user", "content": user},
+    ]
+
+
+def stream_completion(messages: List[Dict[str, str]], model: Optional[str] = None, **params: Any) -> Iterator[str]:
+    """Yields the text of a LiteLLM chat completion as it is generated."""
+    import litellm
+
+    response = litellm.completion(
+        model=model or os.environ.get("OPENAI_MODEL_NAME", "gpt-4o-mini"),
+        messages=messages,
+        stream=True,
+        # The usage is sent in the last chunk, for the success callbacks.
+        stream_options={"include_usage": True},
+        **params,
+    )
+    for chunk in response:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def stream_plan(task: Any, context: Sequence[str], parser: Optional[PlanStreamParser] = None,
+                model: Optional[str] = None, **params: Any) -> Iterator[PlanItem]:
+    """
+    Runs a structuring task (resource_allocation) with a streamed completion and
+    yields its validated TaskEstimate and Milestone items as they are written.
+    `context` holds the outputs of the previous tasks; the task's inputs must
+    already be interpolated. Pass a parser to get the whole plan from
+    parser.close() afterwards.
+    """
+    model = model or getattr(task.agent.llm, "model", None)
+    yield from iter_plan_items(stream_completion(plan_messages(task, context), model, **params), parser)
@@ -0,0 +1 @@
+"""Test package for the Project Planning and Estimation crew."""
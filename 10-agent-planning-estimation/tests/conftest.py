@@ -0,0 +1,27 @@
+"""Pytest configuration and fixtures."""
+
+import pytest
+
+from models import Milestone, TaskEstimate
+
+
+def make_task(name, hours, dependencies=(), resources=("Engineer",)):
+    return TaskEstimate(task_name=name, estimated_time_hours=hours, required_resources=list(resources),
+                        dependencies=list(dependencies))
+
+
+@pytest.fixture
+def plan_tasks():
+    """A diamond: design, then backend and frontend in parallel, then release."""
+    return [
+        make_task("Design", 8, resources=["Architect"]),
+        make_task("Backend", 16, ["Design"], ["Backend Engineer"]),
+        make_task("Frontend", 8, ["Design"], ["Frontend Engineer"]),
+        make_task("Release", 4, ["Backend", "Frontend"], ["DevOps Engineer"]),
+    ]
+
+
+@pytest.fixture
+def milestones():
+    return [Milestone(milestone_name="MVP", tasks=["Design", "Backend", "Frontend"]),
+            Milestone(milestone_name="Launch", tasks=["Release"])]
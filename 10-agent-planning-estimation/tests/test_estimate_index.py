@@ -0,0 +1,92 @@
+"""Tests for the index of past task estimates."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("crewai_tools")
+pytest.importorskip("pyarrow")
+
+from estimate_index import (EstimateIndex, apply_reused_estimates, extract_task_names, remove_tasks,
+                            seed_estimation)
+from models import ProjectPlan
+from run_store import RunStore
+from tests.conftest import make_task
+
+BREAKDOWN = """## Tasks
+1. **Design the database schema** - define the tables
+   - Description: tables for the orders
+   - Dependencies: none
+2. Build the order API
+   - Description: REST endpoints
+     - Write the order handlers
+3. Write unit tests
+   - Deliverable: tests
+### Deployment
+- Set up CI
+- Build the order API
+"""
+
+
+def history(times=3):
+    index = EstimateIndex()
+    for _ in range(times):
+        index.add(["Design the database schema", "Build the order API"], [10, 20])
+    return index
+
+# --- Breakdown parsing ---
+
+def test_extract_task_names():
+    assert extract_task_names(BREAKDOWN) == [
+        "Tasks", "Design the database schema", "Build the order API", "Write the order handlers",
+        "Write unit tests", "Deployment", "Set up CI",
+    ]
+
+def test_extract_task_names_skips_field_items():
+    names = extract_task_names(BREAKDOWN)
+    assert not any(name.lower().startswith(("description", "dependencies", "deliverable")) for name in names)
+
+def test_remove_tasks_drops_the_task_and_its_lines():
+    text = remove_tasks(BREAKDOWN, ["build the order API"])
+    assert "Build the order API" not in text and "REST endpoints" not in text
+    assert "Write the order handlers" not in text
+    assert "3. Write unit tests" in text and "- Set up CI" in text
+
+def test_remove_tasks_keeps_the_text_without_a_match():
+    assert remove_tasks(BREAKDOWN, ["Unknown task"]) == BREAKDOWN.rstrip("\n")
+
+# --- Reused estimates ---
+
+def test_seed_estimation_hides_reused_tasks_until_the_estimation_is_done():
+    breakdown_task = SimpleNamespace(callback=None)
+    estimation_task = SimpleNamespace(callback=None, description="Estimate.")
+    reused = seed_estimation(history(), breakdown_task, estimation_task)
+    output = SimpleNamespace(raw=BREAKDOWN)
+    breakdown_task.callback(output)
+    assert reused == {"Design the database schema": 10.0, "Build the order API": 20.0}
+    assert "Design the database schema" not in output.raw
+    estimation_task.callback(SimpleNamespace(raw="estimates"))
+    assert output.raw == BREAKDOWN
+
+def test_apply_reused_estimates_sets_and_adds_tasks():
+    plan = ProjectPlan(tasks=[make_task("design the Database Schema", 3), make_task("Write unit tests", 5)],
+                       milestones=[])
+    applied = apply_reused_estimates(plan, {"Design the database schema": 10.0, "Build the order API": 20.0})
+    assert applied == ["design the Database Schema", "Build the order API"]
+    assert [(task.task_name, task.estimated_time_hours) for task in plan.tasks] == [
+        ("design the Database Schema", 10.0), ("Write unit tests", 5), ("Build the order API", 20.0)]
+
+def test_reused_estimates_are_not_indexed_again(tmp_path):
+    with RunStore(tmp_path / "history") as store:
+        for day, hours in (("2024-01-10", 8), ("2024-01-20", 12)):
+            plan = ProjectPlan(tasks=[make_task("Design the database schema", hours)], milestones=[])
+            store.record_run({"project_type": "Website"}, plan=plan,
+                             timestamp=datetime.fromisoformat(day).replace(tzinfo=timezone.utc).timestamp())
+        plan = ProjectPlan(tasks=[make_task("Build the order API", 20), make_task("Design the database schema", 10)],
+                           milestones=[])
+        reused = apply_reused_estimates(plan, {"Design the database schema": 10.0})
+        store.record_run({"project_type": "Website"}, plan=plan, reused=reused)
+    assert store.scan("tasks", ["reused"])["reused"].to_pylist().count(True) == 1
+    [match] = EstimateIndex.from_run_store(store).search(["Design the database schema"], k=1)[0]
+    assert match.samples == 2 and match.mean_hours == pytest.approx(10.0)
@@ -0,0 +1,56 @@
+"""Tests for the split of the task breakdown into estimation chunks."""
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from parallel_estimation import _split_section, split_breakdown
+
+
+def area(heading, count, prefix="Task"):
+    items = "\n".join(f"{i}. {prefix} {i} of {heading}\n   - Description: work" for i in range(1, count + 1))
+    return f"{heading}\n{items}"
+
+# --- Areas ---
+
+def test_markdown_and_bold_headings_start_areas():
+    text = f"{area('## Architecture', 2)}\n\n{area('**2. Testing:**', 2)}"
+    [chunk] = split_breakdown(text, max_tasks=12)
+    assert chunk.area == "Architecture / Testing" and chunk.tasks == 4
+
+def test_areas_that_do_not_fit_together_are_separate_chunks():
+    text = f"{area('## Architecture', 3)}\n\n{area('**Testing:**', 3)}"
+    chunks = split_breakdown(text, max_tasks=4)
+    assert [(chunk.area, chunk.tasks) for chunk in chunks] == [("Architecture", 3), ("Testing", 3)]
+    assert chunks[1].text.startswith("**Testing:**")
+
+def test_small_areas_are_packed_in_order():
+    text = "\n\n".join(area(f"## Area {name}", 2) for name in "ABCD")
+    chunks = split_breakdown(text, max_tasks=5)
+    assert [(chunk.area, chunk.tasks) for chunk in chunks] == [("Area A / Area B", 4), ("Area C / Area D", 4)]
+
+def test_introduction_without_tasks_does_not_name_the_chunk():
+    text = f"Here is the breakdown of the project.\n\n{area('## Development', 3)}"
+    [chunk] = split_breakdown(text, max_tasks=12)
+    assert chunk.area == "Development" and chunk.tasks == 3
+    assert chunk.text.startswith("Here is the breakdown")
+
+# --- Oversized areas ---
+
+def test_oversized_area_is_split_evenly():
+    text = area("## Development", 25)
+    chunks = split_breakdown(text, max_tasks=12)
+    assert [chunk.tasks for chunk in chunks] == [9, 8, 8]
+    assert all(chunk.area == "Development" and chunk.text.startswith("## Development") for chunk in chunks)
+    assert "Task 10 of" in chunks[1].text and "Task 9 of" not in chunks[1].text
+
+def test_split_keeps_sub_items_with_their_task():
+    text = area("## Development", 4)
+    parts = _split_section(split_breakdown(text, max_tasks=12)[0], max_tasks=2)
+    assert [part.tasks for part in parts] == [2, 2]
+    assert parts[1].text.endswith("4. Task 4 of ## Development\n   - Description: work")
+
+def test_section_without_list_items_is_not_split():
+    [chunk] = split_breakdown("## Notes\nSome text\nMore text", max_tasks=1)
+    assert chunk.area == "Notes"
+    assert _split_section(chunk, max_tasks=1) == [chunk]
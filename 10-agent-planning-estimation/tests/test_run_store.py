@@ -0,0 +1,121 @@
+"""Tests for the partitioned Parquet run history."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from models import ProjectPlan
+from run_store import RunStore, task_key
+from scheduler import schedule_plan
+from tests.conftest import make_task
+
+
+def timestamp(day):
+    return datetime.fromisoformat(day).replace(tzinfo=timezone.utc).timestamp()
+
+
+def usage(prompt_tokens, cost_usd):
+    record = dict(kind="llm", agent="estimation_agent", task="time_resource_estimation", model="gpt-4o-mini",
+                  calls=2, errors=0, retries=0, prompt_tokens=prompt_tokens, cached_tokens=0,
+                  completion_tokens=100, cost_usd=cost_usd, latency_seconds=1.5)
+    return SimpleNamespace(records=lambda: [record], run_id=None, started_at=None)
+
+
+def record(store, day, project, hours, cost_usd=0.01):
+    plan = ProjectPlan(tasks=[make_task("Design  API", hours), make_task("Build", 10, ["Design  API"])],
+                       milestones=[])
+    store.record_run({"project_type": project}, usage(1000, cost_usd), plan,
+                     schedule_plan(plan, "- Ana (Engineer)"), timestamp=timestamp(day))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RunStore(tmp_path / "history")
+    record(store, "2024-01-10", "Website", 8)
+    record(store, "2024-01-20", "Website", 12)
+    record(store, "2024-02-15", "Website", 16)
+    record(store, "2024-02-15", "Mobile App", 4, cost_usd=0.05)
+    store.flush()
+    return store
+
+# --- Writing ---
+
+def test_rows_are_partitioned_by_date_and_project(store):
+    directories = {path.parent.relative_to(store.root / "tasks").as_posix()
+                   for path in (store.root / "tasks").rglob("*.parquet")}
+    assert directories == {"date=2024-01-10/project=Website", "date=2024-01-20/project=Website",
+                           "date=2024-02-15/project=Website", "date=2024-02-15/project=Mobile%20App"}
+    runs = store.scan("runs", ["task_count", "estimated_hours", "duration_hours", "prompt_tokens"])
+    assert runs.num_rows == 4
+    assert set(runs["task_count"].to_pylist()) == {2}
+    assert sorted(runs["duration_hours"].to_pylist()) == [14, 18, 22, 26]
+
+def test_tasks_keep_their_schedule_and_key(store):
+    tasks = store.scan("tasks", ["task_name", "task_key", "critical", "start_hours"], projects=["Mobile App"])
+    rows = sorted(zip(*(tasks[name].to_pylist() for name in tasks.column_names)))
+    assert rows == [("Build", "build", True, 4.0), ("Design  API", "design api", True, 0.0)]
+    assert task_key("  Design \n API ") == "design api"
+
+def test_rows_are_buffered_until_flush(tmp_path):
+    store = RunStore(tmp_path / "history")
+    record(store, "2024-01-10", "Website", 8)
+    assert store.scan("runs").num_rows == 0
+    store.close()
+    assert store.scan("runs").num_rows == 1
+
+def test_batch_rows_trigger_a_flush(tmp_path):
+    store = RunStore(tmp_path / "history", batch_rows=3)
+    record(store, "2024-01-10", "Website", 8)
+    assert store.scan("tasks").num_rows == 2
+
+# --- Querying ---
+
+def test_date_and_project_filters_prune_partitions(store):
+    january = store.scan("runs", ["date"], start="2024-01-01", end="2024-01-31")
+    assert sorted(january["date"].to_pylist()) == ["2024-01-10", "2024-01-20"]
+    assert store.scan("runs", ["project"], projects=["Mobile App"]).num_rows == 1
+    assert store.scan("runs", ["project"], projects=[]).num_rows == 0
+
+def test_pruned_partitions_are_not_read(store):
+    for path in (store.root / "runs" / "date=2024-01-10").rglob("*.parquet"):
+        path.write_bytes(b"not parquet")
+    assert store.scan("runs", ["date"], start="2024-01-15").num_rows == 3
+    assert store.scan("runs", ["date"], projects=["Mobile App"]).num_rows == 1
+    with pytest.raises(pa.ArrowInvalid):
+        store.scan("runs", ["date"])
+
+def test_missing_dataset_scans_as_empty(tmp_path):
+    table = RunStore(tmp_path / "empty").scan("usage", ["cost_usd"])
+    assert table.num_rows == 0 and table.column_names == ["cost_usd"]
+
+def test_cost_by_project(store):
+    result = store.cost_by(["project"]).to_pylist()
+    assert [row["project"] for row in result] == ["Mobile App", "Website"]
+    assert result[1]["runs"] == 3
+    assert result[1]["cost_usd_sum"] == pytest.approx(0.03)
+    assert result[1]["cost_usd_per_run"] == pytest.approx(0.01)
+    assert result[0]["prompt_tokens_sum"] == 1000
+
+def test_estimate_drift_per_month(store):
+    drift = store.estimate_drift("month", projects=["Website"]).to_pylist()
+    design = [(row["period"], row["estimated_time_hours_mean"], row["drift"]) for row in drift
+              if row["task_key"] == "design api"]
+    assert design == [("2024-01", 10.0, 0.0), ("2024-02", 16.0, pytest.approx(0.6))]
+    build = [row["drift"] for row in drift if row["task_key"] == "build"]
+    assert build == [0.0, 0.0]
+
+def test_estimate_drift_rejects_unknown_period(store):
+    with pytest.raises(ValueError, match="period"):
+        store.estimate_drift("week")
+
+def test_compact_merges_the_files_of_a_partition(store):
+    record(store, "2024-02-15", "Website", 20)
+    store.flush()
+    partition = store.root / "tasks" / "date=2024-02-15" / "project=Website"
+    assert len(list(partition.glob("*.parquet"))) == 2
+    assert store.compact("tasks") == 1
+    assert len(list(partition.glob("*.parquet"))) == 1
+    assert store.scan("tasks", projects=["Website"], start="2024-02-15").num_rows == 4
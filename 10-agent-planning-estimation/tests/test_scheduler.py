@@ -0,0 +1,110 @@
+"""Tests for the critical path scheduling and resource leveling of a ProjectPlan."""
+
+from datetime import date
+
+import pytest
+
+from models import Milestone
+from scheduler import (ScheduleError, TeamMember, critical_path, level_resources, parse_team_members,
+                       schedule_tasks, working_date)
+from tests.conftest import make_task
+
+TEAM = [TeamMember("Ana", "Architect"), TeamMember("Ben", "Backend Engineer"),
+        TeamMember("Cleo", "Frontend Engineer"), TeamMember("Dan", "DevOps Engineer")]
+
+# --- Critical path ---
+
+def test_critical_path_times_and_slack(plan_tasks):
+    result = critical_path(plan_tasks)
+    tasks = {task.name: task for task in result.tasks}
+    assert result.duration_hours == 28
+    assert result.critical_path == ["Design", "Backend", "Release"]
+    assert (tasks["Backend"].earliest_start, tasks["Backend"].earliest_finish) == (8, 24)
+    assert (tasks["Frontend"].latest_start, tasks["Frontend"].latest_finish) == (16, 24)
+    assert tasks["Frontend"].slack == 8 and not tasks["Frontend"].critical
+    assert all(tasks[name].critical for name in result.critical_path)
+
+def test_critical_path_does_not_depend_on_task_order(plan_tasks):
+    result = critical_path(plan_tasks[::-1])
+    assert result.duration_hours == 28
+    assert result.critical_path == ["Design", "Backend", "Release"]
+
+def test_cycle_raises():
+    tasks = [make_task("A", 1, ["B"]), make_task("B", 1, ["A"]), make_task("C", 1)]
+    with pytest.raises(ScheduleError, match="cycle"):
+        critical_path(tasks)
+
+def test_unknown_dependency_is_a_warning_or_an_error():
+    tasks = [make_task("A", 2, ["Missing"]), make_task("B", 3, ["A"])]
+    result = critical_path(tasks)
+    assert result.duration_hours == 5
+    assert result.warnings == ["Ignored dependency of 'A' on 'Missing'."]
+    with pytest.raises(ScheduleError, match="invalid dependency"):
+        critical_path(tasks, strict=True)
+
+def test_duplicate_names_are_renamed():
+    result = critical_path([make_task("A", 1), make_task("A", 2)])
+    assert [task.name for task in result.tasks] == ["A", "A (2)"]
+    with pytest.raises(ScheduleError, match="Duplicate"):
+        critical_path([make_task("A", 1), make_task("A", 2)], strict=True)
+
+def test_negative_estimate_raises():
+    with pytest.raises(ScheduleError, match="negative"):
+        critical_path([make_task("A", -1)])
+
+def test_empty_plan():
+    result = schedule_tasks([], TEAM)
+    assert (result.duration_hours, result.leveled_duration_hours, result.critical_path) == (0.0, 0.0, [])
+
+# --- Resource leveling ---
+
+def test_leveling_assigns_matching_members(plan_tasks, milestones):
+    result = schedule_tasks(plan_tasks, TEAM, milestones)
+    assignees = {task.name: task.assignee for task in result.tasks}
+    assert assignees == {"Design": "Ana", "Backend": "Ben", "Frontend": "Cleo", "Release": "Dan"}
+    # Enough people: the leveled schedule is the critical path.
+    assert result.leveled_duration_hours == result.duration_hours == 28
+    assert result.milestones == {"MVP": 24, "Launch": 28}
+
+def test_leveling_serializes_tasks_of_one_member():
+    tasks = [make_task(name, 8, resources=["Engineer"]) for name in ("A", "B", "C")]
+    result = level_resources(critical_path(tasks), [TeamMember("Solo", "Engineer")])
+    assert result.duration_hours == 8
+    assert result.leveled_duration_hours == 24
+    assert sorted((task.start, task.finish) for task in result.tasks) == [(0, 8), (8, 16), (16, 24)]
+    assert result.workload() == {"Solo": 24}
+
+def test_leveling_starts_the_most_urgent_task_first():
+    # "Long" starts a chain, so it has no slack; "Short" can wait.
+    tasks = [make_task("Short", 2), make_task("Long", 4), make_task("After", 4, ["Long"])]
+    result = level_resources(critical_path(tasks), [TeamMember("Solo", "Engineer")])
+    starts = {task.name: task.start for task in result.tasks}
+    assert starts["Long"] == 0 and starts["After"] == 4
+
+def test_leveling_without_matching_member_uses_anyone():
+    result = schedule_tasks([make_task("Audit", 4, resources=["Lawyer"])], TEAM)
+    assert result.tasks[0].assignee in {member.name for member in TEAM}
+
+def test_milestone_with_unknown_task_warns(plan_tasks):
+    result = schedule_tasks(plan_tasks, TEAM, [Milestone(milestone_name="M", tasks=["Design", "Nope"])])
+    assert result.milestones == {"M": 8}
+    assert any("unknown tasks" in warning for warning in result.warnings)
+
+# --- Team members and dates ---
+
+def test_parse_team_members():
+    members = parse_team_members("\n- Alex Chen (Project Manager)\n- Maria Rodriguez\n\n")
+    assert members == [TeamMember("Alex Chen", "Project Manager"), TeamMember("Maria Rodriguez", "")]
+    assert members[0].matches("project manager") and not members[1].matches("QA Engineer")
+
+def test_working_date_skips_weekends():
+    friday = date(2024, 9, 6)
+    assert working_date(friday, 0) == friday
+    assert working_date(friday, 8) == date(2024, 9, 9)
+    assert working_date(date(2024, 9, 7), 0) == date(2024, 9, 9)
+    assert working_date(friday, 5 * 8) == date(2024, 9, 13)
+
+def test_rows_end_on_the_last_working_day(plan_tasks):
+    rows = {row["task_name"]: row for row in schedule_tasks(plan_tasks, TEAM).rows(start_date=date(2024, 9, 2))}
+    assert rows["Design"]["start_date"] == rows["Design"]["end_date"] == date(2024, 9, 2)
+    assert rows["Backend"]["end_date"] == date(2024, 9, 4)
@@ -0,0 +1,98 @@
+"""Tests for the incremental parser of streamed ProjectPlan documents."""
+
+import json
+import random
+
+import pytest
+
+from models import Milestone, TaskEstimate
+from streaming_plan import PlanStreamError, PlanStreamParser, iter_plan_items
+
+PLAN = {
+    "tasks": [
+        {"task_name": "Design the \"core\" API {v1}", "estimated_time_hours": 8,
+         "required_resources": ["Architect"], "dependencies": []},
+        {"task_name": "Build [backend] \\ services", "estimated_time_hours": 16.5,
+         "required_resources": ["Backend Engineer", "DevOps Engineer"],
+         "dependencies": ["Design the \"core\" API {v1}"]},
+    ],
+    "milestones": [{"milestone_name": "MVP", "tasks": ["Design the \"core\" API {v1}", "Build [backend] \\ services"]}],
+}
+DOCUMENT = json.dumps(PLAN, indent=2)
+# The closing brace of the first task, with the indentation of json.dumps.
+END_OF_FIRST = DOCUMENT.index("\n    }") + len("\n    }")
+
+
+def parse(chunks, **kwargs):
+    parser = PlanStreamParser(**kwargs)
+    items = [item for chunk in chunks for item in parser.feed(chunk)]
+    return items, parser.close()
+
+
+def expected_items():
+    return [TaskEstimate(**task) for task in PLAN["tasks"]] + [Milestone(**m) for m in PLAN["milestones"]]
+
+# --- Chunk boundaries ---
+
+def test_whole_document():
+    items, plan = parse([DOCUMENT])
+    assert items == expected_items()
+    assert plan.model_dump() == PLAN
+
+def test_one_character_per_chunk():
+    # Every boundary: inside strings, after an escape backslash, between braces.
+    items, plan = parse(list(DOCUMENT))
+    assert items == expected_items()
+    assert plan.model_dump() == PLAN
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_chunk_boundaries(seed):
+    rng = random.Random(seed)
+    cuts = sorted(rng.sample(range(1, len(DOCUMENT)), 15))
+    chunks = [DOCUMENT[start:end] for start, end in zip([0] + cuts, cuts + [len(DOCUMENT)])]
+    assert parse(chunks)[0] == expected_items()
+
+def test_items_are_returned_as_soon_as_they_close():
+    parser = PlanStreamParser()
+    assert parser.feed(DOCUMENT[:END_OF_FIRST - 1]) == []
+    assert [item.task_name for item in parser.feed(DOCUMENT[END_OF_FIRST - 1:END_OF_FIRST])] == [
+        'Design the "core" API {v1}']
+
+def test_buffer_only_keeps_the_open_item():
+    parser = PlanStreamParser()
+    start_of_second = DOCUMENT.index("{", END_OF_FIRST)
+    parser.feed(DOCUMENT[:start_of_second + 5])
+    assert parser._buffer == DOCUMENT[start_of_second:start_of_second + 5]
+
+# --- Surrounding text and other keys ---
+
+def test_text_before_the_document_and_after_it_is_ignored():
+    items, plan = parse(["Here is the plan:\n```json\n", DOCUMENT, "\n```\nDone."])
+    assert items == expected_items()
+
+def test_other_arrays_are_not_items():
+    document = json.dumps({"notes": [{"task_name": "not a task"}], **PLAN, "risks": [["a", {"b": 1}]]})
+    items, plan = parse([document])
+    assert items == expected_items()
+
+def test_keep_items_false_returns_no_plan():
+    items, plan = parse([DOCUMENT], keep_items=False)
+    assert len(items) == 3 and plan is None
+
+def test_iter_plan_items():
+    assert list(iter_plan_items(DOCUMENT[i:i + 7] for i in range(0, len(DOCUMENT), 7))) == expected_items()
+
+# --- Errors ---
+
+def test_invalid_item_raises():
+    document = json.dumps({"tasks": [{"task_name": "No estimate", "required_resources": []}], "milestones": []})
+    with pytest.raises(PlanStreamError, match="Invalid item 0 of 'tasks'"):
+        parse([document])
+
+def test_truncated_document_raises_on_close():
+    with pytest.raises(PlanStreamError, match="ended before"):
+        parse([DOCUMENT[:-10]])
+
+def test_no_document_raises_on_close():
+    with pytest.raises(PlanStreamError):
+        parse(["I could not produce a plan."])
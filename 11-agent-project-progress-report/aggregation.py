@@ -0,0 +1,212 @@
+# Deterministic pre-aggregation of Trello board data for the progress report.
+#
+# The raw cards of a board (with their comment actions, member avatars, limits
+# and board metadata) make prompts that grow with every card. aggregate_board
+# reduces them locally to what the report needs: card counts per list, overdue
+# cards (past `due`, not complete) and stale cards (no activity for
+# `stale_days`, from `dateLastActivity`), the label distribution, blockers
+# (cards with a blocking label or a comment that reports a blocker) and the
+# activity of every member. Only the top cards of every category are listed;
+# the rest is reachable through drill-down handles ("list:Doing", "overdue",
+# "member:Joao Moura", ...) that BoardDrillDownTool resolves against the
+# cached board, so the agent reads details only where it needs them.
+
+import re
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+STALE_DAYS = 14
+TOP_CARDS = 10
+DRILL_DOWN_LIMIT = 50
+# Lists whose cards are finished, so never overdue or stale.
+DONE_LIST = re.compile(r"\b(done|complete[d]?|closed|shipped|released|archive[d]?)\b", re.I)
+BLOCKER_LABEL = re.compile(r"\b(block(ed|er)?|on hold|waiting)\b", re.I)
+BLOCKER_COMMENT = re.compile(
+    r"\b(blocked|blocker|blocking|stuck|waiting (on|for)|depends on|can(no|')t (proceed|continue|start)"
+    r"|impediment|on hold)\b", re.I,
+)
+SNIPPET_LENGTH = 160
+DESCRIPTION_LIMIT = 500
+
+
+def compact_card(card: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields of a card the report uses, leaving out the empty ones."""
+    compact = {key: card[key] for key in ("id", "name", "idList", "idMembers", "due", "dueComplete",
+                                          "dateLastActivity", "closed")
+               if card.get(key) not in (None, "", [], False)}
+    if card.get("desc"):
+        compact["desc"] = card["desc"][:DESCRIPTION_LIMIT]
+    labels = [label.get("name") or label.get("color") for label in card.get("labels") or []]
+    if labels:
+        compact["labels"] = labels
+    badges = card.get("badges") or {}
+    if badges.get("comments"):
+        compact["comments"] = badges["comments"]
+    if badges.get("checkItems"):
+        compact["checklist"] = f"{badges.get('checkItemsChecked', 0)}/{badges['checkItems']}"
+    return compact
+
+
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _label_names(card: Dict[str, Any]) -> List[str]:
+    return [label.get("name") or label.get("color") or "unnamed" for label in card.get("labels") or []]
+
+
+def _comments(card: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [action for action in card.get("actions") or [] if action.get("type") == "commentCard"]
+
+
+def _member_name(action: Dict[str, Any], members: Dict[str, str]) -> str:
+    creator = action.get("memberCreator") or {}
+    member_id = action.get("idMemberCreator") or creator.get("id")
+    return creator.get("fullName") or members.get(member_id) or member_id or "unknown"
+
+
+@dataclass
+class BoardAggregate:
+    """The summary of a board and the card ids behind each drill-down handle."""
+    summary: Dict[str, Any]
+    handles: Dict[str, List[str]] = field(default_factory=dict)
+    cards: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+def aggregate_board(cards: Iterable[Dict[str, Any]], lists: Optional[Dict[str, str]] = None,
+                    members: Optional[Dict[str, str]] = None, now: Optional[datetime] = None,
+                    stale_days: int = STALE_DAYS, top: int = TOP_CARDS) -> BoardAggregate:
+    """
+    Aggregates raw board cards. `lists` and `members` map ids to names (ids are
+    shown when they are missing); `now` defaults to the current UTC time.
+    """
+    lists, members = dict(lists or {}), members or {}
+    now = now or datetime.now(timezone.utc)
+    aggregate = BoardAggregate(summary={})
+    handles: Dict[str, List[str]] = defaultdict(list)
+    per_list: Dict[str, Counter] = defaultdict(Counter)
+    labels: Counter = Counter()
+    activity: Dict[str, Counter] = defaultdict(Counter)
+    last_activity: Dict[str, str] = {}
+    overdue, stale, blockers = [], [], []
+
+    for card in cards:
+        card_id = card["id"]
+        for action in card.get("actions") or []:
+            # Actions carry the name of their list, for when the lists were not fetched.
+            known = (action.get("data") or {}).get("list") or {}
+            if known.get("name"):
+                lists.setdefault(known["id"], known["name"])
+        list_name = lists.get(card.get("idList"), card.get("idList") or "no list")
+        ref = {"id": card_id, "name": card.get("name", ""), "list": list_name}
+        aggregate.cards[card_id] = dict(card, list=list_name,
+                                        members=[members.get(m, m) for m in card.get("idMembers") or []])
+        per_list[list_name]["cards"] += 1
+        handles[f"list:{list_name}"].append(card_id)
+        done = bool(DONE_LIST.search(list_name))
+
+        due = parse_date(card.get("due"))
+        if due is not None and not done and not card.get("dueComplete") and due < now:
+            per_list[list_name]["overdue"] += 1
+            overdue.append(dict(ref, days_overdue=(now - due).days))
+        last = parse_date(card.get("dateLastActivity"))
+        if last is not None and not done and (now - last).days >= stale_days:
+            per_list[list_name]["stale"] += 1
+            stale.append(dict(ref, days_inactive=(now - last).days))
+
+        card_labels = _label_names(card)
+        labels.update(card_labels)
+        for label in card_labels:
+            handles[f"label:{label}"].append(card_id)
+
+        blocker = next((f"label {label}" for label in card_labels if BLOCKER_LABEL.search(label)), None)
+        for action in _comments(card):
+            name = _member_name(action, members)
+            activity[name]["comments"] += 1
+            date = action.get("date") or ""
+            if date > last_activity.get(name, ""):
+                last_activity[name] = date
+            text = (action.get("data") or {}).get("text") or ""
+            if blocker is None and BLOCKER_COMMENT.search(text):
+                blocker = f"{name}: {text[:SNIPPET_LENGTH]}"
+        if blocker is not None:
+            per_list[list_name]["blocked"] += 1
+            blockers.append(dict(ref, reason=blocker))
+        for member_id in card.get("idMembers") or []:
+            name = members.get(member_id, member_id)
+            activity[name]["assigned_cards"] += 1
+            handles[f"member:{name}"].append(card_id)
+
+    overdue.sort(key=lambda ref: -ref["days_overdue"])
+    stale.sort(key=lambda ref: -ref["days_inactive"])
+    handles["overdue"] = [ref["id"] for ref in overdue]
+    handles["stale"] = [ref["id"] for ref in stale]
+    handles["blockers"] = [ref["id"] for ref in blockers]
+    aggregate.handles = dict(handles)
+    aggregate.summary = {
+        "as_of": now.isoformat(timespec="seconds"),
+        "cards": len(aggregate.cards),
+        "lists": {name: dict(counts) for name, counts in per_list.items()},
+        "overdue": {"count": len(overdue), "top": overdue[:top]},
+        "stale": {"count": len(stale), "days": stale_days, "top": stale[:top]},
+        "blockers": {"count": len(blockers), "top": blockers[:top]},
+        "labels": dict(labels.most_common()),
+        "members": {name: dict(counts, last_comment=last_activity.get(name)) for name, counts in
+                    sorted(activity.items(), key=lambda item: -sum(item[1].values()))},
+        "drill_down": sorted(aggregate.handles, key=lambda handle: (":" in handle, handle)),
+    }
+    return aggregate
+
+
+def _card_view(card: Dict[str, Any]) -> Dict[str, Any]:
+    # Names rather than ids, which the agent cannot use anyway.
+    view = compact_card(card)
+    view.pop("idList", None)
+    view.pop("idMembers", None)
+    view["list"] = card["list"]
+    if card["members"]:
+        view["members"] = card["members"]
+    return view
+
+
+def drill_down(aggregate: BoardAggregate, handle: str, limit: int = DRILL_DOWN_LIMIT,
+               offset: int = 0) -> Dict[str, Any]:
+    """The cards behind a handle ("overdue", "list:<name>", "card:<id>", ...), compacted."""
+    handle = handle.strip()
+    if handle.startswith("card:"):
+        card = aggregate.cards.get(handle[5:].strip())
+        if card is None:
+            return {"error": f"Unknown card '{handle[5:].strip()}'"}
+        comments = [{"by": _member_name(action, {}), "date": action.get("date"),
+                     "text": (action.get("data") or {}).get("text")} for action in _comments(card)]
+        return dict(_card_view(card), comment_texts=comments)
+    card_ids = aggregate.handles.get(handle)
+    if card_ids is None:
+        return {"error": f"Unknown handle '{handle}'", "handles": aggregate.summary.get("drill_down", [])}
+    page = card_ids[offset:offset + limit]
+    return {
+        "handle": handle,
+        "count": len(card_ids),
+        "offset": offset,
+        "cards": [_card_view(aggregate.cards[card_id]) for card_id in page],
+    }
+
+
+_boards: Dict[str, BoardAggregate] = {}
+_boards_lock = threading.Lock()
+
+
+def remember_board(board_id: str, aggregate: BoardAggregate) -> None:
+    """Keeps the latest aggregate of a board for the drill-down tool."""
+    with _boards_lock:
+        _boards[board_id] = aggregate
+
+
+def remembered_board(board_id: str) -> Optional[BoardAggregate]:
+    with _boards_lock:
+        return _boards.get(board_id)
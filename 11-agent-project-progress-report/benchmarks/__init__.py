@@ -0,0 +1 @@
+"""Benchmarks for the progress report crew."""
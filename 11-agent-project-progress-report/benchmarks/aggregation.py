@@ -0,0 +1,71 @@
+# Benchmark of the local pre-aggregation of Trello board data.
+#
+# Generates a synthetic board in the shape of the Trello API and compares what
+# the board tool hands the agent: the raw cards JSON (what it returned before)
+# against the aggregated summary, in prompt tokens, and times the aggregation
+# and a drill-down. Tokens are counted with tiktoken when it is installed,
+# otherwise estimated at 4 characters per token.
+#
+# Usage (from the project directory):
+#     python -m benchmarks.aggregation --cards 10000
+
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+
+from aggregation import aggregate_board, drill_down
+from synthetic_board import generate_board
+
+CONTEXT_WINDOW = 128_000
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("o200k_base")
+
+    def count_tokens(text):
+        return len(_encoding.encode(text))
+    TOKEN_COUNT = "tiktoken o200k_base"
+except ImportError:
+    def count_tokens(text):
+        return len(text) // 4
+    TOKEN_COUNT = "estimated at 4 characters per token"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the board pre-aggregation.")
+    parser.add_argument("--cards", type=int, default=10_000, help="Number of cards of the synthetic board.")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of this many runs.")
+    args = parser.parse_args()
+
+    now = datetime(2024, 9, 1, tzinfo=timezone.utc)
+    board = generate_board(args.cards, now=now)
+    lists = {item["id"]: item["name"] for item in board["lists"]}
+    members = {item["id"]: item["fullName"] for item in board["members"]}
+
+    times = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        aggregate = aggregate_board(board["cards"], lists, members, now=now)
+        summary = json.dumps(aggregate.summary, separators=(",", ":"))
+        times.append(time.perf_counter() - started)
+    started = time.perf_counter()
+    page = json.dumps(drill_down(aggregate, "overdue"), separators=(",", ":"))
+    drill_seconds = time.perf_counter() - started
+
+    raw = json.dumps(board["cards"])
+    raw_tokens, summary_tokens, page_tokens = count_tokens(raw), count_tokens(summary), count_tokens(page)
+    print(f"{args.cards} cards, {aggregate.summary['overdue']['count']} overdue, "
+          f"{aggregate.summary['stale']['count']} stale, {aggregate.summary['blockers']['count']} blocked "
+          f"(tokens {TOKEN_COUNT}):")
+    print(f"  raw cards JSON                 {len(raw) / 1024:>8.0f} KiB {raw_tokens:>10,} tokens"
+          f"{' - over a 128k context window' if raw_tokens > CONTEXT_WINDOW else ''}")
+    print(f"  aggregated summary             {len(summary) / 1024:>8.1f} KiB {summary_tokens:>10,} tokens")
+    print(f"  one drill-down page (50 cards) {len(page) / 1024:>8.1f} KiB {page_tokens:>10,} tokens")
+    print(f"  aggregation                    {min(times) * 1000:>8.1f} ms (best of {args.repeat})")
+    print(f"  drill-down                     {drill_seconds * 1000:>8.2f} ms")
+    print(f"  prompt reduction               {raw_tokens / summary_tokens:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# Benchmark of the crew's Trello data path against the local stand-in server.
+#
+# For every board size, serves a synthetic board with trello_stub_server.py
+# (with the given latency and error rate) and runs the Trello tools the data
+# collection agent uses, as the agent would: the board summary, a drill-down
+# and the bulk fetch of every card, page by page. Measures their time, the HTTP
+# requests the server receives (retries included), the tool calls the agent
+# makes to read every card, against the raw board and one single card tool call
+# per card (up to --single-card-max cards), and the prompt tokens of their
+# results (of the first page for the bulk fetch), against the raw board JSON
+# the board tool returned before. No network access or Trello credentials are
+# needed.
+#
+# With --baseline, the request counts, tool calls and tokens are compared
+# with a stored baseline and the run fails (exit code 1) when one of them
+# grows by more than --tolerance, so a regression of the data path fails CI;
+# times are compared too with --time-tolerance. --update-baseline rewrites it.
+# Tokens are counted with tiktoken when it is installed, otherwise estimated
+# at 4 characters per token.
+#
+# Usage (from the project directory):
+#     python -m benchmarks.data_path --cards 100,1000,10000 --latency 0.02
+#     python -m benchmarks.data_path --baseline benchmarks/data_path_baseline.json
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.aggregation import TOKEN_COUNT, count_tokens
+from synthetic_board import generate_board
+from trello_client import shared_client
+from trello_stub_server import TrelloStubServer
+from trello_tools import BoardDataFetcherTool, BoardDrillDownTool, BulkCardDataFetcherTool, CardDataFetcherTool
+
+# Metrics checked against the baseline: counts and sizes, the same on every machine.
+CHECKED = ("summary_requests", "bulk_requests", "tool_calls", "summary_tokens", "drill_down_tokens",
+           "bulk_tokens")
+TIMES = ("summary_seconds", "bulk_seconds")
+
+
+def measure(cards, args):
+    board = generate_board(cards, members=args.members, labels=args.labels, comments=args.comments)
+    with TrelloStubServer(board, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate) as server:
+        os.environ.update(DLAI_TRELLO_BASE_URL=server.url, TRELLO_BOARD_ID=server.board_id,
+                          TRELLO_API_KEY="stub", TRELLO_API_TOKEN="stub")
+        client = shared_client()
+        calls = []
+
+        def served():
+            # Counted by the server, so the retries of failed requests are included.
+            return sum(count for route, count in server.stats.items() if route != "injected_errors")
+
+        def run(tool, *args):
+            calls.append(type(tool).__name__)
+            before = served()
+            started = time.perf_counter()
+            result = tool._run(*args)
+            return result, time.perf_counter() - started, served() - before
+
+        summary, summary_seconds, summary_requests = run(BoardDataFetcherTool())
+        drill_down, _, _ = run(BoardDrillDownTool(), "overdue")
+        # Every card through the bulk tool, page by page.
+        bulk_tool, pages, offset = BulkCardDataFetcherTool(), [], 0
+        while offset is not None:
+            pages.append(run(bulk_tool, "", offset))
+            offset = json.loads(pages[-1][0])["next_offset"]
+        tool_calls = len(calls)
+
+        # Before: the raw board, then every card with the single card tool.
+        raw, _, _ = run(BoardDataFetcherTool(raw=True))
+        single_card_tool_calls = None
+        if cards <= args.single_card_max:
+            card_tool = CardDataFetcherTool()
+            for card in json.loads(raw):
+                run(card_tool, card["id"])
+            single_card_tool_calls = len(calls) - tool_calls
+        client.close()
+        errors = server.stats["injected_errors"]
+    assert sum(len(json.loads(page)["cards"]) for page, _, _ in pages) == cards
+    return {
+        "summary_seconds": round(summary_seconds, 3),
+        "summary_requests": summary_requests,
+        "bulk_seconds": round(sum(seconds for _, seconds, _ in pages), 3),
+        "bulk_requests": sum(requests for _, _, requests in pages),
+        # The tool calls the agent makes to read every card, with the tools and before.
+        "tool_calls": tool_calls,
+        "single_card_tool_calls": single_card_tool_calls,
+        "raw_tokens": count_tokens(raw),
+        "summary_tokens": count_tokens(summary),
+        "drill_down_tokens": count_tokens(drill_down),
+        "bulk_tokens": count_tokens(pages[0][0]),
+        "injected_errors": errors,
+    }
+
+
+def compare(results, baseline, tolerance, time_tolerance):
+    """The metrics that grew beyond their tolerance, as messages."""
+    regressions = []
+    for cards, metrics in results.items():
+        expected = baseline.get(cards)
+        if expected is None:
+            continue
+        limits = [(name, tolerance) for name in CHECKED]
+        if time_tolerance is not None:
+            limits += [(name, time_tolerance) for name in TIMES]
+        for name, limit in limits:
+            if expected.get(name) is not None and metrics[name] > expected[name] * (1 + limit):
+                regressions.append(f"{cards} cards: {name} {metrics[name]} > baseline {expected[name]} "
+                                   f"(+{limit:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Trello data path against the stand-in server.")
+    parser.add_argument("--cards", default="100,1000,10000", help="Comma-separated board sizes.")
+    parser.add_argument("--members", type=int, default=10, help="Number of members of the boards.")
+    parser.add_argument("--labels", type=int, default=6, help="Number of labels of the boards.")
+    parser.add_argument("--comments", type=float, default=1.0, help="Factor applied to the comments of a card.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds added to every request.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random seconds added on top of the latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with a 503.")
+    parser.add_argument("--single-card-max", type=int, default=1000,
+                        help="Largest board also read card by card with the single card tool.")
+    parser.add_argument("--baseline", type=Path, help="Baseline JSON file to compare with.")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results to --baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed growth of counts and tokens.")
+    parser.add_argument("--time-tolerance", type=float, help="Allowed growth of times (not checked by default).")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{args.latency * 1000:g} ms latency, {args.error_rate:.0%} errors (tokens {TOKEN_COUNT}):")
+    print(f"  {'cards':>7} {'summary':>9} {'requests':>8} {'bulk':>8} {'requests':>8} {'tool calls':>11} "
+          f"{'raw tokens':>11} {'summary':>8} {'drill':>6} {'bulk':>9}")
+    for cards in [int(size) for size in args.cards.split(",")]:
+        metrics = results[str(cards)] = measure(cards, args)
+        print(f"  {cards:>7} {metrics['summary_seconds']:>8.2f}s {metrics['summary_requests']:>8} "
+              f"{metrics['bulk_seconds']:>7.2f}s {metrics['bulk_requests']:>8} "
+              f"{metrics['tool_calls']:>4} ({metrics['single_card_tool_calls'] or '-':>5}) "
+              f"{metrics['raw_tokens']:>11,} {metrics['summary_tokens']:>8,} {metrics['drill_down_tokens']:>6,} "
+              f"{metrics['bulk_tokens']:>9,}")
+        # The board's cards page by page, at most 1000 per request.
+        assert metrics["bulk_requests"] >= math.ceil(cards / 1000)
+
+    if args.baseline is None:
+        return
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance, args.time_tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+    print(f"No regression against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# Benchmark of the incremental board fetch and diff against a stored snapshot.
+#
+# Stores the snapshot of a synthetic board, changes some of its cards (moved,
+# completed, new and deleted), then fetches the changes since the watermark
+# from an in-memory stand-in of the Trello client and diffs them with the
+# snapshot. Compares the cards fetched and the prompt tokens of the diff with
+# a full run, which fetches every card and hands the agent the board summary.
+# Tokens are counted with tiktoken when it is installed, otherwise estimated
+# at 4 characters per token.
+#
+# Usage (from the project directory):
+#     python -m benchmarks.snapshot_store --cards 10000 --changes 50
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from aggregation import aggregate_board
+from benchmarks.aggregation import TOKEN_COUNT, count_tokens
+from snapshot_store import SnapshotStore, diff_board, fetch_changes, watermark_of
+from synthetic_board import _date, _id, generate_board
+
+
+class LocalBoard:
+    """The client calls fetch_changes makes, served from a synthetic board."""
+
+    def __init__(self, board):
+        self.board_cards = {card["id"]: card for card in board["cards"]}
+        self.actions = []
+        self.fetched = 0
+
+    def paginate(self, path, since=None, **params):
+        return [action for action in reversed(self.actions) if action["date"] > since]
+
+    def cards(self, card_ids, **params):
+        card_ids = list(card_ids)
+        self.fetched += len(card_ids)
+        return [self.board_cards.get(card_id, {"id": card_id, "error": "not found", "status": 404})
+                for card_id in card_ids]
+
+
+def change_board(local, lists, count, when, rng):
+    """Moves, completes, adds and deletes `count` cards in all, with their actions."""
+    done = next(list_id for list_id, name in lists.items() if name == "Done")
+    open_lists = [list_id for list_id, name in lists.items() if name != "Done"]
+    for number, card_id in enumerate(rng.sample(sorted(local.board_cards), count)):
+        kind = number % 4
+        if kind == 3:
+            del local.board_cards[card_id]
+            action = "deleteCard"
+        elif kind == 2:
+            card_id = _id(rng, when)
+            local.board_cards[card_id] = {"id": card_id, "name": f"New card {number}",
+                                          "idList": open_lists[0], "idMembers": [], "due": None, "labels": []}
+            action = "createCard"
+        else:
+            card_list = done if kind else rng.choice(open_lists)
+            local.board_cards[card_id] = dict(local.board_cards[card_id], idList=card_list)
+            action = "updateCard"
+        local.board_cards.get(card_id, {})["dateLastActivity"] = _date(when)
+        local.actions.append({"id": _id(rng, when), "type": action, "date": _date(when),
+                              "data": {"card": {"id": card_id}}})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the incremental board fetch and diff.")
+    parser.add_argument("--cards", type=int, default=10_000, help="Number of cards of the synthetic board.")
+    parser.add_argument("--changes", type=int, default=50, help="Number of cards changed between the runs.")
+    args = parser.parse_args()
+
+    now = datetime(2024, 9, 1, tzinfo=timezone.utc)
+    board = generate_board(args.cards, now=now)
+    lists = {item["id"]: item["name"] for item in board["lists"]}
+    members = {item["id"]: item["fullName"] for item in board["members"]}
+    local = LocalBoard(board)
+    summary = json.dumps(aggregate_board(board["cards"], lists, members, now=now).summary, separators=(",", ":"))
+
+    with tempfile.TemporaryDirectory() as directory, SnapshotStore(Path(directory) / "snapshots.db") as store:
+        started = time.perf_counter()
+        store.save_run("board", local.board_cards, (), now.isoformat(),
+                       watermark_of(local.board_cards.values()), "analysis", "report", replace=True)
+        full_seconds = time.perf_counter() - started
+
+        later = now + timedelta(days=1)
+        change_board(local, lists, args.changes, later - timedelta(hours=1), random.Random(1))
+        started = time.perf_counter()
+        last = store.last_run("board")
+        changed, removed, watermark = fetch_changes(local, "board", last.watermark)
+        diff = diff_board(store.cards("board"), changed, removed, lists, now, later)
+        diff_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        store.save_run("board", changed, removed, later.isoformat(), watermark, "analysis", "report")
+        save_seconds = time.perf_counter() - started
+
+    text = diff.to_text()
+    print(f"{args.cards} cards, {args.changes} changed: {len(diff)} changes "
+          f"({', '.join(f'{len(refs)} {name}' for name, refs in diff.to_dict().items())}) "
+          f"(tokens {TOKEN_COUNT}):")
+    print(f"  cards fetched, full run        {args.cards:>10,}")
+    print(f"  cards fetched, incremental     {local.fetched:>10,}")
+    print(f"  board summary prompt           {count_tokens(summary):>10,} tokens")
+    print(f"  board diff prompt              {count_tokens(text):>10,} tokens "
+          f"(every change: {count_tokens(diff.to_text(limit=len(diff))):,})")
+    print(f"  full snapshot save             {full_seconds * 1000:>10.1f} ms")
+    print(f"  fetch changes and diff         {diff_seconds * 1000:>10.1f} ms")
+    print(f"  incremental save               {save_seconds * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# Incremental sprint reports against a stored snapshot of the Trello board.
+#
+# The first report of a board runs the whole crew (data collection, analysis
+# and report) and stores the board snapshot, the analysis and the report (see
+# snapshot_store.py). Every later report fetches only the cards changed since
+# the activity watermark, compares them with the snapshot and hands just that
+# diff, with the previous analysis and report, to the analysis agent, which
+# updates them in two tasks instead of reading the board again. A board with
+# no changes reuses the previous report without any LLM call.
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from crewai import Agent, Crew, Task
+
+from aggregation import parse_date
+from snapshot_store import BoardDiff, SnapshotStore, diff_board, fetch_changes, watermark_of
+from trello_client import TrelloClient, TrelloError
+from trello_tools import BoardDataFetcherTool, BoardDrillDownTool, BulkCardDataFetcherTool, CardDataFetcherTool
+
+UPDATE_TASKS = ("data_analysis_update", "report_update")
+
+
+@dataclass
+class ReportRun:
+    report: str
+    # "full", "incremental" or "unchanged".
+    mode: str
+    diff: Optional[BoardDiff] = None
+    # Why the report could not be brought up to date, if it could not.
+    warning: Optional[str] = None
+
+
+def build_report_crew(crew_config: Any, verbose: bool = True) -> Crew:
+    """The full progress report crew: data collection, analysis and report."""
+    agents_config, tasks_config = crew_config.agents, crew_config.tasks
+    data_collection_agent = Agent(
+        config=agents_config['data_collection_agent'],
+        tools=[BoardDataFetcherTool(), BoardDrillDownTool(), BulkCardDataFetcherTool(), CardDataFetcherTool()]
+    )
+    analysis_agent = Agent(config=agents_config['analysis_agent'])
+    return Crew(
+        agents=[data_collection_agent, analysis_agent],
+        tasks=[
+            Task(config=tasks_config['data_collection'], agent=data_collection_agent),
+            Task(config=tasks_config['data_analysis'], agent=analysis_agent),
+            Task(config=tasks_config['report_generation'], agent=analysis_agent),
+        ],
+        verbose=verbose,
+    )
+
+
+def build_update_crew(crew_config: Any, verbose: bool = True) -> Crew:
+    """The analysis agent alone, updating the previous analysis and report with a board diff."""
+    tasks_config = crew_config.tasks
+    analysis_agent = Agent(config=crew_config.agents['analysis_agent'])
+    return Crew(
+        agents=[analysis_agent],
+        tasks=[Task(config=tasks_config[name], agent=analysis_agent) for name in UPDATE_TASKS],
+        verbose=verbose,
+    )
+
+
+def _kickoff(crew: Crew, crew_config: Any, metrics: Any = None, inputs: Optional[dict] = None) -> Any:
+    if metrics is None:
+        return crew.kickoff(inputs=inputs)
+    metrics.watch(crew, crew_config)
+    with metrics:
+        return crew.kickoff(inputs=inputs)
+
+
+def run_report(board_id: str, client: TrelloClient, store: SnapshotStore, crew_config: Any,
+               metrics: Any = None, now: Optional[datetime] = None, full_refresh: bool = False,
+               crew: Optional[Crew] = None, verbose: bool = True) -> ReportRun:
+    """
+    The sprint report of a board: a full run the first time (or with
+    `full_refresh`), an update from the board diff afterwards. `crew` is the
+    crew of the full run, in the layout of build_report_crew (the default).
+    """
+    now = now or datetime.now(timezone.utc)
+    run_at = now.isoformat(timespec="seconds")
+    last = store.last_run(board_id)
+
+    if full_refresh or last is None or not last.watermark or not last.analysis or not last.report:
+        # The snapshot is taken before the crew reads the board, so nothing changed during the run is missed.
+        try:
+            cards = {card['id']: card for card in client.board_cards(board_id)}
+        except TrelloError:
+            # The tools fall back to the sample cards; a report of those is not a snapshot of the board,
+            # so nothing is saved and the next run is a full run again.
+            cards = None
+        crew = crew or build_report_crew(crew_config, verbose)
+        result = _kickoff(crew, crew_config, metrics)
+        if cards is not None:
+            analysis = crew.tasks[1].output.raw
+            store.save_run(board_id, cards, (), run_at, watermark_of(cards.values()), analysis, result.raw,
+                           replace=True)
+        return ReportRun(result.raw, "full")
+
+    try:
+        lists = client.board_lists(board_id)
+        changed, removed, watermark = fetch_changes(client, board_id, last.watermark)
+    except TrelloError as e:
+        # The previous report is the latest known state; the snapshot and the watermark are kept,
+        # so the next run picks up the changes missed here.
+        return ReportRun(last.report, "unchanged", warning=f"Trello could not be read, previous report reused: {e}")
+    diff = diff_board(store.cards(board_id), changed, removed, lists, parse_date(last.run_at), now)
+    if not diff:
+        # Activity that the report does not track (e.g. comments) still moves the watermark.
+        store.save_run(board_id, changed, removed, run_at, watermark, last.analysis, last.report)
+        return ReportRun(last.report, "unchanged", diff)
+
+    inputs = {
+        'board_diff': diff.to_text(),
+        'previous_analysis': last.analysis,
+        'previous_report': last.report,
+    }
+    crew_config.check_inputs(inputs, tasks=UPDATE_TASKS)
+    crew = build_update_crew(crew_config, verbose)
+    result = _kickoff(crew, crew_config, metrics, inputs)
+    store.save_run(board_id, changed, removed, run_at, watermark, crew.tasks[0].output.raw, result.raw)
+    return ReportRun(result.raw, "incremental", diff)
@@ -10,7 +10,6 @@ load_env()
 
 import os
 import json
-import yaml
 from crewai import Agent, Task, Crew
 
 
@@ -18,79 +17,22 @@ os.environ['OPENAI_MODEL_NAME'] = 'gpt-4o-mini'
 
 
 # Load tasks and agent
-# Define file paths for YAML configurations
-files = {
-    'agents': 'config/agents.yaml',
-    'tasks': 'config/tasks.yaml'
-}
-
-# Load configurations from YAML files
-configs = {}
-for config_type, file_path in files.items():
-    with open(file_path, 'r') as file:
-        configs[config_type] = yaml.safe_load(file)
+# Load the validated configurations; paths are resolved relative to this
+# project and the compiled result is cached until the YAML files change
+from config_loader import load_crew_config
+
+crew_config = load_crew_config('config')
 
 # Assign loaded configurations to specific variables
-agents_config = configs['agents']
-tasks_config = configs['tasks']
+agents_config = crew_config.agents
+tasks_config = crew_config.tasks
 
 # Create Custom tools
-
-from crewai_tools import BaseTool
-import requests
-
-class BoardDataFetcherTool(BaseTool):
-    name: str = "Trello Board Data Fetcher"
-    description: str = "Fetches card data, comments, and activity from a Trello board."
-
-    api_key: str = os.environ['TRELLO_API_KEY']
-    api_token: str = os.environ['TRELLO_API_TOKEN']
-    board_id: str = os.environ['TRELLO_BOARD_ID']
-
-    def _run(self) -> dict:
-        """
-        Fetch all cards from the specified Trello board.
-        """
-        url = f"{os.getenv('DLAI_TRELLO_BASE_URL', 'https://api.trello.com')}/1/boards/{self.board_id}/cards"
-
-        query = {
-            'key': self.api_key,
-            'token': self.api_token,
-            'fields': 'name,idList,due,dateLastActivity,labels',
-            'attachments': 'true',
-            'actions': 'commentCard'
-        }
-
-        response = requests.get(url, params=query)
-
-        if response.status_code == 200:
-            return response.json()
-        else:
-            # Fallback in case of timeouts or other issues
-            return json.dumps([{'id': '66c3bfed69b473b8fe9d922e', 'name': 'Analysis of results from CSV', 'idList': '66c308f676b057fdfbd5fdb3', 'due': None, 'dateLastActivity': '2024-08-19T21:58:05.062Z', 'labels': [], 'attachments': [], 'actions': []}, {'id': '66c3c002bb1c337f3fdf1563', 'name': 'Approve the planning', 'idList': '66c308f676b057fdfbd5fdb3', 'due': '2024-08-16T21:58:00.000Z', 'dateLastActivity': '2024-08-19T21:58:57.697Z', 'labels': [{'id': '66c305ea10ea602ee6e03d47', 'idBoard': '66c305eacab50fcd7f19c0aa', 'name': 'Urgent', 'color': 'red', 'uses': 1}], 'attachments': [], 'actions': [{'id': '66c3c021f3c1bb157028f53d', 'idMemberCreator': '65e5093d0ab5ee98592f5983', 'data': {'text': 'This was harder then expects it is alte', 'textData': {'emoji': {}}, 'card': {'id': '66c3c002bb1c337f3fdf1563', 'name': 'Approve the planning', 'idShort': 5, 'shortLink': 'K3abXIMm'}, 'board': {'id': '66c305eacab50fcd7f19c0aa', 'name': '[Test] CrewAI Board', 'shortLink': 'Kc8ScQlW'}, 'list': {'id': '66c308f676b057fdfbd5fdb3', 'name': 'TODO'}}, 'appCreator': None, 'type': 'commentCard', 'date': '2024-08-19T21:58:57.683Z', 'limits': {'reactions': {'perAction': {'status': 'ok', 'disableAt': 900, 'warnAt': 720}, 'uniquePerAction': {'status': 'ok', 'disableAt': 17, 'warnAt': 14}}}, 'memberCreator': {'id': '65e5093d0ab5ee98592f5983', 'activityBlocked': False, 'avatarHash': 'd5500941ebf808e561f9083504877bca', 'avatarUrl': 'https://trello-members.s3.amazonaws.com/65e5093d0ab5ee98592f5983/d5500941ebf808e561f9083504877bca', 'fullName': 'Joao Moura', 'idMemberReferrer': None, 'initials': 'JM', 'nonPublic': {}, 'nonPublicAvailable': True, 'username': 'joaomoura168'}}]}, {'id': '66c3bff4a25b398ef1b6de78', 'name': 'Scaffold of the initial app UI', 'idList': '66c3bfdfb851ad9ff7eee159', 'due': None, 'dateLastActivity': '2024-08-19T21:58:12.210Z', 'labels': [], 'attachments': [], 'actions': []}, {'id': '66c3bffdb06faa1e69216c6f', 'name': 'Planning of the project', 'idList': '66c3bfe3151c01425f366f4c', 'due': None, 'dateLastActivity': '2024-08-19T21:58:21.081Z', 'labels': [], 'attachments': [], 'actions': []}])
-
-
-class CardDataFetcherTool(BaseTool):
-  name: str = "Trello Card Data Fetcher"
-  description: str = "Fetches card data from a Trello board."
-
-  api_key: str = os.environ['TRELLO_API_KEY']
-  api_token: str = os.environ['TRELLO_API_TOKEN']
-
-  def _run(self, card_id: str) -> dict:
-    url = f"{os.getenv('DLAI_TRELLO_BASE_URL', 'https://api.trello.com')}/1/cards/{card_id}"
-    query = {
-      'key': self.api_key,
-      'token': self.api_token
-    }
-    response = requests.get(url, params=query)
-
-    if response.status_code == 200:
-      return response.json()
-    else:
-      # Fallback in case of timeouts or other issues
-      return json.dumps({"error": "Failed to fetch card data, don't try to fetch any trello data anymore"})
-
+# The Trello tools share a pooled client with timeouts, retries and pagination;
+# set DLAI_TRELLO_BASE_URL to run them against a stand-in of the Trello API
+# (e.g. the synthetic board of trello_stub_server.py).
+# The board tool returns a local aggregate of the board with drill-down handles
+from trello_tools import BoardDataFetcherTool, BoardDrillDownTool, CardDataFetcherTool, BulkCardDataFetcherTool
 
 
 # Display the Trello screenshot
@@ -104,7 +46,7 @@ display(trello_image)
 # Creating Agents
 data_collection_agent = Agent(
   config=agents_config['data_collection_agent'],
-  tools=[BoardDataFetcherTool(), CardDataFetcherTool()]
+  tools=[BoardDataFetcherTool(), BoardDrillDownTool(), BulkCardDataFetcherTool(), CardDataFetcherTool()]
 )
 
 analysis_agent = Agent(
@@ -141,21 +83,42 @@ crew = Crew(
   verbose=True
 )
 
-# Kick off the crew and execute the process
-result = crew.kickoff()
+# Kick off the crew and execute the process, collecting per-agent, per-task and per-model usage and latency
+# The board snapshot, analysis and report are stored with the run; the next
+# runs fetch only the cards changed since, and the analysis agent updates the
+# previous report with that diff (or the report is reused when nothing changed)
+from metrics import CrewMetrics
+from incremental_report import run_report
+from snapshot_store import SnapshotStore
+from trello_client import shared_client
+
+metrics = CrewMetrics(crew_name='progress_report')
+snapshot_store = SnapshotStore('board_snapshots/board_snapshots.db')
+report_run = run_report(os.environ['TRELLO_BOARD_ID'], shared_client(), snapshot_store, crew_config,
+                        metrics=metrics, crew=crew)
+print(f"Report run: {report_run.mode}")
+if report_run.warning:
+  print(report_run.warning)
+if report_run.diff is not None:
+  print(report_run.diff.to_text())
 
 
 import pandas as pd
 
-costs = 0.150 * (crew.usage_metrics.prompt_tokens + crew.usage_metrics.completion_tokens) / 1_000_000
+# Costs use the per-model price table, with cached prompt tokens at the cached price
+costs = metrics.total_cost()
 print(f"Total costs: ${costs:.4f}")
 
-# Convert UsageMetrics instance to a DataFrame
-df_usage_metrics = pd.DataFrame([crew.usage_metrics.dict()])
+# Export for Prometheus (textfile collector) and append this run to the JSONL history
+metrics.write_prometheus('run_metrics/progress_report.prom')
+metrics.write_jsonl('run_metrics/runs.jsonl')
+
+# One row per agent, task and model (and per tool)
+df_usage_metrics = pd.DataFrame(metrics.records())
 df_usage_metrics
 
 
 from IPython.display import Markdown
 
-markdown  = result.raw
+markdown  = report_run.report
 Markdown(markdown)
\ No newline at end of file
@@ -0,0 +1,420 @@
+# Per-agent, per-task and per-model usage and latency metrics of a crew run.
+#
+# crew.usage_metrics only has the totals of a run. CrewMetrics registers
+# LiteLLM success/failure callbacks (kept across calls, unlike litellm.callbacks
+# which CrewAI replaces on every call) and attributes every LLM call to the agent
+# from the "You are {role}." system prompt and to the task from the "Current
+# Task:" prompt. Tool latency is measured by wrapping the tools' _run. Totals are
+# kept in memory under a lock; nothing is written until an export is requested,
+# as a Prometheus text-format file (for the node exporter's textfile collector)
+# or as JSONL records, with the cost from a per-model price table.
+#
+# Projects 10 and 11 each ship a copy of this module, as every project is
+# self-contained; project 11's tests/test_shared_modules.py checks that the
+# copies stay identical apart from the crew name of the example below.
+
+import bisect
+import functools
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+import litellm
+
+UNKNOWN = "unknown"
+TASK_MARKER = "Current Task:"
+# Length of the prompt prefix used to recognise agents and tasks.
+PREFIX_LENGTH = 160
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """USD per million tokens; cached prompt tokens are billed at the cached input price."""
+    input: float
+    cached_input: float
+    output: float
+
+    def cost(self, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> float:
+        uncached = prompt_tokens - cached_tokens
+        return (uncached * self.input + cached_tokens * self.cached_input
+                + completion_tokens * self.output) / 1_000_000
+
+
+# Matched on the longest prefix, so dated snapshots (gpt-4o-mini-2024-07-18) use their family's price.
+PRICES = {
+    "gpt-4o-mini": ModelPrice(0.15, 0.075, 0.60),
+    "gpt-4o": ModelPrice(2.50, 1.25, 10.00),
+    "gpt-4.1-nano": ModelPrice(0.10, 0.025, 0.40),
+    "gpt-4.1-mini": ModelPrice(0.40, 0.10, 1.60),
+    "gpt-4.1": ModelPrice(2.00, 0.50, 8.00),
+    "gpt-4-turbo": ModelPrice(10.00, 10.00, 30.00),
+    "gpt-3.5-turbo": ModelPrice(0.50, 0.50, 1.50),
+    "o1-mini": ModelPrice(1.10, 0.55, 4.40),
+    "o3-mini": ModelPrice(1.10, 0.55, 4.40),
+}
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus layout."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total, result = 0, []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return result
+
+
+@dataclass
+class LLMSeries:
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    latency: Histogram = field(default_factory=Histogram)
+
+
+@dataclass
+class ToolSeries:
+    calls: int = 0
+    errors: int = 0
+    latency: Histogram = field(default_factory=Histogram)
+
+
+def price_for(model: str, prices: Dict[str, ModelPrice] = PRICES) -> Optional[ModelPrice]:
+    name = model.split("/")[-1]
+    matches = [prefix for prefix in prices if name.startswith(prefix)]
+    return prices[max(matches, key=len)] if matches else None
+
+
+def _get(obj: Any, name: str) -> Any:
+    if obj is None:
+        return None
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+def _seconds(start_time: Any, end_time: Any) -> float:
+    elapsed = end_time - start_time
+    return elapsed.total_seconds() if hasattr(elapsed, "total_seconds") else float(elapsed)
+
+
+def _text(message: Dict[str, Any]) -> str:
+    content = message.get("content")
+    return content if isinstance(content, str) else ""
+
+
+def _is_retry(messages: List[Dict[str, Any]]) -> bool:
+    # The agent appends the parser error as a user message and calls the LLM again;
+    # a regular step ends with the assistant's own message instead.
+    roles = [message.get("role") for message in messages]
+    return len(roles) > 1 and roles[-1] == "user" and roles.count("user") > 1
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+
+
+def _template_pattern(template: str) -> Pattern:
+    """Matches the start of a text made from `template`, whatever its {placeholders} were replaced with."""
+    parts = re.split(r"\{[A-Za-z_][A-Za-z0-9_]*\}", template.strip())
+    return re.compile(".*?".join(map(re.escape, parts)), re.DOTALL)
+
+
+def _match(patterns: List[Tuple[str, Pattern]], text: str) -> Optional[str]:
+    return next((name for name, pattern in patterns if pattern.match(text)), None)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    # The textfile collector may read at any time; never let it see half a file.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w") as file:
+        file.write(text)
+    os.replace(temp_path, path)
+
+
+class CrewMetrics:
+    """
+    Collects LLM and tool metrics of one or more crews, labelled by agent, task and model.
+
+    metrics = CrewMetrics(crew_name='progress_report')
+    metrics.watch(crew, crew_config)
+    with metrics:
+        crew.kickoff(inputs=inputs)
+    metrics.write_prometheus('run_metrics/progress_report.prom')
+    """
+
+    def __init__(self, crew_name: str = "crew", prices: Optional[Dict[str, ModelPrice]] = None):
+        self.crew_name = crew_name
+        self.prices = PRICES if prices is None else prices
+        self.run_id = uuid.uuid4().hex
+        self.started_at = time.time()
+        self.llm: Dict[Tuple[str, str, str], LLMSeries] = {}
+        self.tools: Dict[Tuple[str, str, str], ToolSeries] = {}
+        self.unpriced_models = set()
+        self._agent_templates: Dict[str, str] = {}
+        self._task_templates: Dict[str, str] = {}
+        self._agents: List[Tuple[str, Pattern]] = []
+        self._tasks: List[Tuple[str, Pattern]] = []
+        self._agent_names: Dict[str, str] = {}
+        self._task_names: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    # Attribution
+
+    def watch(self, crew: Any, crew_config: Optional[Any] = None, tasks: Iterable[Any] = ()) -> None:
+        """
+        Registers the agents and tasks of a crew and instruments its tools. Agents and
+        tasks are named after their YAML keys when `crew_config` (a CrewConfig) is
+        given, otherwise by their role and task name. `tasks` are the tasks run
+        outside the crew by its agents, e.g. a streamed structuring task.
+
+        Attribution is keyed by the role and task description templates, not by the
+        instances, so watching many crews built from the same config (e.g. one per
+        project or per report, from several threads) registers each template once.
+        """
+        agent_keys, task_keys = {}, {}
+        if crew_config is not None:
+            agent_keys = {config["role"]: name for name, config in crew_config.agents_config.items()}
+            task_keys = {config["description"]: name for name, config in crew_config.tasks_config.items()}
+        with self._lock:
+            for agent in crew.agents:
+                self._agent_templates.setdefault(agent.role, agent_keys.get(agent.role, agent.role))
+            for index, task in enumerate([*crew.tasks, *tasks]):
+                name = task_keys.get(task.description) or getattr(task, "name", None) or f"task_{index}"
+                self._task_templates.setdefault(task.description, name)
+            # Rebuilt rather than updated, so the callbacks can match against the lists without the lock.
+            # Longest template first, so a role or task that is a prefix of another cannot shadow it.
+            self._agents = [(name, _template_pattern(f"You are {role}."))
+                            for role, name in sorted(self._agent_templates.items(), key=lambda item: -len(item[0]))]
+            self._tasks = [(name, _template_pattern(description))
+                           for description, name in sorted(self._task_templates.items(),
+                                                           key=lambda item: -len(item[0]))]
+            self._instrument_tools(crew)
+
+    def _agent_name(self, messages: List[Dict[str, Any]]) -> str:
+        prompt = next((_text(m) for m in messages if m.get("role") == "system"), None)
+        if prompt is None:
+            prompt = _text(messages[0]) if messages else ""
+        key = prompt[:PREFIX_LENGTH]
+        name = self._agent_names.get(key)
+        if name is None:
+            # Matched against the templates, since kickoff may have interpolated the role.
+            name = _match(self._agents, prompt)
+            if name is None:
+                return UNKNOWN
+            self._agent_names[key] = name
+        return name
+
+    def _task_name(self, messages: List[Dict[str, Any]]) -> str:
+        prompt = next((_text(m) for m in messages if TASK_MARKER in _text(m)), "")
+        description = prompt[prompt.find(TASK_MARKER) + len(TASK_MARKER):].strip()
+        key = description[:PREFIX_LENGTH]
+        if not key:
+            return UNKNOWN
+        name = self._task_names.get(key)
+        if name is None:
+            name = _match(self._tasks, description)
+            if name is None:
+                return UNKNOWN
+            self._task_names[key] = name
+        return name
+
+    def _current_task_name(self, agent: Any) -> str:
+        task = getattr(getattr(agent, "agent_executor", None), "task", None)
+        if task is None:
+            return UNKNOWN
+        return _match(self._tasks, task.description.strip()) or UNKNOWN
+
+    # Collection
+
+    def _on_success(self, kwargs, response, start_time, end_time) -> None:
+        messages = kwargs.get("messages") or []
+        model = str(kwargs.get("model") or UNKNOWN)
+        usage = _get(response, "usage")
+        prompt_tokens = _get(usage, "prompt_tokens") or 0
+        completion_tokens = _get(usage, "completion_tokens") or 0
+        cached_tokens = _get(_get(usage, "prompt_tokens_details"), "cached_tokens") or 0
+        price = price_for(model, self.prices)
+        key = (self._agent_name(messages), self._task_name(messages), model)
+        with self._lock:
+            series = self.llm.setdefault(key, LLMSeries())
+            series.calls += 1
+            series.retries += _is_retry(messages)
+            series.prompt_tokens += prompt_tokens
+            series.cached_tokens += cached_tokens
+            series.completion_tokens += completion_tokens
+            if price is not None:
+                series.cost_usd += price.cost(prompt_tokens, cached_tokens, completion_tokens)
+            else:
+                self.unpriced_models.add(model)
+            series.latency.observe(_seconds(start_time, end_time))
+
+    def _on_failure(self, kwargs, response, start_time, end_time) -> None:
+        messages = kwargs.get("messages") or []
+        key = (self._agent_name(messages), self._task_name(messages), str(kwargs.get("model") or UNKNOWN))
+        with self._lock:
+            series = self.llm.setdefault(key, LLMSeries())
+            series.errors += 1
+            series.latency.observe(_seconds(start_time, end_time))
+
+    def _record_tool(self, key: Tuple[str, str, str], seconds: float, failed: bool) -> None:
+        with self._lock:
+            series = self.tools.setdefault(key, ToolSeries())
+            series.calls += 1
+            series.errors += failed
+            series.latency.observe(seconds)
+
+    def _instrument_tools(self, crew: Any) -> None:
+        owners: Dict[int, Tuple[Any, List[Any]]] = {}
+        for agent in crew.agents:
+            for tool in agent.tools or []:
+                owners.setdefault(id(tool), (tool, []))[1].append(agent)
+        for task in crew.tasks:
+            for tool in task.tools or []:
+                owners.setdefault(id(tool), (tool, []))[1].append(task.agent)
+
+        for tool, agents in owners.values():
+            run = getattr(tool, "_run", None)
+            if run is None or hasattr(run, "__wrapped__"):
+                continue
+            # A tool shared by several agents cannot tell which of them called it.
+            agent = agents[0] if len({id(a) for a in agents}) == 1 else None
+            agent_name = "shared" if agent is None else _match(self._agents, f"You are {agent.role}.") or UNKNOWN
+            tool_name = getattr(tool, "name", type(tool).__name__)
+
+            @functools.wraps(run)
+            def timed_run(*args, _run=run, _agent=agent, _agent_name=agent_name, _tool_name=tool_name, **kwargs):
+                started, failed = time.perf_counter(), True
+                try:
+                    result = _run(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    task_name = self._current_task_name(_agent) if _agent is not None else UNKNOWN
+                    self._record_tool((_agent_name, task_name, _tool_name), time.perf_counter() - started, failed)
+
+            # The tools are converted when the agent executor is created, i.e. at kickoff.
+            tool._run = timed_run
+
+    def install(self) -> None:
+        if self._on_success not in litellm.success_callback:
+            litellm.success_callback.append(self._on_success)
+        if self._on_failure not in litellm.failure_callback:
+            litellm.failure_callback.append(self._on_failure)
+
+    def uninstall(self) -> None:
+        for callbacks, callback in ((litellm.success_callback, self._on_success),
+                                    (litellm.failure_callback, self._on_failure)):
+            while callback in callbacks:
+                callbacks.remove(callback)
+
+    def __enter__(self) -> "CrewMetrics":
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.uninstall()
+
+    # Export
+
+    def total_cost(self) -> float:
+        with self._lock:
+            return sum(series.cost_usd for series in self.llm.values())
+
+    def records(self) -> List[Dict[str, Any]]:
+        """One record per agent, task and model (LLM) or agent, task and tool (tool)."""
+        common = {"run_id": self.run_id, "crew": self.crew_name, "started_at": self.started_at}
+        with self._lock:
+            records = [
+                dict(common, kind="llm", agent=agent, task=task, model=model, calls=s.calls, errors=s.errors,
+                     retries=s.retries, prompt_tokens=s.prompt_tokens, cached_tokens=s.cached_tokens,
+                     completion_tokens=s.completion_tokens, cost_usd=round(s.cost_usd, 8),
+                     latency_seconds=round(s.latency.sum, 6))
+                for (agent, task, model), s in sorted(self.llm.items())
+            ]
+            records += [
+                dict(common, kind="tool", agent=agent, task=task, tool=tool, calls=s.calls, errors=s.errors,
+                     latency_seconds=round(s.latency.sum, 6))
+                for (agent, task, tool), s in sorted(self.tools.items())
+            ]
+        return records
+
+    def write_jsonl(self, path: str) -> None:
+        """Appends this run's records, so one file holds the history of many runs."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as file:
+            for record in self.records():
+                file.write(json.dumps(record) + "\n")
+
+    def prometheus_text(self) -> str:
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: List[Tuple[str, str, Any]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{suffix}{{{labels}}} {value}" for suffix, labels, value in samples)
+
+        def histogram(name: str, help_text: str, series: Dict[Tuple[str, str, str], Any], label: str) -> None:
+            samples = []
+            for (agent, task, third), s in sorted(series.items()):
+                labels = _labels(crew=self.crew_name, agent=agent, task=task, **{label: third})
+                samples += [("_bucket", f'{labels},le="{le}"', count) for le, count in s.latency.cumulative()]
+                samples += [("_sum", labels, repr(s.latency.sum)), ("_count", labels, s.latency.count)]
+            family(name, "histogram", help_text, samples)
+
+        with self._lock:
+            counters = [
+                ("crew_llm_calls_total", "Successful LLM calls.", "calls"),
+                ("crew_llm_errors_total", "Failed LLM calls.", "errors"),
+                ("crew_llm_retries_total", "LLM calls repeated after an unparsable answer.", "retries"),
+                ("crew_llm_prompt_tokens_total", "Prompt tokens, including cached ones.", "prompt_tokens"),
+                ("crew_llm_cached_tokens_total", "Prompt tokens served from the provider's prompt cache.",
+                 "cached_tokens"),
+                ("crew_llm_completion_tokens_total", "Completion tokens.", "completion_tokens"),
+                ("crew_llm_cost_usd_total", "Cost in USD from the model price table.", "cost_usd"),
+            ]
+            for name, help_text, attribute in counters:
+                family(name, "counter", help_text, [
+                    ("", _labels(crew=self.crew_name, agent=agent, task=task, model=model), getattr(s, attribute))
+                    for (agent, task, model), s in sorted(self.llm.items())
+                ])
+            histogram("crew_llm_latency_seconds", "LLM call latency.", self.llm, "model")
+            for name, help_text, attribute in (("crew_tool_calls_total", "Tool calls.", "calls"),
+                                               ("crew_tool_errors_total", "Tool calls that raised.", "errors")):
+                family(name, "counter", help_text, [
+                    ("", _labels(crew=self.crew_name, agent=agent, task=task, tool=tool), getattr(s, attribute))
+                    for (agent, task, tool), s in sorted(self.tools.items())
+                ])
+            histogram("crew_tool_latency_seconds", "Tool call latency.", self.tools, "tool")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        _write_atomic(Path(path), self.prometheus_text())
@@ -0,0 +1,244 @@
+# Local snapshot of a Trello board, for incremental progress reports.
+#
+# The last fetched state of every card (only the fields the report compares)
+# and every report run (its time, the activity watermark, the analysis and the
+# report) are kept in a SQLite file. A new run reads only the board actions
+# since the watermark, the latest dateLastActivity seen, fetches just the
+# cards they touched (through the batch endpoint), and compares them with the
+# snapshot: new, moved, completed, updated and removed cards. Cards that
+# became overdue since the last run are found in the snapshot itself, since a
+# due date passing leaves no action. The work per run is proportional to the
+# number of changes, not to the size of the board.
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from aggregation import DONE_LIST, TOP_CARDS, parse_date
+from trello_client import TrelloClient
+
+# The card fields kept in the snapshot and compared between runs.
+SNAPSHOT_FIELDS = ("name", "idList", "idMembers", "due", "dueComplete", "dateLastActivity", "labels", "closed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    board_id TEXT NOT NULL,
+    card_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (board_id, card_id)
+);
+CREATE TABLE IF NOT EXISTS runs (
+    board_id TEXT NOT NULL,
+    run_at TEXT NOT NULL,
+    watermark TEXT,
+    changes INTEGER NOT NULL,
+    analysis TEXT,
+    report TEXT,
+    PRIMARY KEY (board_id, run_at)
+);
+"""
+
+
+def snapshot_card(card: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields of a card kept in the snapshot; labels by name."""
+    snapshot = {key: card.get(key) for key in SNAPSHOT_FIELDS}
+    snapshot["labels"] = sorted(label.get("name") or label.get("color") or "" for label in card.get("labels") or [])
+    snapshot["idMembers"] = sorted(card.get("idMembers") or [])
+    return snapshot
+
+
+@dataclass
+class SnapshotRun:
+    run_at: str
+    watermark: Optional[str]
+    changes: int
+    analysis: Optional[str]
+    report: Optional[str]
+
+
+@dataclass
+class BoardDiff:
+    """The changes of a board between two runs, as short card references."""
+    new: List[Dict[str, Any]] = field(default_factory=list)
+    moved: List[Dict[str, Any]] = field(default_factory=list)
+    completed: List[Dict[str, Any]] = field(default_factory=list)
+    newly_overdue: List[Dict[str, Any]] = field(default_factory=list)
+    updated: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[Dict[str, Any]] = field(default_factory=list)
+
+    CATEGORIES = ("new", "moved", "completed", "newly_overdue", "updated", "removed")
+
+    def __len__(self) -> int:
+        return sum(len(getattr(self, name)) for name in self.CATEGORIES)
+
+    def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {name: getattr(self, name) for name in self.CATEGORIES if getattr(self, name)}
+
+    def to_text(self, limit: int = TOP_CARDS) -> str:
+        """
+        One line per change, the input of the incremental analysis; at most
+        `limit` cards of every category, the rest counted.
+        """
+        lines = []
+        for name in self.CATEGORIES:
+            refs = getattr(self, name)
+            for ref in refs[:limit]:
+                details = ", ".join(f"{key}: {value}" for key, value in ref.items() if key not in ("id", "name"))
+                lines.append(f"- {name.replace('_', ' ').upper()} {ref['name']!r} ({details})")
+            if len(refs) > limit:
+                lines.append(f"- ... and {len(refs) - limit} more {name.replace('_', ' ')} cards")
+        return "\n".join(lines) or "No changes."
+
+
+class SnapshotStore:
+    """
+    Board snapshots and report runs in a SQLite file.
+
+    with SnapshotStore('board_snapshots.db') as store:
+        last = store.last_run(board_id)
+    """
+
+    def __init__(self, path: Union[str, Path] = "board_snapshots.db"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "SnapshotStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def cards(self, board_id: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rows = self._connection.execute("SELECT card_id, data FROM cards WHERE board_id = ?", (board_id,))
+            return {card_id: json.loads(data) for card_id, data in rows}
+
+    def last_run(self, board_id: str) -> Optional[SnapshotRun]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT run_at, watermark, changes, analysis, report FROM runs WHERE board_id = ? "
+                "ORDER BY run_at DESC LIMIT 1", (board_id,),
+            ).fetchone()
+        return SnapshotRun(*row) if row else None
+
+    def save_run(self, board_id: str, changed: Dict[str, Dict[str, Any]], removed: Iterable[str],
+                 run_at: str, watermark: Optional[str], analysis: Optional[str], report: Optional[str],
+                 replace: bool = False) -> None:
+        """
+        Applies the changed and removed cards to the snapshot and records the run,
+        in one transaction. `replace` drops the previous snapshot first (a full fetch).
+        """
+        removed = list(removed)
+        with self._lock, self._connection:
+            if replace:
+                self._connection.execute("DELETE FROM cards WHERE board_id = ?", (board_id,))
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO cards (board_id, card_id, data) VALUES (?, ?, ?)",
+                [(board_id, card_id, json.dumps(snapshot_card(card))) for card_id, card in changed.items()],
+            )
+            self._connection.executemany("DELETE FROM cards WHERE board_id = ? AND card_id = ?",
+                                         [(board_id, card_id) for card_id in removed])
+            self._connection.execute(
+                "INSERT OR REPLACE INTO runs (board_id, run_at, watermark, changes, analysis, report) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (board_id, run_at, watermark, len(changed) + len(removed), analysis, report),
+            )
+
+
+def watermark_of(cards: Iterable[Dict[str, Any]], since: Optional[str] = None) -> Optional[str]:
+    """The latest dateLastActivity of the cards (ISO strings sort by time)."""
+    return max((card.get("dateLastActivity") or "" for card in cards), default="") or since
+
+
+def fetch_changes(client: TrelloClient, board_id: str,
+                  since: str) -> Tuple[Dict[str, Dict[str, Any]], Set[str], Optional[str]]:
+    """
+    The cards touched by a board action since `since`, the ids of the cards
+    deleted or archived since, and the new watermark. A card that fails to
+    load for another reason than a 404 (a 503, a timeout) is left out, so its
+    snapshot is kept, and the watermark stays at `since` so that the next run
+    fetches it again.
+    """
+    # Ordered, without duplicates: a card often has several actions.
+    card_ids: Dict[str, None] = {}
+    deleted: Set[str] = set()
+    latest = since
+    for action in client.paginate(f"boards/{board_id}/actions", since=since, fields="type,date,data"):
+        latest = max(latest, action.get("date") or "")
+        card = (action.get("data") or {}).get("card") or {}
+        if not card.get("id"):
+            continue
+        if action.get("type") in ("deleteCard", "moveCardFromBoard"):
+            deleted.add(card["id"])
+        else:
+            card_ids[card["id"]] = None
+    changed, failed = {}, False
+    for card in client.cards([card_id for card_id in card_ids if card_id not in deleted],
+                             fields=",".join(SNAPSHOT_FIELDS)):
+        if "error" not in card and not card.get("closed"):
+            changed[card["id"]] = card
+        elif "error" not in card or card.get("status") == 404:
+            deleted.add(card["id"])
+        else:
+            failed = True
+    if failed:
+        return changed, deleted, since
+    return changed, deleted, max(latest, watermark_of(changed.values(), latest))
+
+
+def _ref(card_id: str, card: Dict[str, Any], lists: Dict[str, str], **details: Any) -> Dict[str, Any]:
+    return dict({"id": card_id, "name": card.get("name", ""),
+                 "list": lists.get(card.get("idList"), card.get("idList"))}, **details)
+
+
+def diff_board(previous: Dict[str, Dict[str, Any]], changed: Dict[str, Dict[str, Any]], removed: Iterable[str],
+               lists: Dict[str, str], last_run_at: Optional[datetime] = None,
+               now: Optional[datetime] = None) -> BoardDiff:
+    """
+    Compares the changed cards with their snapshot. Cards whose due date passed
+    between `last_run_at` and `now` are newly overdue, changed or not.
+    """
+    now = now or datetime.now(timezone.utc)
+    diff = BoardDiff()
+    for card_id, card in changed.items():
+        card = snapshot_card(card)
+        old = previous.get(card_id)
+        list_name = lists.get(card["idList"], card["idList"])
+        if old is None:
+            diff.new.append(_ref(card_id, card, lists, due=card["due"]))
+            continue
+        done = bool(DONE_LIST.search(list_name or ""))
+        was_done = bool(DONE_LIST.search(lists.get(old["idList"], old["idList"]) or ""))
+        if (done and not was_done) or (card["dueComplete"] and not old.get("dueComplete")):
+            diff.completed.append(_ref(card_id, card, lists))
+        elif card["idList"] != old["idList"]:
+            diff.moved.append(_ref(card_id, card, lists, moved_from=lists.get(old["idList"], old["idList"])))
+        else:
+            fields = [key for key in ("name", "due", "labels", "idMembers") if card[key] != old.get(key)]
+            if fields:
+                diff.updated.append(_ref(card_id, card, lists, changed=", ".join(fields)))
+    for card_id in removed:
+        if card_id in previous:
+            diff.removed.append(_ref(card_id, previous[card_id], lists))
+
+    # A due date that passes is not an action, so the whole snapshot is checked (locally).
+    removed = set(removed)
+    for card_id, card in {**previous, **{key: snapshot_card(value) for key, value in changed.items()}}.items():
+        due = parse_date(card.get("due"))
+        if (due is None or card_id in removed or card.get("dueComplete")
+                or DONE_LIST.search(lists.get(card["idList"], card["idList"]) or "")):
+            continue
+        if due <= now and (last_run_at is None or due > last_run_at):
+            diff.newly_overdue.append(_ref(card_id, card, lists, due=card["due"]))
+    return diff
@@ -0,0 +1,123 @@
+# Synthetic Trello boards for benchmarks and the local stand-in of the API.
+#
+# generate_board builds a board of any size in the shape the Trello REST API
+# returns it: cards with labels, members, due dates and last activity, and
+# comment actions with their full memberCreator, limits and board and list
+# metadata. The content is random but reproducible from the seed, with a
+# share of overdue, stale and blocked cards. The number of members and labels
+# and the volume of comments can be changed to size the board.
+
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+LISTS = ["Backlog", "TODO", "Doing", "Review", "Blocked", "Done"]
+LABELS = [("Urgent", "red"), ("Bug", "orange"), ("Feature", "green"), ("Tech debt", "purple"),
+          ("Blocked", "black"), ("Design", "blue")]
+MEMBERS = ["Joao Moura", "Alex Chen", "Maria Rodriguez", "David Kim", "Emily White", "Sarah Lee",
+           "Ben Carter", "Jessica Green", "Mike Johnson", "Chloe Davis"]
+VERBS = ["Implement", "Fix", "Design", "Review", "Test", "Document", "Refactor", "Deploy"]
+OBJECTS = ["login flow", "payment API", "dashboard", "CSV import", "search index", "user settings",
+           "notification service", "CI pipeline", "onboarding screens", "report export"]
+COMMENTS = [
+    "Started working on this, first draft is up.",
+    "Looks good to me, merging after review.",
+    "Updated the estimate after the planning meeting.",
+    "Pushed a fix, please check again.",
+    "This was harder than expected, it is late.",
+]
+BLOCKER_COMMENTS = [
+    "Blocked by the missing API credentials.",
+    "Waiting on the design review before I can continue.",
+    "Stuck on a failing migration, can't proceed.",
+    "This depends on the payment API being deployed first.",
+]
+
+
+def _id(rng: random.Random, when: datetime) -> str:
+    # Like Trello ids: the creation time in seconds, then random hex.
+    return f"{int(when.timestamp()):08x}{rng.getrandbits(64):016x}"
+
+
+def _date(when: datetime) -> str:
+    return when.strftime("%Y-%m-%dT%H:%M:%S.") + f"{when.microsecond // 1000:03d}Z"
+
+
+def _names(names: List[Any], count: int, extra: Callable[[int], Any]) -> List[Any]:
+    return names[:count] + [extra(number) for number in range(len(names) + 1, count + 1)]
+
+
+def generate_board(cards: int = 10_000, seed: int = 0, now: Optional[datetime] = None,
+                   members: int = len(MEMBERS), labels: int = len(LABELS),
+                   comments: float = 1.0) -> Dict[str, Any]:
+    """
+    A board with `cards` cards: {"board", "lists", "members", "labels", "cards"}.
+    `comments` scales the number of comments of every card (about 1.2 on average).
+    """
+    rng = random.Random(seed)
+    member_names = _names(MEMBERS, members, lambda number: f"Member {number}")
+    label_names = _names(LABELS, labels, lambda number: (f"Label {number}", LABELS[number % len(LABELS)][1]))
+    now = now or datetime(2024, 9, 1, tzinfo=timezone.utc)
+    start = now - timedelta(days=120)
+    board = {"id": _id(rng, start), "name": "[Synthetic] CrewAI Board", "shortLink": "Synth001"}
+    lists = [{"id": _id(rng, start), "name": name, "closed": False, "idBoard": board["id"]} for name in LISTS]
+    members = [{"id": _id(rng, start), "fullName": name, "username": name.lower().replace(" ", ""),
+                "initials": "".join(part[0] for part in name.split())} for name in member_names]
+    labels = [{"id": _id(rng, start), "idBoard": board["id"], "name": name, "color": color, "uses": 0}
+              for name, color in label_names]
+
+    generated: List[Dict[str, Any]] = []
+    for number in range(cards):
+        created = start + timedelta(seconds=rng.randrange(110 * 86400))
+        card_list = rng.choices(lists, weights=[3, 3, 2, 1, 0.3, 3])[0]
+        last_activity = max(now - timedelta(hours=rng.expovariate(1 / 168)), created)
+        due = now + timedelta(days=rng.randint(-20, 40), hours=rng.randint(0, 23)) if rng.random() < 0.6 else None
+        card_labels = rng.sample(labels, min(rng.choice([0, 0, 1, 1, 2]), len(labels)))
+        if card_list["name"] == "Blocked" and len(labels) > 4 and labels[4] not in card_labels:
+            card_labels.append(labels[4])
+        card = {
+            "id": _id(rng, created),
+            "name": f"{rng.choice(VERBS)} the {rng.choice(OBJECTS)} #{number + 1}",
+            "idList": card_list["id"],
+            "idMembers": [member["id"] for member in
+                          rng.sample(members, min(rng.choice([0, 1, 1, 2]), len(members)))],
+            "due": _date(due) if due else None,
+            "dueComplete": bool(due and card_list["name"] == "Done"),
+            "dateLastActivity": _date(last_activity),
+            "labels": card_labels,
+            "attachments": [],
+            "actions": [],
+        }
+        for _ in range(round(rng.choice([0, 0, 1, 1, 2, 3]) * comments)):
+            author = rng.choice(members)
+            text = rng.choice(BLOCKER_COMMENTS if rng.random() < 0.08 else COMMENTS)
+            card["actions"].append({
+                "id": _id(rng, last_activity),
+                "idMemberCreator": author["id"],
+                "data": {
+                    "text": text,
+                    "textData": {"emoji": {}},
+                    "card": {"id": card["id"], "name": card["name"], "idShort": number + 1,
+                             "shortLink": card["id"][-8:]},
+                    "board": board,
+                    "list": {"id": card_list["id"], "name": card_list["name"]},
+                },
+                "appCreator": None,
+                "type": "commentCard",
+                "date": _date(last_activity),
+                "limits": {"reactions": {
+                    "perAction": {"status": "ok", "disableAt": 900, "warnAt": 720},
+                    "uniquePerAction": {"status": "ok", "disableAt": 17, "warnAt": 14},
+                }},
+                "memberCreator": dict(
+                    author, activityBlocked=False, avatarHash=f"{rng.getrandbits(128):032x}",
+                    avatarUrl=f"https://trello-members.s3.amazonaws.com/{author['id']}/{rng.getrandbits(128):032x}",
+                    idMemberReferrer=None, nonPublic={}, nonPublicAvailable=True,
+                ),
+            })
+        generated.append(card)
+    uses = Counter(label["id"] for card in generated for label in card["labels"])
+    for label in labels:
+        label["uses"] = uses[label["id"]]
+    return {"board": board, "lists": lists, "members": members, "labels": labels, "cards": generated}
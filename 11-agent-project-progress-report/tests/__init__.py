@@ -0,0 +1 @@
+"""Test package for the Project Progress Report crew."""
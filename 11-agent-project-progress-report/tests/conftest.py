@@ -0,0 +1,29 @@
+"""Pytest configuration and fixtures."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+NOW = datetime(2024, 9, 1, 12, tzinfo=timezone.utc)
+LISTS = {"l-todo": "TODO", "l-doing": "Doing", "l-done": "Done"}
+
+
+def date(days_ago):
+    """A Trello date `days_ago` days before NOW (negative: in the future)."""
+    return (NOW - timedelta(days=days_ago)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def make_card(card_id, id_list="l-todo", due=None, active_days_ago=1, **fields):
+    return dict({"id": card_id, "name": f"Card {card_id}", "idList": id_list, "idMembers": [], "due": due,
+                 "dueComplete": False, "dateLastActivity": date(active_days_ago), "labels": [], "closed": False},
+                **fields)
+
+
+def comment(text, member="Joao Moura", days_ago=1):
+    return {"type": "commentCard", "date": date(days_ago), "idMemberCreator": "m1",
+            "memberCreator": {"id": "m1", "fullName": member}, "data": {"text": text}}
+
+
+@pytest.fixture
+def lists():
+    return dict(LISTS)
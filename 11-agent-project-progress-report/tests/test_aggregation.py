@@ -0,0 +1,101 @@
+"""Tests for the local aggregation of the board and its drill-down handles."""
+
+from aggregation import aggregate_board, compact_card, drill_down, parse_date
+from tests.conftest import NOW, comment, date, make_card
+
+
+def aggregate(cards, lists, **kwargs):
+    return aggregate_board(cards, lists, {"m1": "Joao Moura", "m2": "Alex Chen"}, now=NOW, **kwargs)
+
+# --- Overdue and stale rules ---
+
+def test_overdue_cards(lists):
+    cards = [
+        make_card("late", due=date(3)),
+        make_card("later", due=date(10)),
+        make_card("future", due=date(-2)),
+        make_card("complete", due=date(3), dueComplete=True),
+        make_card("done", "l-done", due=date(3)),
+        make_card("no-due"),
+    ]
+    summary = aggregate(cards, lists).summary
+    assert summary["overdue"]["count"] == 2
+    # Most overdue first.
+    assert [(ref["id"], ref["days_overdue"]) for ref in summary["overdue"]["top"]] == [("later", 10), ("late", 3)]
+    assert summary["lists"]["TODO"]["overdue"] == 2
+
+def test_stale_cards(lists):
+    cards = [
+        make_card("quiet", active_days_ago=20),
+        make_card("just-stale", "l-doing", active_days_ago=14),
+        make_card("active", active_days_ago=13),
+        make_card("finished", "l-done", active_days_ago=60),
+    ]
+    summary = aggregate(cards, lists).summary
+    assert [(ref["id"], ref["days_inactive"]) for ref in summary["stale"]["top"]] == [("quiet", 20),
+                                                                                      ("just-stale", 14)]
+    assert aggregate(cards, lists, stale_days=30).summary["stale"]["count"] == 0
+
+def test_top_limits_the_listed_cards_not_the_counts(lists):
+    cards = [make_card(f"c{i}", due=date(i + 1)) for i in range(5)]
+    summary = aggregate(cards, lists, top=2).summary
+    assert summary["overdue"]["count"] == 5 and len(summary["overdue"]["top"]) == 2
+
+# --- Blockers, labels and members ---
+
+def test_blockers_from_labels_and_comments(lists):
+    cards = [
+        make_card("label", labels=[{"name": "Blocked", "color": "black"}]),
+        make_card("comment", actions=[comment("Waiting on the design review.", "Alex Chen")]),
+        make_card("fine", actions=[comment("Merged, thanks!")]),
+    ]
+    summary = aggregate(cards, lists).summary
+    reasons = {ref["id"]: ref["reason"] for ref in summary["blockers"]["top"]}
+    assert reasons == {"label": "label Blocked", "comment": "Alex Chen: Waiting on the design review."}
+    assert summary["labels"] == {"Blocked": 1}
+
+def test_member_activity(lists):
+    cards = [
+        make_card("a", idMembers=["m1"], actions=[comment("First", days_ago=3), comment("Second", days_ago=1)]),
+        make_card("b", idMembers=["m1", "m2"]),
+    ]
+    members = aggregate(cards, lists).summary["members"]
+    assert members["Joao Moura"] == {"comments": 2, "assigned_cards": 2, "last_comment": date(1)}
+    assert members["Alex Chen"] == {"assigned_cards": 1, "last_comment": None}
+
+def test_list_names_from_actions_when_lists_are_missing():
+    card = make_card("a", "l-x", actions=[dict(comment("hi"), data={"text": "hi", "list": {"id": "l-x",
+                                                                                           "name": "QA"}})])
+    assert aggregate_board([card], now=NOW).summary["lists"] == {"QA": {"cards": 1}}
+
+# --- Drill-down ---
+
+def test_drill_down_handles(lists):
+    cards = [make_card(f"c{i}", "l-doing", due=date(1), idMembers=["m2"]) for i in range(5)]
+    board = aggregate(cards, lists)
+    assert {"list:Doing", "overdue", "member:Alex Chen"} <= set(board.summary["drill_down"])
+    page = drill_down(board, "list:Doing", limit=2, offset=2)
+    assert (page["count"], page["offset"]) == (5, 2)
+    assert [card["id"] for card in page["cards"]] == ["c2", "c3"]
+    assert page["cards"][0]["list"] == "Doing" and page["cards"][0]["members"] == ["Alex Chen"]
+    assert "idList" not in page["cards"][0]
+
+def test_drill_down_card_and_unknown_handles(lists):
+    board = aggregate([make_card("a", actions=[comment("Stuck, can't proceed.")])], lists)
+    card = drill_down(board, "card:a")
+    assert card["comment_texts"] == [{"by": "Joao Moura", "date": date(1), "text": "Stuck, can't proceed."}]
+    assert "error" in drill_down(board, "card:missing")
+    unknown = drill_down(board, "list:Nope")
+    assert "error" in unknown and "list:TODO" in unknown["handles"]
+
+# --- Helpers ---
+
+def test_compact_card_drops_empty_fields():
+    card = make_card("a", desc="x" * 600, badges={"comments": 2, "checkItems": 4, "checkItemsChecked": 1})
+    compact = compact_card(card)
+    assert set(compact) == {"id", "name", "idList", "dateLastActivity", "desc", "comments", "checklist"}
+    assert len(compact["desc"]) == 500 and compact["checklist"] == "1/4"
+
+def test_parse_date():
+    assert parse_date("2024-09-01T12:00:00.000Z") == NOW
+    assert parse_date(None) is None and parse_date("") is None
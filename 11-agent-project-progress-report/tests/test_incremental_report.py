@@ -0,0 +1,45 @@
+"""Tests for the incremental sprint report."""
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from incremental_report import run_report
+from snapshot_store import SnapshotStore, snapshot_card
+from tests.conftest import LISTS, NOW, date, make_card
+from trello_client import TrelloError
+
+
+class UnreachableClient:
+    """A Trello client whose requests all fail, from the given call on."""
+
+    def __init__(self, failing):
+        self.failing = failing
+
+    def board_lists(self, board_id):
+        if self.failing == "board_lists":
+            raise TrelloError("GET /1/boards/B/lists failed: timed out")
+        return LISTS
+
+    def paginate(self, path, **params):
+        raise TrelloError(f"GET /1/{path} returned 503: Service Unavailable", 503)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SnapshotStore(tmp_path / "snapshots.db")
+    card = make_card("c1")
+    store.save_run("B", {"c1": card}, (), date(1), date(1), "previous analysis", "previous report", replace=True)
+    return store
+
+# --- Trello unreachable ---
+
+@pytest.mark.parametrize("failing", ["board_lists", "fetch_changes"])
+def test_unreachable_trello_reuses_the_previous_report(store, failing):
+    run = run_report("B", UnreachableClient(failing), store, crew_config=None, now=NOW)
+    assert (run.report, run.mode, run.diff) == ("previous report", "unchanged", None)
+    assert "Trello could not be read" in run.warning
+    # Nothing is saved, so the next run still starts from the stored snapshot.
+    last = store.last_run("B")
+    assert last.watermark == date(1) and last.report == "previous report"
+    assert store.cards("B") == {"c1": snapshot_card(make_card("c1"))}
@@ -0,0 +1,23 @@
+"""Checks that the modules shared with project 10 stay identical to its copies."""
+
+from pathlib import Path
+
+import pytest
+
+PROJECT = Path(__file__).resolve().parent.parent
+PLANNING = PROJECT.parent / "10-agent-planning-estimation"
+
+
+def read_copies(module):
+    if not (PLANNING / module).exists():
+        pytest.skip("project 10 is not next to this project")
+    return (PROJECT / module).read_text(), (PLANNING / module).read_text()
+
+# --- Shared modules ---
+
+def test_config_loader_is_identical():
+    ours, theirs = read_copies("config_loader.py")
+    assert ours == theirs
+def test_metrics_differ_only_by_the_example_crew_name():
+    ours, theirs = read_copies("metrics.py")
+    assert ours == theirs.replace("project_planning", "progress_report")
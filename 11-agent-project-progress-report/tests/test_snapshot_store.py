@@ -0,0 +1,131 @@
+"""Tests for the board snapshot, the incremental fetch and the board diff."""
+
+from datetime import timedelta
+
+from snapshot_store import BoardDiff, SnapshotStore, diff_board, fetch_changes, snapshot_card, watermark_of
+from tests.conftest import NOW, date, make_card
+
+LAST_RUN = NOW - timedelta(days=1)
+
+
+def snapshot(*cards):
+    return {card["id"]: snapshot_card(card) for card in cards}
+
+
+class FakeClient:
+    """The client calls fetch_changes makes: board actions since a date, and cards by id."""
+
+    def __init__(self, actions, cards):
+        self.actions = actions
+        self.data = cards
+
+    def paginate(self, path, since=None, **params):
+        return [action for action in self.actions if action["date"] > since]
+
+    def cards(self, card_ids, **params):
+        return [self.data.get(card_id, {"id": card_id, "error": "not found", "status": 404}) for card_id in card_ids]
+
+
+def action(card_id, days_ago, kind="updateCard"):
+    return {"type": kind, "date": date(days_ago), "data": {"card": {"id": card_id}}}
+
+# --- Board diff ---
+
+def test_diff_categories(lists):
+    previous = snapshot(make_card("moved"), make_card("completed", "l-doing"), make_card("renamed"),
+                        make_card("removed"), make_card("same"))
+    changed = {
+        "new": make_card("new"),
+        "moved": make_card("moved", "l-doing"),
+        "completed": make_card("completed", "l-done"),
+        "renamed": make_card("renamed", name="Renamed card", labels=[{"name": "Urgent"}]),
+        "same": make_card("same", active_days_ago=0),
+    }
+    diff = diff_board(previous, changed, ["removed", "unknown"], lists, LAST_RUN, NOW)
+    assert {name: [ref["id"] for ref in refs] for name, refs in diff.to_dict().items()} == {
+        "new": ["new"], "moved": ["moved"], "completed": ["completed"], "updated": ["renamed"],
+        "removed": ["removed"]}
+    assert diff.moved[0]["moved_from"] == "TODO" and diff.moved[0]["list"] == "Doing"
+    assert diff.updated[0]["changed"] == "name, labels"
+    assert len(diff) == 5
+
+def test_due_complete_counts_as_completed(lists):
+    diff = diff_board(snapshot(make_card("a")), {"a": make_card("a", dueComplete=True)}, [], lists, LAST_RUN, NOW)
+    assert [ref["id"] for ref in diff.completed] == ["a"]
+
+def test_newly_overdue_only_since_the_last_run(lists):
+    previous = snapshot(make_card("passed", due=date(0.5)), make_card("already", due=date(3)),
+                        make_card("future", due=date(-1)), make_card("done", "l-done", due=date(0.5)),
+                        make_card("complete", due=date(0.5), dueComplete=True), make_card("removed", due=date(0.5)))
+    # A changed card whose new due date passed is newly overdue too.
+    changed = {"changed": make_card("changed", due=date(0.2))}
+    diff = diff_board(previous, changed, ["removed"], lists, LAST_RUN, NOW)
+    assert sorted(ref["id"] for ref in diff.newly_overdue) == ["changed", "passed"]
+
+def test_empty_diff_text():
+    diff = BoardDiff()
+    assert not diff and diff.to_text() == "No changes."
+
+def test_diff_text_is_limited_per_category(lists):
+    changed = {f"c{i}": make_card(f"c{i}") for i in range(5)}
+    text = diff_board({}, changed, [], lists, LAST_RUN, NOW).to_text(limit=2)
+    assert text.count("- NEW ") == 2
+    assert text.endswith("- ... and 3 more new cards")
+
+# --- Incremental fetch ---
+
+def test_fetch_changes(lists):
+    client = FakeClient(
+        [action("a", 0.5), action("a", 0.4, "commentCard"), action("b", 0.3), action("gone", 0.2, "deleteCard"),
+         action("old", 3)],
+        {"a": make_card("a", active_days_ago=0.4), "b": make_card("b", closed=True, active_days_ago=0.3)},
+    )
+    changed, removed, watermark = fetch_changes(client, "board", date(1))
+    assert list(changed) == ["a"]
+    assert removed == {"b", "gone"}
+    assert watermark == date(0.2)
+
+def test_fetch_changes_treats_404_as_deleted():
+    client = FakeClient([action("missing", 0.5)], {})
+    changed, removed, watermark = fetch_changes(client, "board", date(1))
+    assert (changed, removed, watermark) == ({}, {"missing"}, date(0.5))
+
+def test_fetch_changes_keeps_the_watermark_on_other_errors():
+    client = FakeClient([action("a", 0.5), action("flaky", 0.4)], {"a": make_card("a", active_days_ago=0.5)})
+    client.data["flaky"] = {"id": "flaky", "error": "GET /1/cards/flaky returned 503", "status": 503}
+    changed, removed, watermark = fetch_changes(client, "board", date(1))
+    assert list(changed) == ["a"] and removed == set()
+    # The next run fetches the failed card again.
+    assert watermark == date(1)
+
+def test_watermark_of():
+    cards = [make_card("a", active_days_ago=2), make_card("b", active_days_ago=1), {"id": "c"}]
+    assert watermark_of(cards) == date(1)
+    assert watermark_of([], since="x") == "x"
+
+# --- Store ---
+
+def test_store_round_trip(tmp_path):
+    with SnapshotStore(tmp_path / "snapshots.db") as store:
+        assert store.last_run("board") is None
+        cards = {"a": make_card("a"), "b": make_card("b")}
+        store.save_run("board", cards, (), NOW.isoformat(), watermark_of(cards.values()), "analysis", "report",
+                       replace=True)
+        store.save_run("board", {"a": make_card("a", "l-done")}, ["b"], (NOW + timedelta(hours=1)).isoformat(),
+                       date(0), "analysis 2", "report 2")
+        assert store.cards("board") == snapshot(make_card("a", "l-done"))
+        last = store.last_run("board")
+        assert (last.watermark, last.changes, last.report) == (date(0), 2, "report 2")
+        assert store.cards("other board") == {}
+
+def test_replace_drops_the_previous_snapshot(tmp_path):
+    with SnapshotStore(tmp_path / "snapshots.db") as store:
+        store.save_run("board", {"a": make_card("a")}, (), NOW.isoformat(), None, None, None)
+        store.save_run("board", {"b": make_card("b")}, (), NOW.isoformat(), None, None, None, replace=True)
+        assert list(store.cards("board")) == ["b"]
+
+def test_snapshot_card_normalizes_labels_and_members():
+    card = make_card("a", labels=[{"name": "Urgent"}, {"color": "red"}], idMembers=["m2", "m1"], desc="dropped")
+    assert snapshot_card(card)["labels"] == ["Urgent", "red"]
+    assert snapshot_card(card)["idMembers"] == ["m1", "m2"]
+    assert "desc" not in snapshot_card(card)
@@ -0,0 +1,71 @@
+"""Tests for the Trello client against the local stand-in server."""
+
+import pytest
+
+from synthetic_board import generate_board
+from trello_client import BATCH_SIZE, TrelloClient, TrelloError
+from trello_stub_server import TrelloStubServer
+from tests.conftest import NOW
+
+BOARD = generate_board(35, now=NOW)
+
+
+@pytest.fixture
+def server():
+    with TrelloStubServer(BOARD) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    with TrelloClient("key", "token", base_url=server.url, retries=0) as client:
+        yield client
+
+
+def card_ids(count):
+    return [card["id"] for card in BOARD["cards"][:count]]
+
+# --- Pagination ---
+
+def test_board_cards_reads_every_page(server, client):
+    cards = client.board_cards(server.board_id, page_size=10)
+    assert sorted(card["id"] for card in cards) == sorted(card["id"] for card in BOARD["cards"])
+    # Three full pages and a short one.
+    assert server.stats["board_cards"] == 4
+
+def test_paginate_goes_from_newest_to_oldest(server, client):
+    ids = [card["id"] for card in client.paginate(f"boards/{server.board_id}/cards", page_size=10, fields="id")]
+    assert ids == sorted(ids, reverse=True) and len(ids) == 35
+
+def test_failed_request_raises_trello_error(client):
+    with pytest.raises(TrelloError) as error:
+        client.board_lists("unknown-board")
+    assert error.value.status_code == 404
+
+# --- Many cards ---
+
+def test_cards_are_fetched_through_batch(server, client):
+    ids = card_ids(25)
+    cards = client.cards(ids, fields="name")
+    assert [card["id"] for card in cards] == ids and all("name" in card for card in cards)
+    assert client.batch_supported is True
+    assert server.stats["batch"] == -(-len(ids) // BATCH_SIZE) and server.stats["card"] == 0
+
+def test_cards_fall_back_to_single_requests_without_batch():
+    with TrelloStubServer(BOARD, batch=False) as server, \
+            TrelloClient("key", "token", base_url=server.url, retries=0) as client:
+        ids = card_ids(5)
+        assert [card["id"] for card in client.cards(ids)] == ids
+        assert client.batch_supported is False
+        # The batch endpoint is not tried again.
+        client.cards(ids)
+        assert server.stats["batch"] == 1 and server.stats["card"] == 10
+
+@pytest.mark.parametrize("batch", [True, False])
+def test_unknown_card_is_returned_as_an_error(batch):
+    with TrelloStubServer(BOARD, batch=batch) as server, \
+            TrelloClient("key", "token", base_url=server.url, retries=0) as client:
+        known, missing = card_ids(1)[0], "0" * 24
+        found, error = client.cards([known, missing])
+        assert found["id"] == known and "error" not in found
+        assert error["id"] == missing and error["status"] == 404 and error["error"]
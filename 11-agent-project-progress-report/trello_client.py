@@ -0,0 +1,225 @@
+# Shared Trello REST client for the progress report tools.
+#
+# One requests.Session per client keeps a pool of keep-alive connections, so
+# consecutive and concurrent calls reuse their TLS connections instead of
+# opening one per request. Every request has a connect and read timeout, and
+# connection errors, 429 and 5xx responses are retried with exponential
+# backoff (honouring Retry-After). Board cards are fetched page by page (Trello
+# returns at most 1000 per request; older pages are read with `before`), and
+# many cards are fetched through the /1/batch endpoint, 10 routes a request,
+# with the batches (or, where batch is not available, the single card requests)
+# sent concurrently on a bounded thread pool sized to the connection pool. The
+# base URL comes from DLAI_TRELLO_BASE_URL, so the tools can run against a
+# local stand-in of the API.
+
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote, urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_BASE_URL = "https://api.trello.com"
+# (connect, read) timeouts in seconds.
+DEFAULT_TIMEOUT = (3.05, 30.0)
+DEFAULT_MAX_WORKERS = 8
+MAX_PAGE_SIZE = 1000
+# Routes per /1/batch request, the Trello limit.
+BATCH_SIZE = 10
+CARD_FIELDS = "name,idList,idMembers,due,dueComplete,dateLastActivity,labels"
+
+
+class TrelloError(RuntimeError):
+    """A Trello request failed after its retries."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class TrelloClient:
+    """
+    Pooled, retrying Trello client; safe to share between threads.
+
+    with TrelloClient.from_env() as trello:
+        cards = trello.board_cards(board_id)
+        details = trello.cards([card['id'] for card in cards])
+    """
+
+    def __init__(self, api_key: str, api_token: str, base_url: Optional[str] = None,
+                 timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+                 max_workers: int = DEFAULT_MAX_WORKERS, retries: int = 3, backoff_factor: float = 0.5):
+        self.base_url = (base_url or os.getenv('DLAI_TRELLO_BASE_URL') or DEFAULT_BASE_URL).rstrip("/")
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self._auth = {'key': api_key, 'token': api_token}
+        # None until the first batch request tells whether /1/batch is available.
+        self.batch_supported: Optional[bool] = None
+        # Requests sent, by kind ('get', 'batch'), for the tools' counters.
+        self.stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        # One pooled connection per worker, so concurrent fetches never wait for a connection.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_env(cls, **kwargs: Any) -> "TrelloClient":
+        """A client with the TRELLO_API_KEY and TRELLO_API_TOKEN credentials."""
+        return cls(os.environ['TRELLO_API_KEY'], os.environ['TRELLO_API_TOKEN'], **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "TrelloClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get(self, path: str, **params: Any) -> Any:
+        """GETs /1/<path> and returns the decoded JSON; raises TrelloError on failure."""
+        url = f"{self.base_url}/1/{path.lstrip('/')}"
+        with self._stats_lock:
+            self.stats['batch' if path.lstrip('/') == 'batch' else 'get'] += 1
+        try:
+            response = self.session.get(url, params={**self._auth, **params}, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise TrelloError(f"GET /1/{path.lstrip('/')} failed: {e}") from e
+        if response.status_code != 200:
+            raise TrelloError(f"GET /1/{path.lstrip('/')} returned {response.status_code}: {response.text[:200]}",
+                              response.status_code)
+        return response.json()
+
+    def paginate(self, path: str, page_size: int = MAX_PAGE_SIZE, **params: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Yields every object of a paginated collection, newest first. Trello ids
+        start with their creation time, so the next page is the objects created
+        before the oldest id of the current one.
+        """
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        before = None
+        while True:
+            page = self.get(path, limit=page_size, **params, **({'before': before} if before else {}))
+            yield from page
+            oldest = min((item['id'] for item in page), default=None)
+            # A short page is the last one; an unchanged cursor means `before` is not supported.
+            if len(page) < page_size or oldest == before:
+                return
+            before = oldest
+
+    def board_cards(self, board_id: str, fields: str = CARD_FIELDS, page_size: int = MAX_PAGE_SIZE,
+                    **params: Any) -> List[Dict[str, Any]]:
+        """All the open cards of a board, with the given fields and nested resources."""
+        cards, seen = [], set()
+        for card in self.paginate(f"boards/{board_id}/cards", page_size, fields=fields, **params):
+            # A card moved between two page requests could be returned twice.
+            if card['id'] not in seen:
+                seen.add(card['id'])
+                cards.append(card)
+        return cards
+
+    def board_lists(self, board_id: str) -> Dict[str, str]:
+        """List names by id."""
+        return {item['id']: item['name'] for item in self.get(f"boards/{board_id}/lists", fields='name')}
+
+    def board_members(self, board_id: str) -> Dict[str, str]:
+        """Member full names by id."""
+        return {item['id']: item.get('fullName') or item.get('username') or item['id']
+                for item in self.get(f"boards/{board_id}/members", fields='fullName,username')}
+
+    def card(self, card_id: str, **params: Any) -> Dict[str, Any]:
+        return self.get(f"cards/{card_id}", **params)
+
+    def _map(self, function: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """function over items, at most max_workers at once, in order."""
+        if len(items) <= 1:
+            return [function(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items)),
+                                thread_name_prefix="trello") as pool:
+            return list(pool.map(function, items))
+
+    def batch(self, routes: List[str]) -> List[Union[Any, TrelloError]]:
+        """
+        GETs many routes ("/cards/<id>?fields=name") through /1/batch, BATCH_SIZE
+        a request, sending the requests concurrently. Returns, in order, the
+        decoded object of every route or the TrelloError it failed with.
+        """
+        def send(group: List[str]) -> List[Union[Any, TrelloError]]:
+            results = []
+            for result in self.get('batch', urls=",".join(group)):
+                if isinstance(result, dict) and "200" in result:
+                    results.append(result["200"])
+                else:
+                    status = result.get("statusCode") if isinstance(result, dict) else None
+                    message = result.get("message", result) if isinstance(result, dict) else result
+                    results.append(TrelloError(f"Batch route failed: {message}", status))
+            return results
+
+        groups = [routes[i:i + BATCH_SIZE] for i in range(0, len(routes), BATCH_SIZE)]
+        return [result for results in self._map(send, groups) for result in results]
+
+    def cards(self, card_ids: Iterable[str], use_batch: bool = True, **params: Any) -> List[Dict[str, Any]]:
+        """
+        Fetches many cards in the given order: through /1/batch when the API has
+        it, otherwise with concurrent single requests, at most max_workers at
+        once. A card that cannot be fetched is returned as {'id': ..., 'error': ...,
+        'status': ...}, with the HTTP status of the failure (None without a response).
+        """
+        card_ids = list(card_ids)
+        if use_batch and len(card_ids) > 1 and self.batch_supported is not False:
+            # The routes are a comma-separated list, so commas in their query are escaped.
+            query = f"?{urlencode(params, quote_via=quote, safe='')}" if params else ""
+            try:
+                results = self.batch([f"/cards/{card_id}{query}" for card_id in card_ids])
+                self.batch_supported = True
+                return [{'id': card_id, 'error': str(result), 'status': result.status_code}
+                        if isinstance(result, TrelloError) else result
+                        for card_id, result in zip(card_ids, results)]
+            except TrelloError as e:
+                # No batch endpoint (e.g. a stand-in of the API): single requests from now on.
+                # Other failures fall back to single requests for this call only.
+                if e.status_code in (400, 404, 405, 501):
+                    self.batch_supported = False
+
+        def fetch(card_id: str) -> Dict[str, Any]:
+            try:
+                return self.card(card_id, **params)
+            except TrelloError as e:
+                return {'id': card_id, 'error': str(e), 'status': e.status_code}
+
+        return self._map(fetch, card_ids)
+
+
+_clients: Dict[Tuple[str, str, str], TrelloClient] = {}
+_clients_lock = threading.Lock()
+
+
+def shared_client(api_key: Optional[str] = None, api_token: Optional[str] = None,
+                  base_url: Optional[str] = None) -> TrelloClient:
+    """
+    The process-wide client for these credentials and base URL (by default those
+    of the environment), so every tool instance shares one connection pool.
+    """
+    api_key = api_key or os.environ['TRELLO_API_KEY']
+    api_token = api_token or os.environ['TRELLO_API_TOKEN']
+    base_url = (base_url or os.getenv('DLAI_TRELLO_BASE_URL') or DEFAULT_BASE_URL).rstrip("/")
+    key = (api_key, api_token, base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = TrelloClient(api_key, api_token, base_url)
+        return client
@@ -0,0 +1,278 @@
+# Local stand-in of the Trello REST API, serving a synthetic board.
+#
+# Serves the endpoints the progress report tools use, in the shape Trello
+# returns them, from a board of generate_board (see synthetic_board.py):
+# the paginated board cards (with `fields`, `limit`, `before` and their comment
+# actions), lists, members and actions (with `since`), single cards and the
+# /1/batch endpoint. Every request can be delayed (`latency`, plus a random
+# `jitter`) and fail with a 503 at `error_rate`, so the client's timeouts,
+# retries and concurrency are exercised without network access. Point the
+# tools at it with DLAI_TRELLO_BASE_URL.
+#
+# Usage (from the project directory):
+#     python trello_stub_server.py --cards 10000 --latency 0.05 --error-rate 0.01
+#
+#     with TrelloStubServer(generate_board(1000)) as server:
+#         os.environ['DLAI_TRELLO_BASE_URL'] = server.url
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from synthetic_board import generate_board
+
+MAX_LIMIT = 1000
+# Routes per /1/batch request, as on Trello.
+MAX_BATCH_ROUTES = 10
+
+
+class TrelloAPIError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _query(query: str) -> Dict[str, str]:
+    return {key: values[-1] for key, values in parse_qs(query, keep_blank_values=True).items()}
+
+
+def _fields(item: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+    """The requested fields of an object and its id; all its fields (but nested resources) by default."""
+    if not fields or fields == "all":
+        return {key: value for key, value in item.items() if key not in ("actions", "attachments")}
+    return {"id": item["id"], **{key: item[key] for key in fields.split(",") if key in item}}
+
+
+def _page(items: List[Dict[str, Any]], query: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Newest first (ids start with their creation time), `limit` at most, created before the `before` id."""
+    try:
+        limit = int(query.get("limit", MAX_LIMIT))
+    except ValueError:
+        limit = 0
+    if not 0 < limit <= MAX_LIMIT:
+        raise TrelloAPIError(400, "invalid value for limit")
+    items = sorted(items, key=lambda item: item["id"], reverse=True)
+    if query.get("before"):
+        items = [item for item in items if item["id"] < query["before"]]
+    return items[:limit]
+
+
+class StubBoard:
+    """A generated board and the API responses built from it."""
+
+    def __init__(self, board: Dict[str, Any]):
+        self.board = board["board"]
+        self.lists = board["lists"]
+        self.members = board["members"]
+        self.cards = {card["id"]: card for card in board["cards"]}
+        self.actions = sorted((action for card in board["cards"] for action in card["actions"]),
+                              key=lambda action: action["date"], reverse=True)
+
+    def _check_board(self, board_id: str) -> None:
+        if board_id not in (self.board["id"], self.board["shortLink"]):
+            raise TrelloAPIError(404, "The requested resource was not found.")
+
+    def board_cards(self, board_id: str, query: Dict[str, str]) -> List[Dict[str, Any]]:
+        self._check_board(board_id)
+        cards = []
+        for card in _page(list(self.cards.values()), query):
+            result = _fields(card, query.get("fields"))
+            if query.get("actions"):
+                types = query["actions"].split(",")
+                result["actions"] = [action for action in card["actions"]
+                                     if query["actions"] == "all" or action["type"] in types]
+            if query.get("attachments") == "true":
+                result["attachments"] = card["attachments"]
+            cards.append(result)
+        return cards
+
+    def board_lists(self, board_id: str, query: Dict[str, str]) -> List[Dict[str, Any]]:
+        self._check_board(board_id)
+        return [_fields(item, query.get("fields")) for item in self.lists]
+
+    def board_members(self, board_id: str, query: Dict[str, str]) -> List[Dict[str, Any]]:
+        self._check_board(board_id)
+        return [_fields(item, query.get("fields")) for item in self.members]
+
+    def board_actions(self, board_id: str, query: Dict[str, str]) -> List[Dict[str, Any]]:
+        self._check_board(board_id)
+        actions = self.actions
+        since = query.get("since")
+        if since:
+            # An action id or a date.
+            key = "id" if re.fullmatch(r"[0-9a-f]{24}", since) else "date"
+            actions = [action for action in actions if action[key] > since]
+        return [_fields(action, query.get("fields")) for action in _page(actions, query)]
+
+    def card(self, card_id: str, query: Dict[str, str]) -> Dict[str, Any]:
+        card = self.cards.get(card_id)
+        if card is None:
+            raise TrelloAPIError(404, "The requested resource was not found.")
+        return _fields(card, query.get("fields"))
+
+    ROUTES = [
+        (re.compile(r"/1/boards/([^/]+)/cards"), "board_cards"),
+        (re.compile(r"/1/boards/([^/]+)/lists"), "board_lists"),
+        (re.compile(r"/1/boards/([^/]+)/members"), "board_members"),
+        (re.compile(r"/1/boards/([^/]+)/actions"), "board_actions"),
+        (re.compile(r"/1/cards/([^/]+)"), "card"),
+    ]
+
+    def route(self, path: str, query: Dict[str, str]) -> Tuple[str, Any]:
+        """The name of the route of a request and its response; raises TrelloAPIError."""
+        for pattern, name in self.ROUTES:
+            match = pattern.fullmatch(path.rstrip("/"))
+            if match:
+                return name, getattr(self, name)(match.group(1), query)
+        raise TrelloAPIError(404, "Cannot GET " + path)
+
+    def batch(self, query: Dict[str, str]) -> List[Dict[str, Any]]:
+        routes = [route for route in query.get("urls", "").split(",") if route]
+        if not routes or len(routes) > MAX_BATCH_ROUTES:
+            raise TrelloAPIError(400, f"Batch requires 1 to {MAX_BATCH_ROUTES} urls")
+        results = []
+        for route in routes:
+            url = urlparse(route)
+            try:
+                results.append({"200": self.route("/1" + url.path, _query(url.query))[1]})
+            except TrelloAPIError as e:
+                results.append({"name": "NotFound" if e.status == 404 else "Error", "message": str(e),
+                                "statusCode": e.status})
+        return results
+
+
+class TrelloStubServer(ThreadingHTTPServer):
+    """
+    The stand-in server, on a free local port by default; serves in a daemon
+    thread when used as a context manager. `stats` counts the requests by route.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, board: Dict[str, Any], host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, batch: bool = True, seed: int = 0):
+        super().__init__((host, port), TrelloStubHandler)
+        self.board = StubBoard(board)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.batch = batch
+        self.stats: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def board_id(self) -> str:
+        return self.board.board["id"]
+
+    def start(self) -> "TrelloStubServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="trello-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "TrelloStubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def delay_and_fail(self, route: str) -> bool:
+        """Counts a request, waits its latency and tells whether it should fail."""
+        with self._lock:
+            self.stats[route] += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if fail:
+            with self._lock:
+                self.stats["injected_errors"] += 1
+        return fail
+
+
+class TrelloStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: TrelloStubServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: Any) -> None:
+        data = (json.dumps(body, separators=(",", ":")) if status == 200 else str(body)).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json" if status == 200 else "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = _query(url.query)
+        is_batch = url.path.rstrip("/") == "/1/batch"
+        route = "batch" if is_batch else next(
+            (name for pattern, name in StubBoard.ROUTES if pattern.fullmatch(url.path.rstrip("/"))), "unknown")
+        if self.server.delay_and_fail(route):
+            self._send(503, "Service Unavailable")
+            return
+        if not query.get("key") or not query.get("token"):
+            self._send(401, "invalid key")
+            return
+        try:
+            if is_batch:
+                if not self.server.batch:
+                    raise TrelloAPIError(404, "Cannot GET /1/batch")
+                self._send(200, self.server.board.batch(query))
+            else:
+                self._send(200, self.server.board.route(url.path, query)[1])
+        except TrelloAPIError as e:
+            self._send(e.status, e)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic Trello board locally.")
+    parser.add_argument("--cards", type=int, default=1000, help="Number of cards of the board.")
+    parser.add_argument("--members", type=int, default=10, help="Number of members of the board.")
+    parser.add_argument("--labels", type=int, default=6, help="Number of labels of the board.")
+    parser.add_argument("--comments", type=float, default=1.0, help="Factor applied to the comments of a card.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated board.")
+    parser.add_argument("--port", type=int, default=8808, help="Port to listen on.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random seconds added on top of the latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with a 503.")
+    parser.add_argument("--no-batch", action="store_true", help="Answer /1/batch with a 404.")
+    args = parser.parse_args()
+
+    board = generate_board(args.cards, args.seed, members=args.members, labels=args.labels,
+                           comments=args.comments)
+    server = TrelloStubServer(board, port=args.port, latency=args.latency, jitter=args.jitter,
+                              error_rate=args.error_rate, batch=not args.no_batch, seed=args.seed)
+    print(f"Serving {args.cards} cards on {server.url}")
+    print(f"export DLAI_TRELLO_BASE_URL={server.url} TRELLO_BOARD_ID={server.board_id} "
+          f"TRELLO_API_KEY=stub TRELLO_API_TOKEN=stub")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
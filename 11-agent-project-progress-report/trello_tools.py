@@ -0,0 +1,151 @@
+# CrewAI tools that read the Trello board of the progress report crew.
+#
+# All tools share one pooled TrelloClient per credentials and base URL (see
+# trello_client.py), so the agent's repeated tool calls reuse the same
+# connections. When Trello cannot be reached, the board tool falls back to a
+# sample of the course board and the card tool tells the agent to stop.
+#
+# The board tool hands the agent the local aggregate of the board (see
+# aggregation.py) rather than the raw cards, and BoardDrillDownTool returns
+# the cards behind one of its handles.
+#
+# BulkCardDataFetcherTool reads many cards in one tool call, so the agent does
+# not need a tool call, and an LLM round trip, per card: the whole board page by
+# page, or the given ids through Trello's batch endpoint. Its result is compact
+# JSON (only the fields the report uses, without null or empty values), at most
+# BULK_CARD_LIMIT cards from `offset`, so a large board cannot flood the prompt.
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+from crewai_tools import BaseTool
+from pydantic import Field, PrivateAttr
+
+from aggregation import aggregate_board, compact_card, drill_down, remember_board, remembered_board
+from trello_client import TrelloError, shared_client
+
+# Card fields read by the bulk tool.
+CARD_DETAIL_FIELDS = "name,desc,idList,idMembers,due,dueComplete,dateLastActivity,labels,badges,closed"
+# Cards returned by one call of the bulk tool.
+BULK_CARD_LIMIT = 100
+
+# Cards of the course board, returned when Trello cannot be reached.
+SAMPLE_BOARD_CARDS = [{'id': '66c3bfed69b473b8fe9d922e', 'name': 'Analysis of results from CSV', 'idList': '66c308f676b057fdfbd5fdb3', 'due': None, 'dateLastActivity': '2024-08-19T21:58:05.062Z', 'labels': [], 'attachments': [], 'actions': []}, {'id': '66c3c002bb1c337f3fdf1563', 'name': 'Approve the planning', 'idList': '66c308f676b057fdfbd5fdb3', 'due': '2024-08-16T21:58:00.000Z', 'dateLastActivity': '2024-08-19T21:58:57.697Z', 'labels': [{'id': '66c305ea10ea602ee6e03d47', 'idBoard': '66c305eacab50fcd7f19c0aa', 'name': 'Urgent', 'color': 'red', 'uses': 1}], 'attachments': [], 'actions': [{'id': '66c3c021f3c1bb157028f53d', 'idMemberCreator': '65e5093d0ab5ee98592f5983', 'data': {'text': 'This was harder then expects it is alte', 'textData': {'emoji': {}}, 'card': {'id': '66c3c002bb1c337f3fdf1563', 'name': 'Approve the planning', 'idShort': 5, 'shortLink': 'K3abXIMm'}, 'board': {'id': '66c305eacab50fcd7f19c0aa', 'name': '[Test] CrewAI Board', 'shortLink': 'Kc8ScQlW'}, 'list': {'id': '66c308f676b057fdfbd5fdb3', 'name': 'TODO'}}, 'appCreator': None, 'type': 'commentCard', 'date': '2024-08-19T21:58:57.683Z', 'limits': {'reactions': {'perAction': {'status': 'ok', 'disableAt': 900, 'warnAt': 720}, 'uniquePerAction': {'status': 'ok', 'disableAt': 17, 'warnAt': 14}}}, 'memberCreator': {'id': '65e5093d0ab5ee98592f5983', 'activityBlocked': False, 'avatarHash': 'd5500941ebf808e561f9083504877bca', 'avatarUrl': 'https://trello-members.s3.amazonaws.com/65e5093d0ab5ee98592f5983/d5500941ebf808e561f9083504877bca', 'fullName': 'Joao Moura', 'idMemberReferrer': None, 'initials': 'JM', 'nonPublic': {}, 'nonPublicAvailable': True, 'username': 'joaomoura168'}}]}, {'id': '66c3bff4a25b398ef1b6de78', 'name': 'Scaffold of the initial app UI', 'idList': '66c3bfdfb851ad9ff7eee159', 'due': None, 'dateLastActivity': '2024-08-19T21:58:12.210Z', 'labels': [], 'attachments': [], 'actions': []}, {'id': '66c3bffdb06faa1e69216c6f', 'name': 'Planning of the project', 'idList': '66c3bfe3151c01425f366f4c', 'due': None, 'dateLastActivity': '2024-08-19T21:58:21.081Z', 'labels': [], 'attachments': [], 'actions': []}]
+
+
+class BoardDataFetcherTool(BaseTool):
+    name: str = "Trello Board Data Fetcher"
+    description: str = (
+        "Fetches a summary of a Trello board: cards per list, overdue and stale cards, blockers, "
+        "labels and member activity, with drill-down handles for the Trello Board Drill Down tool."
+    )
+
+    api_key: str = Field(default_factory=lambda: os.environ['TRELLO_API_KEY'])
+    api_token: str = Field(default_factory=lambda: os.environ['TRELLO_API_TOKEN'])
+    board_id: str = Field(default_factory=lambda: os.environ['TRELLO_BOARD_ID'])
+    # Return the raw cards instead of the summary.
+    raw: bool = False
+
+    def _run(self) -> str:
+        """
+        Fetch all cards from the specified Trello board, page by page, and
+        aggregate them locally.
+        """
+        client = shared_client(self.api_key, self.api_token)
+        try:
+            cards = client.board_cards(self.board_id, attachments='true', actions='commentCard')
+            lists, members = client.board_lists(self.board_id), client.board_members(self.board_id)
+        except TrelloError:
+            # Fallback in case of timeouts or other issues
+            cards, lists, members = SAMPLE_BOARD_CARDS, {}, {}
+        if self.raw:
+            return json.dumps(cards)
+        aggregate = aggregate_board(cards, lists, members)
+        remember_board(self.board_id, aggregate)
+        return json.dumps(aggregate.summary, separators=(",", ":"))
+
+
+class BoardDrillDownTool(BaseTool):
+    name: str = "Trello Board Drill Down"
+    description: str = (
+        "Lists the cards behind a drill-down handle of the board summary, e.g. 'overdue', 'stale', "
+        "'blockers', 'list:<list name>', 'label:<label>' or 'member:<name>', 50 at a time from "
+        "`offset`; 'card:<card id>' returns one card with its comments. Fetch the board summary first."
+    )
+
+    board_id: str = Field(default_factory=lambda: os.environ['TRELLO_BOARD_ID'])
+
+    def _run(self, handle: str, offset: int = 0) -> str:
+        aggregate = remembered_board(self.board_id)
+        if aggregate is None:
+            return json.dumps({"error": "Fetch the board with the Trello Board Data Fetcher first."})
+        return json.dumps(drill_down(aggregate, handle, offset=int(offset)), separators=(",", ":"))
+
+
+class CardDataFetcherTool(BaseTool):
+    name: str = "Trello Card Data Fetcher"
+    description: str = (
+        "Fetches card data from a Trello board. Input: card_id, the id of a single card; use the "
+        "Trello Bulk Card Data Fetcher for several cards."
+    )
+
+    api_key: str = Field(default_factory=lambda: os.environ['TRELLO_API_KEY'])
+    api_token: str = Field(default_factory=lambda: os.environ['TRELLO_API_TOKEN'])
+
+    def _run(self, card_id: str) -> dict:
+        client = shared_client(self.api_key, self.api_token)
+        try:
+            return client.card(card_id.strip())
+        except TrelloError:
+            # Fallback in case of timeouts or other issues
+            return json.dumps({"error": "Failed to fetch card data, don't try to fetch any trello data anymore"})
+
+
+class BulkCardDataFetcherTool(BaseTool):
+    name: str = "Trello Bulk Card Data Fetcher"
+    description: str = (
+        "Fetches the details of many Trello cards in a single call, 100 at a time from `offset`. "
+        "Input: card_ids, the card ids separated by commas; leave it empty to fetch the cards of the "
+        "whole board. Returns one compact JSON document with the cards and `next_offset` while more "
+        "cards are left, so never fetch the cards one by one."
+    )
+
+    api_key: str = Field(default_factory=lambda: os.environ['TRELLO_API_KEY'])
+    api_token: str = Field(default_factory=lambda: os.environ['TRELLO_API_TOKEN'])
+    board_id: str = Field(default_factory=lambda: os.environ['TRELLO_BOARD_ID'])
+    # The board's cards fetched at offset 0, served again for the next pages.
+    _board_cards: Optional[List[Dict[str, Any]]] = PrivateAttr(default=None)
+
+    def _run(self, card_ids: str = "", offset: int = 0) -> str:
+        client = shared_client(self.api_key, self.api_token)
+        # Tolerates the ids written as a list: "['a', 'b']".
+        ids = re.findall(r"[^\s,\[\]'\"]+", card_ids)
+        offset = max(int(offset), 0)
+        requests_before = sum(client.stats.values())
+        try:
+            if ids:
+                # Only the requested page of ids is fetched, 10 cards per batch request.
+                total = len(ids)
+                cards = client.cards(ids[offset:offset + BULK_CARD_LIMIT], fields=CARD_DETAIL_FIELDS)
+            else:
+                # The whole board in a few paginated requests, rather than per-card fetches;
+                # the next pages are cut from the same fetch.
+                if offset == 0 or self._board_cards is None:
+                    self._board_cards = client.board_cards(self.board_id, fields=CARD_DETAIL_FIELDS)
+                cards = self._board_cards
+                total = len(cards)
+                cards = cards[offset:offset + BULK_CARD_LIMIT]
+        except TrelloError:
+            # Fallback in case of timeouts or other issues
+            return json.dumps({"error": "Failed to fetch card data, don't try to fetch any trello data anymore"})
+        result = {
+            "cards": [compact_card(card) for card in cards if "error" not in card],
+            "errors": {card['id']: card['error'] for card in cards if "error" in card},
+            "total": total,
+            "offset": offset,
+            "next_offset": offset + BULK_CARD_LIMIT if offset + BULK_CARD_LIMIT < total else None,
+            "http_requests": sum(client.stats.values()) - requests_before,
+        }
+        return json.dumps(result, separators=(",", ":"))